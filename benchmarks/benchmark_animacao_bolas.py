@@ -0,0 +1,96 @@
+import bpy
+import sys
+import os
+import time
+import argparse
+import numpy as np
+
+# Compara keyframe_insert quadro a quadro com a escrita em lote das F-curves
+# (animacao_bolas.animar_bolas) para animar as bolas de várias mesas, usando
+# trajetórias da simulação de uma tacada de abertura.
+# Uso: blender -b --factory-startup -P benchmarks/benchmark_animacao_bolas.py -- --mesas 10 --quadros 240
+sys.path.append(os.path.dirname(__file__))
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+from utilitarios import argumentos_blender, limpar_dados
+from layouts_bolas import gerar_racks
+from simulacao_bilhar import simular_tacada, trajetorias_3d
+from animacao_bolas import animar_bolas
+
+BOLA_RAIO = 0.057
+LARGURA_BERCO = 0.13
+
+
+def ler_argumentos():
+    parser = argparse.ArgumentParser(description="Benchmark da animação das bolas em lote")
+    parser.add_argument('--mesas', type=int, default=10)
+    parser.add_argument('--quadros', type=int, default=240)
+    parser.add_argument('--velocidade', type=float, default=7.0, help="velocidade da branca (m/s)")
+    return parser.parse_args(argumentos_blender())
+
+
+def criar_bolas(mesas, bolas):
+    # Vazios no lugar das bolas: o custo medido é só o da animação
+    objetos = []
+    for m in range(mesas):
+        linha = []
+        for b in range(bolas):
+            objeto = bpy.data.objects.new(f"Bola_{m}_{b}", None)
+            bpy.context.collection.objects.link(objeto)
+            objeto.rotation_mode = 'QUATERNION'
+            linha.append(objeto)
+        objetos.append(linha)
+    return objetos
+
+
+def animar_por_chave(objetos, quadros, localizacoes, rotacoes):
+    # O jeito ingênuo: um keyframe_insert por bola, canal e quadro
+    for m, linha in enumerate(objetos):
+        for b, objeto in enumerate(linha):
+            objeto.animation_data_clear()
+            for f, quadro in enumerate(quadros):
+                objeto.location = localizacoes[f, m, b]
+                objeto.rotation_quaternion = rotacoes[f, m, b]
+                objeto.keyframe_insert('location', frame=float(quadro))
+                objeto.keyframe_insert('rotation_quaternion', frame=float(quadro))
+
+
+def animar_em_lote(objetos, quadros, localizacoes, rotacoes):
+    for m, linha in enumerate(objetos):
+        animar_bolas(linha, quadros, localizacoes[:, m], rotacoes[:, m])
+
+
+def main():
+    args = ler_argumentos()
+    limpar_dados()
+    posicoes, _ = gerar_racks('bola8', args.mesas, BOLA_RAIO, seed=0, ruido=0.02)
+    # Branca primeiro, como em animacao_bolas.simular_e_animar_mesas
+    posicoes = np.concatenate([posicoes[:, -1:], posicoes[:, :-1]], axis=1)
+
+    inicio = time.perf_counter()
+    trajetorias, rotacoes, encacapadas = simular_tacada(posicoes, (args.velocidade, 0.0), BOLA_RAIO,
+                                                        quadros=args.quadros, indice_branca=0,
+                                                        largura_berco=LARGURA_BERCO)
+    tempo_simulacao = time.perf_counter() - inicio
+    localizacoes = trajetorias_3d(trajetorias, encacapadas, 1.1 + BOLA_RAIO, 3 * BOLA_RAIO)
+    quadros = 1 + np.arange(args.quadros + 1)
+
+    objetos = criar_bolas(args.mesas, posicoes.shape[1])
+    chaves = args.mesas * posicoes.shape[1] * len(quadros) * 7
+    print(f"\nAnimação das bolas: {args.mesas} mesas x {posicoes.shape[1]} bolas x {len(quadros)} quadros "
+          f"({chaves} chaves)")
+    print(f"  simulação (lote de {args.mesas} mesas): {tempo_simulacao:8.3f} s, "
+          f"{(encacapadas >= 0).sum(1).mean():.1f} bolas encaçapadas por mesa")
+    for nome, funcao in (('keyframe_insert', animar_por_chave), ('em lote', animar_em_lote)):
+        inicio = time.perf_counter()
+        funcao(objetos, quadros, localizacoes, rotacoes)
+        tempo = time.perf_counter() - inicio
+        print(f"  {nome:<16} {tempo:8.3f} s ({tempo / chaves * 1e6:.2f} µs por chave)")
+
+    # A escrita em lote tem de reproduzir a trajetória no último quadro
+    bpy.context.scene.frame_set(int(quadros[-1]))
+    finais = np.array([[objeto.location[:] for objeto in linha] for linha in objetos])
+    print(f"  erro máximo no último quadro: {np.abs(finais - localizacoes[-1]).max():.2e} m")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+import bpy
+import sys
+import os
+import json
+import time
+import tempfile
+import argparse
+
+# Compara o tempo de render das políticas de deslocamento do feltro (bump x real)
+# na cena das três mesas. Cada política monta a cena do zero.
+# Uso: blender -b --factory-startup -P benchmarks/benchmark_deslocamento.py -- --camera Camera_Canto
+sys.path.append(os.path.dirname(__file__))
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+from utilitarios import argumentos_blender, limpar_dados, contar_triangulos
+from main import construir_cena, CAMERAS
+from perfis_render import PERFIS_RENDER
+from politica_deslocamento import POLITICAS_DESLOCAMENTO, definir_politica_deslocamento
+from renderizacao import ler_resolucao, configurar_render
+
+
+def ler_argumentos():
+    parser = argparse.ArgumentParser(description="Benchmark das políticas de deslocamento do feltro")
+    parser.add_argument('--politicas', nargs='+', choices=POLITICAS_DESLOCAMENTO, default=list(POLITICAS_DESLOCAMENTO))
+    parser.add_argument('--camera', choices=CAMERAS, default='Camera_Canto')
+    parser.add_argument('--qualidade-render', choices=list(PERFIS_RENDER), default='previa')
+    parser.add_argument('--resolucao', type=ler_resolucao, default=(1920, 1080))
+    parser.add_argument('--repeticoes', type=int, default=2, help="renders por política (o primeiro inclui a preparação)")
+    parser.add_argument('--saida', help="grava os resultados em JSON neste arquivo")
+    return parser.parse_args(argumentos_blender())
+
+
+def medir_politica(politica, args, pasta):
+    limpar_dados()
+    definir_politica_deslocamento(politica)
+    inicio = time.perf_counter()
+    construir_cena(perfil_render=args.qualidade_render)
+    tempo_construcao = time.perf_counter() - inicio
+
+    scene = bpy.context.scene
+    configurar_render(resolucao=args.resolucao, scene=scene)
+    scene.camera = bpy.data.objects[args.camera]
+    scene.render.image_settings.file_format = 'PNG'
+    tempos = []
+    for i in range(args.repeticoes):
+        scene.render.filepath = os.path.join(pasta, f"{politica}_{i}.png")
+        inicio = time.perf_counter()
+        bpy.ops.render.render(write_still=True)
+        tempos.append(time.perf_counter() - inicio)
+    return {
+        'construcao_s': tempo_construcao,
+        'renders_s': tempos,
+        # Triângulos da malha de viewport; a subdivisão adaptativa só acontece dentro do Cycles
+        'triangulos': contar_triangulos(),
+    }
+
+
+def main():
+    args = ler_argumentos()
+    resultados = {'versao_blender': bpy.app.version_string, 'camera': args.camera,
+                  'qualidade_render': args.qualidade_render, 'politicas': {}}
+    with tempfile.TemporaryDirectory() as pasta:
+        for politica in args.politicas:
+            resultados['politicas'][politica] = medir_politica(politica, args, pasta)
+
+    print(f"\nDeslocamento do feltro ({args.camera}, perfil {args.qualidade_render})")
+    for politica, medicao in resultados['politicas'].items():
+        renders = ', '.join(f"{t:.2f}" for t in medicao['renders_s'])
+        print(f"  {politica:>5}: construção {medicao['construcao_s']:6.2f} s, renders {renders} s")
+
+    if args.saida:
+        with open(args.saida, 'w', encoding='utf-8') as arquivo:
+            json.dump(resultados, arquivo, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+import sys
+import os
+import time
+import argparse
+
+# Compara o backend de geometria por dados (bmesh/bpy.data) com o de operadores
+# Uso: blender -b --factory-startup -P benchmarks/benchmark_geometria.py -- --mesas 1 50
+sys.path.append(os.path.dirname(__file__))
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+from utilitarios import argumentos_blender, limpar_dados
+from script import criar_mesa_branca
+from geometria import definir_backend_geometria, BACKENDS_GEOMETRIA
+
+
+def ler_argumentos():
+    parser = argparse.ArgumentParser(description="Benchmark dos backends de geometria")
+    parser.add_argument('--mesas', type=int, nargs='+', default=[1, 50])
+    parser.add_argument('--espacamento', type=float, default=6.0)
+    return parser.parse_args(argumentos_blender())
+
+
+def medir(backend, qtd_mesas, espacamento):
+    limpar_dados()
+    definir_backend_geometria(backend)
+    colunas = max(1, int(qtd_mesas ** 0.5))
+    inicio = time.perf_counter()
+    for i in range(qtd_mesas):
+        location = ((i % colunas) * espacamento, (i // colunas) * espacamento, 0)
+        criar_mesa_branca(nome_raiz=f"MesaBranca_{i}", location=location)
+    return time.perf_counter() - inicio
+
+
+def main():
+    args = ler_argumentos()
+    resultados = {}
+    for qtd in args.mesas:
+        for backend in BACKENDS_GEOMETRIA:
+            resultados[(backend, qtd)] = medir(backend, qtd, args.espacamento)
+
+    print("\nConstrução de mesas por backend de geometria")
+    for qtd in args.mesas:
+        dados = resultados[('dados', qtd)]
+        operadores = resultados[('operadores', qtd)]
+        print(f"  {qtd:4d} mesa(s): operadores {operadores:8.2f} s  dados {dados:8.2f} s  "
+              f"ganho {operadores / dados:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+import sys
+import os
+import time
+import argparse
+
+# Tempo para gerar lotes de racks aleatórios de cada jogo (só NumPy, roda fora do Blender)
+# Uso: python benchmarks/benchmark_layouts.py --quantidade 10000
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+from layouts_bolas import TIPOS_JOGO, gerar_racks
+from dispersao_bolas import amostrar_mesas
+
+
+def ler_argumentos():
+    parser = argparse.ArgumentParser(description="Benchmark dos layouts de bolas vetorizados")
+    parser.add_argument('--quantidade', type=int, default=10000)
+    parser.add_argument('--repeticoes', type=int, default=5)
+    parser.add_argument('--raio', type=float, default=0.028575)
+    parser.add_argument('--mesas', type=int, default=500, help="mesas da dispersão de meio de jogo")
+    return parser.parse_args()
+
+
+def main():
+    args = ler_argumentos()
+    print(f"\nLayouts de bolas ({args.quantidade} racks por lote, melhor de {args.repeticoes})")
+    for tipo in TIPOS_JOGO:
+        tempos = []
+        for seed in range(args.repeticoes):
+            inicio = time.perf_counter()
+            posicoes, _ = gerar_racks(tipo, args.quantidade, args.raio, seed=seed, ruido=0.05)
+            tempos.append(time.perf_counter() - inicio)
+        print(f"  {tipo:<10} {posicoes.shape[1]:3d} bolas: {min(tempos) * 1000:8.2f} ms")
+
+    # Dispersão de meio de jogo com as medidas padrão das mesas (4 x 2 m, berço de 0.13 m, bola de 0.057 m)
+    inicio = time.perf_counter()
+    amostrar_mesas(args.mesas, 4.0, 2.0, 0.057, 0.1, seed=0, largura_berco=0.13)
+    tempo = time.perf_counter() - inicio
+    print(f"\nMeio de jogo: {args.mesas} mesas em {tempo * 1000:.1f} ms "
+          f"({tempo / args.mesas * 1e6:.0f} µs por mesa de 16 bolas)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+import bpy
+import sys
+import os
+import json
+import time
+import tempfile
+import argparse
+import numpy as np
+
+# Mede tempo de render e ruído de cada perfil de qualidade na cena das três mesas
+# Uso: blender -b --factory-startup -P benchmarks/benchmark_perfis_render.py -- --resolucao 960x540
+#
+# O ruído é estimado renderizando cada câmera duas vezes com seeds diferentes:
+# o desvio padrão de (a - b) / sqrt(2) é o ruído residual por pixel (após o
+# denoiser), em unidades de valor de pixel 0..1.
+sys.path.append(os.path.dirname(__file__))
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+from utilitarios import argumentos_blender, limpar_dados
+from main import construir_cena, CAMERAS
+from perfis_render import PERFIS_RENDER, aplicar_perfil_render
+from renderizacao import ler_resolucao, configurar_render
+
+
+def ler_argumentos():
+    parser = argparse.ArgumentParser(description="Benchmark dos perfis de render")
+    parser.add_argument('--perfis', nargs='+', choices=list(PERFIS_RENDER), default=list(PERFIS_RENDER))
+    parser.add_argument('--cameras', nargs='+', choices=CAMERAS, default=['Camera_Top'])
+    parser.add_argument('--resolucao', type=ler_resolucao, default=(1920, 1080))
+    parser.add_argument('--saida', help="grava os resultados em JSON neste arquivo")
+    return parser.parse_args(argumentos_blender())
+
+
+def renderizar(scene, caminho, seed):
+    scene.cycles.seed = seed
+    scene.render.filepath = caminho
+    inicio = time.perf_counter()
+    bpy.ops.render.render(write_still=True)
+    return time.perf_counter() - inicio
+
+
+def ler_pixels(caminho):
+    imagem = bpy.data.images.load(caminho, check_existing=False)
+    pixels = np.empty(len(imagem.pixels), dtype=np.float32)
+    imagem.pixels.foreach_get(pixels)
+    bpy.data.images.remove(imagem)
+    return pixels.reshape(-1, 4)[:, :3]
+
+
+def medir_perfil(scene, nome, cameras, pasta):
+    aplicar_perfil_render(nome, scene)
+    scene.render.image_settings.file_format = 'PNG'
+    scene.render.image_settings.color_depth = '16'
+    medicoes = []
+    for nome_camera in cameras:
+        scene.camera = bpy.data.objects[nome_camera]
+        caminho_a = os.path.join(pasta, f"{nome}_{nome_camera}_a.png")
+        caminho_b = os.path.join(pasta, f"{nome}_{nome_camera}_b.png")
+        tempo_a = renderizar(scene, caminho_a, seed=0)
+        tempo_b = renderizar(scene, caminho_b, seed=1)
+        diferenca = ler_pixels(caminho_a) - ler_pixels(caminho_b)
+        medicoes.append({
+            'camera': nome_camera,
+            'tempo_primeiro_s': tempo_a,
+            'tempo_segundo_s': tempo_b,
+            'ruido_rms': float(np.std(diferenca) / np.sqrt(2)),
+        })
+    return medicoes
+
+
+def main():
+    args = ler_argumentos()
+    limpar_dados()
+    construir_cena()
+    scene = bpy.context.scene
+    configurar_render(resolucao=args.resolucao, scene=scene)
+
+    resultados = {'versao_blender': bpy.app.version_string, 'resolucao': list(args.resolucao), 'perfis': {}}
+    with tempfile.TemporaryDirectory() as pasta:
+        for nome in args.perfis:
+            resultados['perfis'][nome] = medir_perfil(scene, nome, args.cameras, pasta)
+
+    print(f"\nPerfis de render ({args.resolucao[0]}x{args.resolucao[1]} base, Cycles CPU)")
+    print(f"  {'perfil':<10} {'câmera':<14} {'1º render':>10} {'2º render':>10} {'ruído RMS':>10}")
+    for nome, medicoes in resultados['perfis'].items():
+        for medicao in medicoes:
+            print(f"  {nome:<10} {medicao['camera']:<14} {medicao['tempo_primeiro_s']:9.2f}s "
+                  f"{medicao['tempo_segundo_s']:9.2f}s {medicao['ruido_rms']:10.5f}")
+
+    if args.saida:
+        with open(args.saida, 'w', encoding='utf-8') as arquivo:
+            json.dump(resultados, arquivo, indent=2)
+
+
+if __name__ == "__main__":
+    main()
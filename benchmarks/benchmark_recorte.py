@@ -0,0 +1,122 @@
+import bpy
+import bmesh
+import sys
+import os
+import time
+import argparse
+from mathutils import Matrix
+
+# Compara o recorte das caçapas em lote com o laço original (18 booleanos)
+# Uso: blender -b --factory-startup -P benchmarks/benchmark_recorte.py -- --repeticoes 3
+sys.path.append(os.path.dirname(__file__))
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+from utilitarios import argumentos_blender, limpar_dados
+from recorte_cacapas import recortar_cacapas, SOLVERS_RECORTE
+
+# Mesmas medidas padrão das mesas
+MESA_LARGURA = 2.0
+MESA_COMPRIMENTO = 4.0
+MESA_ALTURA_TOTAL = 1.1
+MESA_ESPESSURA = 0.05
+BORDA_ALTURA = 0.1
+BORDA_ESPESSURA = 0.25
+CACAPA_RAIO = 0.1
+
+
+def ler_argumentos():
+    parser = argparse.ArgumentParser(description="Benchmark do recorte das caçapas")
+    parser.add_argument('--repeticoes', type=int, default=3)
+    parser.add_argument('--solver', choices=SOLVERS_RECORTE, default='EXACT')
+    return parser.parse_args(argumentos_blender())
+
+
+def criar_pecas():
+    # Feltro, berço e borda nas mesmas posições/escalas usadas pelos construtores
+    pecas = []
+    for nome, z, escala in (
+        ("Feltro", MESA_ALTURA_TOTAL - MESA_ESPESSURA / 2, (MESA_COMPRIMENTO, MESA_LARGURA, MESA_ESPESSURA)),
+        ("Berco", MESA_ALTURA_TOTAL + 0.025, (MESA_COMPRIMENTO, MESA_LARGURA, 0.049)),
+        ("Borda", MESA_ALTURA_TOTAL, (MESA_COMPRIMENTO + 2 * BORDA_ESPESSURA, MESA_LARGURA + 2 * BORDA_ESPESSURA, BORDA_ALTURA)),
+    ):
+        bpy.ops.mesh.primitive_cube_add(size=1, location=(0, 0, z), scale=escala)
+        peca = bpy.context.object
+        peca.name = nome
+        pecas.append(peca)
+    return pecas
+
+
+def posicoes_recorte():
+    offset = 0.07
+    z = MESA_ALTURA_TOTAL - MESA_ESPESSURA / 2
+    return [
+        (MESA_COMPRIMENTO/2 - offset, MESA_LARGURA/2 - offset, z),
+        (-MESA_COMPRIMENTO/2 + offset, MESA_LARGURA/2 - offset, z),
+        (MESA_COMPRIMENTO/2 - offset, -MESA_LARGURA/2 + offset, z),
+        (-MESA_COMPRIMENTO/2 + offset, -MESA_LARGURA/2 + offset, z),
+        (0, MESA_LARGURA/2, z),
+        (0, -MESA_LARGURA/2, z),
+    ]
+
+
+def resumo_malha(objeto):
+    # Volume e caixa envolvente em coordenadas do mundo, para comparar os modos
+    bm = bmesh.new()
+    bm.from_mesh(objeto.data)
+    bm.transform(Matrix.LocRotScale(objeto.location, objeto.rotation_euler, objeto.scale))
+    volume = bm.calc_volume(signed=False)
+    coords = [v.co for v in bm.verts]
+    caixa = tuple(
+        round(f(c[eixo] for c in coords), 5)
+        for eixo in range(3) for f in (min, max)
+    )
+    resumo = {'vertices': len(bm.verts), 'faces': len(bm.faces), 'volume': volume, 'caixa': caixa}
+    bm.free()
+    return resumo
+
+
+def medir(em_lote, solver):
+    limpar_dados()
+    pecas = criar_pecas()
+    inicio = time.perf_counter()
+    recortar_cacapas(
+        pecas,
+        posicoes_recorte(),
+        CACAPA_RAIO,
+        BORDA_ALTURA + MESA_ESPESSURA + 0.01,
+        solver=solver,
+        em_lote=em_lote
+    )
+    tempo = time.perf_counter() - inicio
+    return tempo, {peca.name: resumo_malha(peca) for peca in pecas}
+
+
+def main():
+    args = ler_argumentos()
+    tempos = {'laco': [], 'lote': []}
+    resultados = {}
+    for _ in range(args.repeticoes):
+        for modo, em_lote in (('laco', False), ('lote', True)):
+            tempo, resultados[modo] = medir(em_lote, args.solver)
+            tempos[modo].append(tempo)
+
+    print(f"\nRecorte das caçapas (solver {args.solver}, {args.repeticoes} repetições)")
+    for modo in ('laco', 'lote'):
+        print(f"  {modo:>5}: melhor {min(tempos[modo]) * 1000:8.1f} ms  "
+              f"média {sum(tempos[modo]) / len(tempos[modo]) * 1000:8.1f} ms")
+    print(f"  ganho: {min(tempos['laco']) / min(tempos['lote']):.2f}x")
+
+    # Confere se as duas abordagens produzem a mesma geometria
+    identico = True
+    for nome, laco in resultados['laco'].items():
+        lote = resultados['lote'][nome]
+        mesmo_volume = abs(laco['volume'] - lote['volume']) <= 1e-6 * max(laco['volume'], 1e-9)
+        mesma_caixa = laco['caixa'] == lote['caixa']
+        identico = identico and mesmo_volume and mesma_caixa
+        print(f"  {nome}: volume {laco['volume']:.6f} / {lote['volume']:.6f}, "
+              f"vértices {laco['vertices']} / {lote['vertices']}, "
+              f"{'ok' if mesmo_volume and mesma_caixa else 'DIFERENTE'}")
+    print(f"  saída idêntica: {'sim' if identico else 'não'}")
+
+
+if __name__ == "__main__":
+    main()
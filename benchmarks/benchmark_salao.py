@@ -0,0 +1,42 @@
+import sys
+import os
+import time
+import argparse
+
+# Escalabilidade do salão: tempo de construção, objetos e memória por número de mesas
+# Uso: blender -b --factory-startup -P benchmarks/benchmark_salao.py -- --mesas 10 100 500
+sys.path.append(os.path.dirname(__file__))
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+from utilitarios import argumentos_blender, limpar_dados, memoria_rss_mb, contar_dados
+from main import construir_salao, ler_folga
+
+
+def ler_argumentos():
+    parser = argparse.ArgumentParser(description="Benchmark de escala do salão")
+    parser.add_argument('--mesas', type=int, nargs='+', default=[10, 100, 500])
+    parser.add_argument('--folga', type=ler_folga, default=1.5)
+    parser.add_argument('--sem-instancias', action='store_true')
+    return parser.parse_args(argumentos_blender())
+
+
+def main():
+    args = ler_argumentos()
+    linhas = []
+    for qtd in args.mesas:
+        limpar_dados()
+        memoria_antes = memoria_rss_mb()
+        inicio = time.perf_counter()
+        construir_salao(qtd, folga=args.folga, instanciar=not args.sem_instancias)
+        tempo = time.perf_counter() - inicio
+        linhas.append((qtd, tempo, contar_dados(), memoria_rss_mb() - memoria_antes))
+
+    print("\nEscala do salão")
+    print(f"  {'mesas':>6} {'tempo (s)':>10} {'s/mesa':>8} {'objetos':>8} {'malhas':>7} "
+          f"{'materiais':>9} {'imagens':>8} {'memória (MB)':>13}")
+    for qtd, tempo, contagem, memoria in linhas:
+        print(f"  {qtd:6d} {tempo:10.2f} {tempo / qtd:8.3f} {contagem['objetos']:8d} {contagem['malhas']:7d} "
+              f"{contagem['materiais']:9d} {contagem['imagens']:8d} {memoria:13.1f}")
+
+
+if __name__ == "__main__":
+    main()
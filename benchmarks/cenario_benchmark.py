@@ -0,0 +1,58 @@
+import bpy
+import sys
+import os
+import json
+import time
+import argparse
+
+# Executa um cenário de benchmark dentro do Blender e grava as métricas em JSON.
+# Normalmente chamado pela suíte (benchmarks/suite.py), mas pode rodar sozinho:
+# blender -b --factory-startup -P benchmarks/cenario_benchmark.py -- --cenario escura --mesas 10 --saida r.json
+sys.path.append(os.path.dirname(__file__))
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+from utilitarios import argumentos_blender, limpar_dados, pico_memoria_mb, contar_dados, contar_triangulos
+from main import construir_salao
+from layout_salao import VARIANTES
+
+CENARIOS = VARIANTES + ('cena',)
+
+
+def ler_argumentos():
+    parser = argparse.ArgumentParser(description="Cenário de benchmark da construção da cena")
+    parser.add_argument('--cenario', choices=CENARIOS, required=True)
+    parser.add_argument('--mesas', type=int, required=True)
+    parser.add_argument('--saida', required=True)
+    return parser.parse_args(argumentos_blender())
+
+
+def construir(cenario, qtd_mesas):
+    # Variante isolada: todas as mesas construídas por completo com o mesmo construtor
+    # 'cena': o salão do main.py, com o mix padrão de variantes e instâncias
+    if cenario == 'cena':
+        construir_salao(qtd_mesas)
+    else:
+        construir_salao(qtd_mesas, mix_variantes={cenario: 1}, instanciar=False)
+
+
+def main():
+    args = ler_argumentos()
+    limpar_dados()
+    inicio = time.perf_counter()
+    construir(args.cenario, args.mesas)
+    tempo = time.perf_counter() - inicio
+
+    metricas = {
+        'cenario': args.cenario,
+        'mesas': args.mesas,
+        'tempo_s': tempo,
+        'pico_rss_mb': pico_memoria_mb(),
+        'triangulos': contar_triangulos(),
+        'versao_blender': bpy.app.version_string,
+    }
+    metricas.update(contar_dados())
+    with open(args.saida, 'w', encoding='utf-8') as arquivo:
+        json.dump(metricas, arquivo, indent=2)
+
+
+if __name__ == "__main__":
+    main()
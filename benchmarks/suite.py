@@ -0,0 +1,141 @@
+import argparse
+import datetime
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+
+# Suíte de benchmarks da construção da cena. Roda fora do Blender: cada
+# cenário é executado num processo Blender em background novo, as métricas
+# são acumuladas em um arquivo de resultados e comparadas com uma baseline.
+#
+# Uso:
+#   python benchmarks/suite.py --blender /caminho/blender
+#   python benchmarks/suite.py --salvar-baseline
+#   python benchmarks/suite.py --limite-tempo 0.10 --limite-memoria 0.05
+
+PASTA = os.path.dirname(os.path.abspath(__file__))
+CENARIOS = ('branca', 'classica', 'escura', 'cena')
+CONTAGENS = ('objetos', 'malhas', 'materiais', 'imagens', 'triangulos')
+
+
+def ler_argumentos():
+    parser = argparse.ArgumentParser(description="Suíte de benchmarks da construção da cena")
+    parser.add_argument('--blender', default=os.environ.get('BLENDER', 'blender'))
+    parser.add_argument('--cenarios', nargs='+', choices=CENARIOS, default=list(CENARIOS))
+    parser.add_argument('--mesas', type=int, nargs='+', default=[1, 3, 10, 50])
+    parser.add_argument('--repeticoes', type=int, default=1, help="usa o menor tempo entre as repetições")
+    parser.add_argument('--resultados', default=os.path.join(PASTA, 'resultados.json'))
+    parser.add_argument('--baseline', default=os.path.join(PASTA, 'baseline.json'))
+    parser.add_argument('--salvar-baseline', action='store_true')
+    parser.add_argument('--limite-tempo', type=float, default=0.15, help="aumento relativo tolerado no tempo")
+    parser.add_argument('--limite-memoria', type=float, default=0.10, help="aumento relativo tolerado no pico de RSS")
+    parser.add_argument('--limite-contagens', type=float, default=0.0,
+                        help="aumento relativo tolerado em objetos/malhas/materiais/imagens/triângulos")
+    return parser.parse_args()
+
+
+def executar_cenario(blender, cenario, qtd_mesas):
+    with tempfile.TemporaryDirectory() as pasta_temp:
+        saida = os.path.join(pasta_temp, 'metricas.json')
+        comando = [
+            blender, '-b', '--factory-startup',
+            '-P', os.path.join(PASTA, 'cenario_benchmark.py'),
+            '--', '--cenario', cenario, '--mesas', str(qtd_mesas), '--saida', saida,
+        ]
+        processo = subprocess.run(comando, capture_output=True, text=True)
+        if processo.returncode != 0 or not os.path.exists(saida):
+            raise RuntimeError(
+                f"Cenário {cenario} com {qtd_mesas} mesa(s) falhou (código {processo.returncode}):\n"
+                f"{processo.stdout[-2000:]}\n{processo.stderr[-2000:]}"
+            )
+        with open(saida, encoding='utf-8') as arquivo:
+            return json.load(arquivo)
+
+
+def medir(args):
+    medicoes = []
+    for cenario in args.cenarios:
+        for qtd in args.mesas:
+            execucoes = [executar_cenario(args.blender, cenario, qtd) for _ in range(args.repeticoes)]
+            melhor = min(execucoes, key=lambda m: m['tempo_s'])
+            melhor['pico_rss_mb'] = max(m['pico_rss_mb'] for m in execucoes)
+            medicoes.append(melhor)
+            print(f"  {cenario:<9} {qtd:4d} mesa(s): {melhor['tempo_s']:8.2f} s  "
+                  f"{melhor['pico_rss_mb']:8.0f} MB  {melhor['objetos']:6d} objetos  "
+                  f"{melhor['triangulos']:9d} triângulos")
+    return medicoes
+
+
+def salvar_resultados(caminho, medicoes):
+    # O arquivo guarda o histórico de execuções, uma entrada por rodada da suíte
+    historico = []
+    if os.path.exists(caminho):
+        with open(caminho, encoding='utf-8') as arquivo:
+            historico = json.load(arquivo)
+    historico.append({
+        'data': datetime.datetime.now().isoformat(timespec='seconds'),
+        'maquina': platform.node(),
+        'medicoes': medicoes,
+    })
+    with open(caminho, 'w', encoding='utf-8') as arquivo:
+        json.dump(historico, arquivo, indent=2)
+
+
+def _aumento(atual, referencia):
+    if referencia <= 0:
+        return 0.0 if atual <= 0 else float('inf')
+    return (atual - referencia) / referencia
+
+
+def comparar_com_baseline(medicoes, baseline, args):
+    # Retorna a lista de regressões (texto) acima dos limites configurados
+    referencia = {(m['cenario'], m['mesas']): m for m in baseline}
+    regressoes = []
+    for medicao in medicoes:
+        base = referencia.get((medicao['cenario'], medicao['mesas']))
+        if base is None:
+            continue
+        nome = f"{medicao['cenario']}/{medicao['mesas']}"
+        limites = [('tempo_s', args.limite_tempo), ('pico_rss_mb', args.limite_memoria)]
+        limites += [(chave, args.limite_contagens) for chave in CONTAGENS]
+        for chave, limite in limites:
+            aumento = _aumento(medicao[chave], base[chave])
+            if aumento > limite:
+                regressoes.append(
+                    f"{nome}: {chave} {base[chave]:.4g} -> {medicao[chave]:.4g} "
+                    f"(+{aumento * 100:.1f}%, limite {limite * 100:.1f}%)"
+                )
+    return regressoes
+
+
+def main():
+    args = ler_argumentos()
+    print("Executando a suíte de benchmarks")
+    medicoes = medir(args)
+    salvar_resultados(args.resultados, medicoes)
+
+    if args.salvar_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as arquivo:
+            json.dump(medicoes, arquivo, indent=2)
+        print(f"Baseline gravada em {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print("Sem baseline para comparar (use --salvar-baseline)")
+        return 0
+    with open(args.baseline, encoding='utf-8') as arquivo:
+        regressoes = comparar_com_baseline(medicoes, json.load(arquivo), args)
+    if regressoes:
+        print("\nRegressões encontradas:")
+        for regressao in regressoes:
+            print(f"  {regressao}")
+        return 1
+    print("\nNenhuma regressão em relação à baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,80 @@
+import bpy
+import sys
+import os
+import resource
+
+# Funções comuns aos benchmarks (executados dentro do Blender em modo background)
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+from cache_imagens import limpar_cache_imagens
+from registro_materiais import limpar_registro_materiais
+from malhas_compartilhadas import limpar_malhas_compartilhadas
+from cache_bibliotecas import limpar_cache_bibliotecas
+
+
+def argumentos_blender():
+    # Argumentos depois de "--" na linha de comando do Blender
+    return sys.argv[sys.argv.index('--') + 1:] if '--' in sys.argv else []
+
+
+def limpar_dados():
+    # Limpeza só por bpy.data, para não misturar custo de operadores na medição.
+    # A coleção ativa volta a ser a da cena (que não pode ser removida), para que
+    # bpy.context.collection continue válida depois de apagar as coleções criadas
+    for view_layer in bpy.context.scene.view_layers:
+        view_layer.active_layer_collection = view_layer.layer_collection
+    for objeto in list(bpy.data.objects):
+        bpy.data.objects.remove(objeto)
+    for colecao in (bpy.data.meshes, bpy.data.materials, bpy.data.images, bpy.data.lights, bpy.data.cameras,
+                    bpy.data.collections):
+        for bloco in list(colecao):
+            colecao.remove(bloco)
+    limpar_cache_imagens()
+    limpar_registro_materiais()
+    limpar_malhas_compartilhadas()
+    limpar_cache_bibliotecas()
+
+
+def memoria_rss_mb():
+    # Memória residente atual do processo (Linux); senão o pico informado pelo sistema
+    try:
+        with open('/proc/self/status') as arquivo:
+            for linha in arquivo:
+                if linha.startswith('VmRSS:'):
+                    return int(linha.split()[1]) / 1024
+    except OSError:
+        pass
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS informa em bytes, Linux em KB
+    return pico / (1024 * 1024) if sys.platform == 'darwin' else pico / 1024
+
+
+def pico_memoria_mb():
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return pico / (1024 * 1024) if sys.platform == 'darwin' else pico / 1024
+
+
+def contar_dados():
+    return {
+        'objetos': len(bpy.data.objects),
+        'malhas': len(bpy.data.meshes),
+        'materiais': len(bpy.data.materials),
+        'imagens': len(bpy.data.images),
+    }
+
+
+def contar_triangulos():
+    # Triângulos da cena avaliada (modificadores aplicados, instâncias contadas uma a uma)
+    depsgraph = bpy.context.evaluated_depsgraph_get()
+    por_objeto = {}
+    total = 0
+    for instancia in depsgraph.object_instances:
+        objeto = instancia.object
+        if objeto.type != 'MESH':
+            continue
+        chave = objeto.original.name
+        if chave not in por_objeto:
+            malha = objeto.to_mesh()
+            por_objeto[chave] = sum(p.loop_total - 2 for p in malha.polygons)
+            objeto.to_mesh_clear()
+        total += por_objeto[chave]
+    return total
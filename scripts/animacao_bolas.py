@@ -0,0 +1,96 @@
+import bpy
+import re
+import numpy as np
+from perfilador import medir_etapa
+from simulacao_bilhar import simular_tacada, trajetorias_3d
+
+# Animação das bolas a partir de trajetórias em arrays (F quadros x B bolas).
+# Em vez de um keyframe_insert por bola, canal e quadro, cada F-curve recebe
+# todas as chaves de uma vez: keyframe_points.add(F) + foreach_set('co') e um
+# fcurve.update() para ordenar e recalcular as alças. Com uma chave por
+# quadro as curvas passam exatamente por todos os valores simulados.
+PADRAO_BOLA = re.compile(r"^Ball(cue|\d+)(\.\d+)?$", re.IGNORECASE)
+
+
+def fcurves_objeto(objeto):
+    animacao = objeto.animation_data
+    acao = animacao.action
+    # Blender 4.4+: as F-curves ficam no channelbag do slot, dentro da camada da ação
+    if getattr(acao, 'layers', None):
+        return acao.layers[0].strips[0].channelbag(animacao.action_slot).fcurves
+    return acao.fcurves
+
+
+def escrever_chaves(objeto, data_path, quadros, valores):
+    # valores (F, C): uma F-curve por componente de data_path, preenchida de uma vez
+    valores = np.asarray(valores, dtype=np.float32).reshape(len(quadros), -1)
+    # Uma chave inserida do jeito normal cria ação, slot e F-curves em qualquer versão
+    objeto.keyframe_insert(data_path, frame=float(quadros[0]))
+    fcurves = fcurves_objeto(objeto)
+    co = np.empty((len(quadros), 2), dtype=np.float32)
+    co[:, 0] = quadros
+    for indice in range(valores.shape[1]):
+        fcurve = fcurves.find(data_path, index=indice)
+        pontos = fcurve.keyframe_points
+        pontos.add(len(quadros) - len(pontos))
+        co[:, 1] = valores[:, indice]
+        pontos.foreach_set('co', co.ravel())
+        fcurve.update()
+
+
+@medir_etapa()
+def animar_bolas(bolas, quadros, localizacoes, rotacoes=None):
+    # bolas: [objeto] (B); localizacoes (F, B, 3); rotacoes (F, B, 4) em quaternions (w, x, y, z)
+    for i, bola in enumerate(bolas):
+        # Começa de uma ação vazia: cada F-curve fica só com a chave criada por escrever_chaves
+        bola.animation_data_clear()
+        escrever_chaves(bola, 'location', quadros, localizacoes[:, i])
+        if rotacoes is not None:
+            bola.rotation_mode = 'QUATERNION'
+            escrever_chaves(bola, 'rotation_quaternion', quadros, rotacoes[:, i])
+
+
+def bolas_da_mesa(raiz):
+    # {número: objeto} das bolas da mesa (0 = branca); vazio no rack em Geometry Nodes
+    bolas = {}
+    for objeto in raiz.children_recursive:
+        encontrado = PADRAO_BOLA.match(objeto.name)
+        if encontrado:
+            bolas[0 if encontrado.group(1).lower() == 'cue' else int(encontrado.group(1))] = objeto
+    return bolas
+
+
+@medir_etapa()
+def simular_e_animar_mesas(raizes, velocidade_branca, bola_raio, mesa_comprimento, mesa_largura, cacapa_raio,
+                           largura_berco=0.0, quadros=120, quadro_inicial=1, fps=None, profundidade=None, **opcoes):
+    # Simula a mesma tacada em todas as mesas (num lote por conjunto de bolas) e grava as chaves.
+    # Retorna {nome da raiz: bolas encaçapadas}; mesas sem bolas animáveis ficam de fora.
+    fps = fps or bpy.context.scene.render.fps
+    profundidade = 3 * bola_raio if profundidade is None else profundidade
+    lotes = {}
+    for raiz in raizes:
+        bolas = bolas_da_mesa(raiz)
+        if bolas:
+            lotes.setdefault(tuple(sorted(bolas)), []).append((raiz, bolas))
+
+    resumo = {}
+    numeros_quadros = quadro_inicial + np.arange(quadros + 1)
+    for numeros, mesas in lotes.items():
+        # A branca (0) vem primeiro em `numeros`; posições no plano da mesa, como os construtores
+        objetos = [[bolas[numero] for numero in numeros] for _, bolas in mesas]
+        posicoes = np.array([[bola.location[:2] for bola in linha] for linha in objetos])
+        alturas = np.array([[linha[0].location.z] for linha in objetos])
+        trajetorias, rotacoes, encacapadas = simular_tacada(
+            posicoes, velocidade_branca, bola_raio, mesa_comprimento, mesa_largura, cacapa_raio,
+            quadros=quadros, fps=fps, indice_branca=0, largura_berco=largura_berco, **opcoes)
+        localizacoes = trajetorias_3d(trajetorias, encacapadas, alturas, profundidade)
+        for m, (raiz, _) in enumerate(mesas):
+            animar_bolas(objetos[m], numeros_quadros, localizacoes[:, m], rotacoes[:, m])
+            resumo[raiz.name] = int((encacapadas[m] >= 0).sum())
+    return resumo
+
+
+def imprimir_resumo_tacada(resumo, quadros):
+    print(f"\nTacada simulada em {len(resumo)} mesas ({quadros} quadros)")
+    for nome, encacapadas in resumo.items():
+        print(f"  {nome:<24} {encacapadas:2d} bolas encaçapadas")
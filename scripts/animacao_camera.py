@@ -0,0 +1,122 @@
+import bpy
+import os
+import math
+import time
+from mathutils import Vector
+from perfilador import etapa
+from passes_anotacao import passes_anotacao_ativos, apontar_passes
+from animacao_bolas import fcurves_objeto
+
+# Animação de câmera sobre a cena já construída: órbita (turntable) em torno de
+# um ponto ou dolly passando pelas poses das câmeras fixas. Os quadros são
+# renderizados com render.use_persistent_data, então BVH, shaders e texturas
+# são montados no primeiro quadro e reaproveitados nos seguintes.
+MODOS_ANIMACAO = ('orbita', 'dolly')
+
+
+def _pose(objeto):
+    bpy.context.view_layer.update()
+    localizacao, rotacao, _ = objeto.matrix_world.decompose()
+    return localizacao, rotacao
+
+
+def criar_camera_orbita(nome='Camera_Orbita', centro=(0, 0, 1.1), pose_inicial='Camera_Canto',
+                        quadro_inicial=1, quadro_final=120, voltas=1.0):
+    # A câmera é filha de um vazio no centro; o vazio gira em Z com interpolação linear
+    pivo = bpy.data.objects.new(f"{nome}_Pivo", None)
+    bpy.context.collection.objects.link(pivo)
+    pivo.location = centro
+
+    referencia = bpy.data.objects.get(pose_inicial)
+    camera = bpy.data.objects.new(nome, bpy.data.cameras.new(nome))
+    bpy.context.collection.objects.link(camera)
+    if referencia is not None:
+        camera.data.lens = referencia.data.lens
+        localizacao, _ = _pose(referencia)
+        camera.location = localizacao - Vector(centro)
+    else:
+        camera.location = (10, 0, 4)
+    camera.parent = pivo
+
+    # Mantém a câmera apontada para o centro durante a volta
+    restricao = camera.constraints.new('TRACK_TO')
+    restricao.target = pivo
+    restricao.track_axis = 'TRACK_NEGATIVE_Z'
+    restricao.up_axis = 'UP_Y'
+
+    pivo.rotation_euler = (0, 0, 0)
+    pivo.keyframe_insert('rotation_euler', index=2, frame=quadro_inicial)
+    pivo.rotation_euler = (0, 0, 2 * math.pi * voltas)
+    pivo.keyframe_insert('rotation_euler', index=2, frame=quadro_final)
+    # Velocidade constante: as chaves passam a linear direto na F-curve, sem mexer nas preferências
+    for ponto in fcurves_objeto(pivo).find('rotation_euler', index=2).keyframe_points:
+        ponto.interpolation = 'LINEAR'
+    return camera
+
+
+def criar_camera_dolly(nome='Camera_Dolly', poses=('Camera_Top2', 'Camera_Top', 'Camera_Canto'),
+                       quadro_inicial=1, quadro_final=120):
+    # Keyframes nas poses das câmeras existentes, distribuídos igualmente entre os quadros
+    referencias = [bpy.data.objects[nome_pose] for nome_pose in poses]
+    camera = bpy.data.objects.new(nome, bpy.data.cameras.new(nome))
+    bpy.context.collection.objects.link(camera)
+    camera.data.lens = referencias[0].data.lens
+    camera.rotation_mode = 'QUATERNION'
+
+    passo = (quadro_final - quadro_inicial) / max(len(referencias) - 1, 1)
+    anterior = None
+    for i, referencia in enumerate(referencias):
+        quadro = round(quadro_inicial + i * passo)
+        localizacao, rotacao = _pose(referencia)
+        # Mesmo hemisfério do quaternion anterior, para a interpolação seguir o caminho curto
+        if anterior is not None and anterior.dot(rotacao) < 0:
+            rotacao.negate()
+        camera.location = localizacao
+        camera.rotation_quaternion = rotacao
+        camera.keyframe_insert('location', frame=quadro)
+        camera.keyframe_insert('rotation_quaternion', frame=quadro)
+        anterior = rotacao
+    return camera
+
+
+def criar_camera_animada(modo, quadro_inicial=1, quadro_final=120, **opcoes):
+    if modo not in MODOS_ANIMACAO:
+        raise ValueError(f"Modo de animação '{modo}' inválido, use um de {MODOS_ANIMACAO}")
+    if modo == 'orbita':
+        return criar_camera_orbita(quadro_inicial=quadro_inicial, quadro_final=quadro_final, **opcoes)
+    return criar_camera_dolly(quadro_inicial=quadro_inicial, quadro_final=quadro_final, **opcoes)
+
+
+def renderizar_animacao(camera, pasta_saida, quadro_inicial, quadro_final, scene=None):
+    # Renderiza quadro a quadro em <pasta_saida>/quadro_NNNN.png e retorna [(quadro, segundos)]
+    scene = scene or bpy.context.scene
+    os.makedirs(pasta_saida, exist_ok=True)
+    scene.camera = camera
+    scene.frame_start = quadro_inicial
+    scene.frame_end = quadro_final
+    scene.render.use_persistent_data = True
+    scene.render.image_settings.file_format = 'PNG'
+
+    tempos = []
+    for quadro in range(quadro_inicial, quadro_final + 1):
+        scene.frame_set(quadro)
+        scene.render.filepath = os.path.join(os.path.abspath(pasta_saida), f"quadro_{quadro:04d}.png")
+        if passes_anotacao_ativos():
+            apontar_passes(scene.render.filepath, scene)
+        inicio = time.perf_counter()
+        with etapa('render_quadro'):
+            bpy.ops.render.render(write_still=True)
+        tempos.append((quadro, time.perf_counter() - inicio))
+    return tempos
+
+
+def imprimir_tempos_animacao(tempos):
+    print("\nTempo de render por quadro")
+    for quadro, segundos in tempos:
+        print(f"  quadro {quadro:4d} {segundos:8.2f} s")
+    if len(tempos) > 1:
+        primeiro = tempos[0][1]
+        media_restantes = sum(s for _, s in tempos[1:]) / (len(tempos) - 1)
+        print(f"  primeiro quadro {primeiro:.2f} s, média dos demais {media_restantes:.2f} s "
+              f"(custo de preparação ~{primeiro - media_restantes:.2f} s)")
+    print(f"  total {sum(s for _, s in tempos):.2f} s")
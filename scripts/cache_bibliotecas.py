@@ -0,0 +1,76 @@
+import bpy
+import os
+
+# Cache de bibliotecas .blend: cada arquivo/objeto é lido uma vez por sessão e
+# fica guardado como modelo fora da cena. Cada importação seguinte é só uma
+# cópia leve do objeto que compartilha malha e materiais com o modelo.
+# Com link=True os dados ficam ligados ao arquivo de origem (não são copiados).
+_config = {'link': False}
+_modelos = {}
+_estatisticas = {'carregamentos': 0, 'reutilizacoes': 0}
+
+
+def definir_link_bibliotecas(link):
+    _config['link'] = bool(link)
+
+
+def link_bibliotecas():
+    return _config['link']
+
+
+def _modelo_valido(modelo):
+    # O modelo pode ter sido removido (ex.: orphans_purge no limpar_cena)
+    try:
+        modelo.name
+        return True
+    except ReferenceError:
+        return False
+
+
+def obter_modelo_biblioteca(caminho_arquivo, nome_objeto, link=None):
+    # Retorna o objeto modelo cujo nome começa com nome_objeto (ou None)
+    link = _config['link'] if link is None else link
+    chave = (os.path.realpath(os.path.abspath(caminho_arquivo)), nome_objeto, link)
+    modelo = _modelos.get(chave)
+    if modelo is not None and _modelo_valido(modelo):
+        _estatisticas['reutilizacoes'] += 1
+        return modelo
+
+    with bpy.data.libraries.load(chave[0], link=link) as (data_from, data_to):
+        # Filtra os objetos com o nome especificado
+        data_to.objects = [nome for nome in data_from.objects if nome.startswith(nome_objeto)]
+
+    modelo = next((obj for obj in data_to.objects if obj is not None), None)
+    if modelo is not None:
+        _modelos[chave] = modelo
+        _estatisticas['carregamentos'] += 1
+    return modelo
+
+
+def instanciar_modelo(modelo):
+    # Objeto novo na coleção ativa, com os dados do modelo compartilhados
+    copia = modelo.copy()
+    bpy.context.collection.objects.link(copia)
+    return copia
+
+
+def estatisticas_bibliotecas():
+    return {
+        'carregamentos': _estatisticas['carregamentos'],
+        'reutilizacoes': _estatisticas['reutilizacoes'],
+        'modelos_em_cache': len(_modelos),
+    }
+
+
+def imprimir_estatisticas_bibliotecas():
+    estatisticas = estatisticas_bibliotecas()
+    print(
+        f"Cache de bibliotecas: {estatisticas['carregamentos']} arquivos lidos, "
+        f"{estatisticas['reutilizacoes']} importações reaproveitadas"
+    )
+
+
+def limpar_cache_bibliotecas():
+    _modelos.clear()
+    _estatisticas['carregamentos'] = 0
+    _estatisticas['reutilizacoes'] = 0
@@ -0,0 +1,91 @@
+import bpy
+import os
+from proxies_texturas import resolver_caminho_textura
+
+# Cache de imagens compartilhado por todos os scripts do processo.
+# A chave é (caminho absoluto resolvido, colorspace, mtime, tamanho do arquivo),
+# então a mesma textura usada por várias peças/mesas vira um único data-block.
+# O caminho passa antes pelos proxies de textura: com qualidade reduzida a
+# chave (e o data-block) é a do proxy do nível escolhido.
+_cache = {}
+_acertos_por_chave = {}
+_estatisticas = {'acertos': 0, 'falhas': 0}
+
+
+def _chave_imagem(caminho, colorspace):
+    caminho_real = os.path.realpath(os.path.abspath(caminho))
+    info = os.stat(caminho_real)
+    return (caminho_real, colorspace, info.st_mtime_ns, info.st_size)
+
+
+def _imagem_valida(imagem):
+    # O data-block pode ter sido removido (ex.: orphans_purge no limpar_cena)
+    try:
+        imagem.name
+        return True
+    except ReferenceError:
+        return False
+
+
+def _bytes_imagem(imagem):
+    # Estimativa da memória ocupada pelos pixels da imagem
+    try:
+        largura, altura = imagem.size
+        bytes_canal = 4 if imagem.is_float else 1
+        return largura * altura * imagem.channels * bytes_canal
+    except ReferenceError:
+        return 0
+
+
+def carregar_imagem_em_cache(caminho, colorspace='sRGB'):
+    # Retorna o data-block já carregado ou carrega a imagem uma única vez
+    caminho = resolver_caminho_textura(caminho)
+    chave = _chave_imagem(caminho, colorspace)
+    imagem = _cache.get(chave)
+    if imagem is not None and _imagem_valida(imagem):
+        _estatisticas['acertos'] += 1
+        _acertos_por_chave[chave] = _acertos_por_chave.get(chave, 0) + 1
+        return imagem
+
+    # Descarta versões antigas do mesmo arquivo (arquivo alterado no disco)
+    for chave_antiga in [c for c in _cache if c[:2] == chave[:2]]:
+        del _cache[chave_antiga]
+        _acertos_por_chave.pop(chave_antiga, None)
+
+    imagem = bpy.data.images.load(chave[0], check_existing=False)
+    imagem.colorspace_settings.name = colorspace
+    _cache[chave] = imagem
+    _acertos_por_chave[chave] = 0
+    _estatisticas['falhas'] += 1
+    return imagem
+
+
+def estatisticas_cache_imagens():
+    # Acertos/falhas e memória economizada (bytes que seriam duplicados sem o cache)
+    memoria_economizada = 0
+    for chave, acertos in _acertos_por_chave.items():
+        if acertos:
+            memoria_economizada += acertos * _bytes_imagem(_cache[chave])
+    return {
+        'acertos': _estatisticas['acertos'],
+        'falhas': _estatisticas['falhas'],
+        'imagens_em_cache': len(_cache),
+        'memoria_economizada_mb': memoria_economizada / (1024 * 1024),
+    }
+
+
+def imprimir_estatisticas_cache_imagens():
+    estatisticas = estatisticas_cache_imagens()
+    print(
+        f"Cache de imagens: {estatisticas['acertos']} acertos, "
+        f"{estatisticas['falhas']} falhas, "
+        f"{estatisticas['imagens_em_cache']} imagens, "
+        f"{estatisticas['memoria_economizada_mb']:.1f} MB economizados"
+    )
+
+
+def limpar_cache_imagens():
+    _cache.clear()
+    _acertos_por_chave.clear()
+    _estatisticas['acertos'] = 0
+    _estatisticas['falhas'] = 0
@@ -0,0 +1,237 @@
+import bpy
+import sys
+import os
+import re
+import json
+import math
+import time
+import random
+import inspect
+import argparse
+from mathutils import Vector
+
+# Gerador de dataset sintético para detecção de bolas.
+# A cena das três mesas é construída uma única vez; para cada imagem são
+# sorteados a mesa (variante de feltro), as posições das bolas, a pose da
+# câmera e a iluminação, e o render usa o perfil 'rascunho' com dados
+# persistentes. Sem --resolucao a base é 1280x720 na porcentagem do perfil
+# (640x360 no rascunho). Cada imagem vai para <saida>/imagens/ e suas caixas 2D
+# por bola são acrescentadas em <saida>/anotacoes.jsonl assim que ficam prontas.
+#
+# Uso: blender -b -P scripts/dataset_sintetico.py -- --imagens 5000 --saida dataset --seed 1
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from bpy_extras.object_utils import world_to_camera_view
+from main import construir_cena, MESAS_CENA, CONSTRUTORES_MESA
+from perfis_render import PERFIS_RENDER
+from dispersao_bolas import amostrar_meio_jogo
+from layouts_bolas import escrever_pontos_rack
+from renderizacao import ler_resolucao, configurar_render
+from passes_anotacao import configurar_passes, atribuir_indices_passe, salvar_indices, apontar_passes
+
+PADRAO_BOLA = re.compile(r"^Ball(cue|\d+)(\.\d+)?$", re.IGNORECASE)
+RESOLUCAO_PADRAO = (1280, 720)
+# Direções sobre a esfera projetadas para achar a caixa 2D de cada bola
+DIRECOES_CAIXA = [
+    Vector((math.cos(a) * math.sin(p), math.sin(a) * math.sin(p), math.cos(p)))
+    for p in (0, math.pi / 4, math.pi / 2, 3 * math.pi / 4, math.pi)
+    for a in [i * math.pi / 4 for i in range(8)]
+]
+
+
+def ler_argumentos():
+    argv = sys.argv[sys.argv.index('--') + 1:] if '--' in sys.argv else []
+    parser = argparse.ArgumentParser(description="Gera imagens com caixas 2D das bolas")
+    parser.add_argument('--imagens', type=int, default=1000)
+    parser.add_argument('--saida', default=os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'dataset'))
+    parser.add_argument('--resolucao', type=ler_resolucao,
+                        help="ex.: 1280x720 (renderizada a 100%%); sem ela, 1280x720 na porcentagem do perfil")
+    parser.add_argument('--porcentagem-resolucao', type=int, choices=range(1, 101), metavar='1-100')
+    parser.add_argument('--qualidade-render', choices=list(PERFIS_RENDER), default='rascunho')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--bolas-min', type=int, default=6, help="mínimo de bolas na mesa (o resto foi encaçapado)")
+    parser.add_argument('--passes', action='store_true',
+                        help="grava também o EXR com profundidade, IndexOB e cryptomatte de cada imagem")
+    parser.add_argument('--relatorio-a-cada', type=int, default=25, help="imprime a vazão a cada N imagens")
+    return parser.parse_args(argv)
+
+
+def dimensoes_mesa(variante):
+    padrao = inspect.signature(CONSTRUTORES_MESA[variante]).parameters
+    return {nome: padrao[nome].default
+            for nome in ('mesa_comprimento', 'mesa_largura', 'bola_raio', 'cacapa_raio', 'mesa_altura_total',
+                         'largura_berco')}
+
+
+def numero_bola(nome):
+    # "Ball7" -> 7, "Ballcue.001" -> 0, outros -> None
+    encontrado = PADRAO_BOLA.match(nome)
+    if not encontrado:
+        return None
+    return 0 if encontrado.group(1).lower() == 'cue' else int(encontrado.group(1))
+
+
+def preparar_mesas():
+    # Para cada mesa: raiz, objetos da hierarquia, bolas por número (ou o objeto do rack) e medidas
+    mesas = []
+    for mesa in MESAS_CENA:
+        raiz = bpy.data.objects[mesa['nome_raiz']]
+        objetos = [raiz] + list(raiz.children_recursive)
+        bolas = {numero_bola(o.name): o for o in objetos if numero_bola(o.name) is not None}
+        rack = next((o for o in objetos if o.name.startswith("Rack_Bolas")), None)
+        mesas.append({'variante': mesa['variante'], 'raiz': raiz, 'objetos': objetos,
+                      'bolas': bolas, 'rack': rack, 'dimensoes': dimensoes_mesa(mesa['variante'])})
+    return mesas
+
+
+def mostrar_somente(mesas, escolhida):
+    for mesa in mesas:
+        oculta = mesa is not escolhida
+        for objeto in mesa['objetos']:
+            if objeto.hide_render != oculta:
+                objeto.hide_render = oculta
+
+
+def sortear_bolas(mesa, rng, bolas_min):
+    # Posições de meio de jogo para um subconjunto das bolas (a branca sempre fica)
+    dimensoes = mesa['dimensoes']
+    quantidade = rng.randint(bolas_min, 16)
+    numeros = [0] + rng.sample(range(1, 16), quantidade - 1)
+    posicoes = amostrar_meio_jogo(dimensoes['mesa_comprimento'], dimensoes['mesa_largura'],
+                                  dimensoes['bola_raio'], dimensoes['cacapa_raio'], quantidade=quantidade, rng=rng,
+                                  largura_berco=dimensoes['largura_berco'])
+    z = dimensoes['mesa_altura_total'] + dimensoes['bola_raio']
+    if mesa['rack'] is not None:
+        escrever_pontos_rack(mesa['rack'].data, [(x, y, z) for x, y in posicoes], numeros)
+    else:
+        visiveis = dict(zip(numeros, posicoes))
+        for numero, bola in mesa['bolas'].items():
+            bola.hide_render = numero not in visiveis
+            if numero in visiveis:
+                bola.location = (visiveis[numero][0], visiveis[numero][1], z)
+                # Giro aleatório para o número não aparecer sempre na mesma face
+                bola.rotation_euler = [rng.uniform(0, 2 * math.pi) for _ in range(3)]
+    return dict(zip(numeros, posicoes))
+
+
+def criar_camera_dataset():
+    alvo = bpy.data.objects.new("Dataset_Alvo", None)
+    bpy.context.collection.objects.link(alvo)
+    camera = bpy.data.objects.new("Dataset_Camera", bpy.data.cameras.new("Dataset_Camera"))
+    bpy.context.collection.objects.link(camera)
+    restricao = camera.constraints.new('TRACK_TO')
+    restricao.target = alvo
+    restricao.track_axis = 'TRACK_NEGATIVE_Z'
+    restricao.up_axis = 'UP_Y'
+    return camera, alvo
+
+
+def sortear_camera(camera, alvo, mesa, rng):
+    # Pose em coordenadas esféricas em torno de um ponto perto do centro da mesa
+    centro = mesa['raiz'].matrix_world.translation
+    altura = mesa['dimensoes']['mesa_altura_total']
+    alvo.location = (centro.x + rng.uniform(-0.6, 0.6), centro.y + rng.uniform(-0.3, 0.3), altura)
+    distancia = rng.uniform(2.5, 6.0)
+    elevacao = math.radians(rng.uniform(25, 85))
+    azimute = rng.uniform(0, 2 * math.pi)
+    camera.location = (
+        alvo.location.x + distancia * math.cos(elevacao) * math.cos(azimute),
+        alvo.location.y + distancia * math.cos(elevacao) * math.sin(azimute),
+        altura + distancia * math.sin(elevacao),
+    )
+    camera.data.lens = rng.uniform(28, 55)
+    return {'distancia': distancia, 'elevacao_graus': math.degrees(elevacao),
+            'azimute_graus': math.degrees(azimute), 'lente_mm': camera.data.lens}
+
+
+def sortear_luzes(luzes, rng):
+    # Energia e cor de cada luz em torno dos valores da cena construída
+    for luz, energia, cor in luzes:
+        luz.data.energy = energia * rng.uniform(0.4, 1.6)
+        luz.data.color = [min(1.0, c * rng.uniform(0.85, 1.15)) for c in cor]
+
+
+def caixas_bolas(scene, camera, mesa, posicoes, largura, altura):
+    # Caixa 2D em pixels (x0, y0, x1, y1, origem no canto superior esquerdo) de cada bola visível
+    dimensoes = mesa['dimensoes']
+    raio = dimensoes['bola_raio']
+    matriz = mesa['raiz'].matrix_world
+    z = dimensoes['mesa_altura_total'] + raio
+    anotacoes = []
+    for numero, (x, y) in sorted(posicoes.items()):
+        centro = matriz @ Vector((x, y, z))
+        projetados = [world_to_camera_view(scene, camera, centro + direcao * raio) for direcao in DIRECOES_CAIXA]
+        if any(p.z <= 0 for p in projetados):
+            continue
+        x0 = max(0.0, min(p.x for p in projetados)) * largura
+        x1 = min(1.0, max(p.x for p in projetados)) * largura
+        y0 = (1 - min(1.0, max(p.y for p in projetados))) * altura
+        y1 = (1 - max(0.0, min(p.y for p in projetados))) * altura
+        if x1 <= x0 or y1 <= y0:
+            continue
+        anotacoes.append({'numero': numero, 'bbox': [round(x0, 2), round(y0, 2), round(x1, 2), round(y1, 2)]})
+    return anotacoes
+
+
+def gerar_dataset(args):
+    construir_cena(perfil_render=args.qualidade_render)
+    scene = bpy.context.scene
+    porcentagem = args.porcentagem_resolucao
+    if args.resolucao is None and porcentagem is None:
+        porcentagem = PERFIS_RENDER[args.qualidade_render]['porcentagem_resolucao']
+    configurar_render(resolucao=args.resolucao or RESOLUCAO_PADRAO, scene=scene, porcentagem=porcentagem)
+    scene.render.image_settings.file_format = 'PNG'
+    largura = scene.render.resolution_x * scene.render.resolution_percentage // 100
+    altura = scene.render.resolution_y * scene.render.resolution_percentage // 100
+
+    mesas = preparar_mesas()
+    camera, alvo = criar_camera_dataset()
+    scene.camera = camera
+    luzes = [(o, o.data.energy, tuple(o.data.color)) for o in scene.objects if o.type == 'LIGHT']
+    rng = random.Random(args.seed)
+    if args.passes:
+        configurar_passes(scene)
+        salvar_indices(os.path.join(args.saida, 'indices.json'), atribuir_indices_passe(scene))
+
+    pasta_imagens = os.path.join(args.saida, 'imagens')
+    os.makedirs(pasta_imagens, exist_ok=True)
+    inicio = time.perf_counter()
+    tempo_render = 0.0
+    with open(os.path.join(args.saida, 'anotacoes.jsonl'), 'a', encoding='utf-8') as anotacoes:
+        for indice in range(args.imagens):
+            mesa = rng.choice(mesas)
+            mostrar_somente(mesas, mesa)
+            posicoes = sortear_bolas(mesa, rng, args.bolas_min)
+            pose = sortear_camera(camera, alvo, mesa, rng)
+            sortear_luzes(luzes, rng)
+            bpy.context.view_layer.update()
+
+            nome_imagem = f"{args.seed:04d}_{indice:06d}.png"
+            scene.render.filepath = os.path.join(os.path.abspath(pasta_imagens), nome_imagem)
+            caminho_passes = apontar_passes(scene.render.filepath, scene) if args.passes else None
+            inicio_render = time.perf_counter()
+            bpy.ops.render.render(write_still=True)
+            tempo_render += time.perf_counter() - inicio_render
+
+            registro = {
+                'imagem': f"imagens/{nome_imagem}",
+                'largura': largura,
+                'altura': altura,
+                'variante': mesa['variante'],
+                'camera': pose,
+                'bolas': caixas_bolas(scene, camera, mesa, posicoes, largura, altura),
+            }
+            if caminho_passes:
+                registro['passes'] = f"imagens/{os.path.basename(caminho_passes)}"
+            anotacoes.write(json.dumps(registro) + '\n')
+            anotacoes.flush()
+
+            feitas = indice + 1
+            if feitas % args.relatorio_a_cada == 0 or feitas == args.imagens:
+                decorrido = time.perf_counter() - inicio
+                print(f"{feitas}/{args.imagens} imagens, {feitas / decorrido * 3600:.0f} imagens/h "
+                      f"(render {tempo_render / feitas:.2f} s/imagem, "
+                      f"sorteio e anotação {(decorrido - tempo_render) / feitas * 1000:.1f} ms/imagem)")
+
+
+if __name__ == "__main__":
+    gerar_dataset(ler_argumentos())
@@ -0,0 +1,83 @@
+import math
+import random
+
+# Posições de "meio de jogo": bolas espalhadas ao acaso dentro das tabelas,
+# sem se sobrepor e longe das caçapas. Amostragem por lançamento de dardos
+# com distância mínima (estilo Poisson-disk) sobre uma grade hash: a célula
+# tem lado distancia_minima / sqrt(2), então cabe no máximo uma bola por
+# célula e cada candidato só consulta as 5x5 células vizinhas.
+QTD_BOLAS = 16
+
+
+def limites_jogo(mesa_comprimento, mesa_largura, bola_raio, largura_berco=0.0):
+    # Maior |x| e |y| do centro de uma bola encostada na face interna do berço.
+    # largura_berco é a dos construtores: o recorte do berço é menor que a mesa
+    # por essa medida no total, então cada lado perde metade dela.
+    return (mesa_comprimento / 2 - largura_berco / 2 - bola_raio,
+            mesa_largura / 2 - largura_berco / 2 - bola_raio)
+
+
+def posicoes_cacapas_mesa(mesa_comprimento, mesa_largura, offset=0.07):
+    # Centros das 6 caçapas no plano da mesa, iguais aos dos construtores
+    return [
+        (mesa_comprimento/2 - offset, mesa_largura/2 - offset),
+        (-mesa_comprimento/2 + offset, mesa_largura/2 - offset),
+        (mesa_comprimento/2 - offset, -mesa_largura/2 + offset),
+        (-mesa_comprimento/2 + offset, -mesa_largura/2 + offset),
+        (0, mesa_largura/2),
+        (0, -mesa_largura/2),
+    ]
+
+
+def amostrar_meio_jogo(mesa_comprimento, mesa_largura, bola_raio, cacapa_raio, quantidade=QTD_BOLAS,
+                       folga=0.1, rng=None, seed=None, tentativas=10000, largura_berco=0.0):
+    # Retorna [(x, y)] de `quantidade` bolas; folga é a distância extra entre bolas, em raios.
+    # Passe a largura_berco do construtor para as bolas ficarem dentro das tabelas.
+    rng = rng or random.Random(seed)
+    distancia_minima = 2 * bola_raio * (1 + folga)
+    distancia_minima2 = distancia_minima ** 2
+    tamanho_celula = distancia_minima / math.sqrt(2)
+    limite_x, limite_y = limites_jogo(mesa_comprimento, mesa_largura, bola_raio, largura_berco)
+    cacapas = posicoes_cacapas_mesa(mesa_comprimento, mesa_largura)
+    distancia_cacapa2 = (cacapa_raio + bola_raio) ** 2
+
+    grade = {}
+    posicoes = []
+    for _ in range(tentativas):
+        if len(posicoes) == quantidade:
+            return posicoes
+        x = rng.uniform(-limite_x, limite_x)
+        y = rng.uniform(-limite_y, limite_y)
+        if any((x - cx) ** 2 + (y - cy) ** 2 < distancia_cacapa2 for cx, cy in cacapas):
+            continue
+
+        celula_x = math.floor(x / tamanho_celula)
+        celula_y = math.floor(y / tamanho_celula)
+        livre = True
+        for vx in range(celula_x - 2, celula_x + 3):
+            for vy in range(celula_y - 2, celula_y + 3):
+                vizinha = grade.get((vx, vy))
+                if vizinha is not None and (x - vizinha[0]) ** 2 + (y - vizinha[1]) ** 2 < distancia_minima2:
+                    livre = False
+                    break
+            if not livre:
+                break
+        if livre:
+            grade[(celula_x, celula_y)] = (x, y)
+            posicoes.append((x, y))
+
+    if len(posicoes) < quantidade:
+        raise ValueError(
+            f"Não coube {quantidade} bolas de raio {bola_raio} na mesa "
+            f"{mesa_comprimento}x{mesa_largura} em {tentativas} tentativas"
+        )
+    return posicoes
+
+
+def amostrar_mesas(qtd_mesas, mesa_comprimento, mesa_largura, bola_raio, cacapa_raio, seed=0, **opcoes):
+    # Uma dispersão por mesa; a mesa i usa sempre a mesma semente derivada de (seed, i)
+    return [
+        amostrar_meio_jogo(mesa_comprimento, mesa_largura, bola_raio, cacapa_raio,
+                           rng=random.Random(f"{seed}:{i}"), **opcoes)
+        for i in range(qtd_mesas)
+    ]
@@ -0,0 +1,243 @@
+import os
+import re
+import json
+import zlib
+import struct
+import argparse
+import numpy as np
+
+# Extrai máscaras PNG dos EXR multicamada gravados com os passes de anotação
+# (passes_anotacao.py), sem renderizar de novo. Roda fora do Blender:
+#
+#   python scripts/extrair_mascaras.py renders --indices renders/indices.json
+#
+# Para cada <imagem>_passes_NNNN.exr gera a pasta <imagem>_mascaras/ com
+#   indice_NN_<rótulo>.png   máscara binária por classe, do passe IndexOB
+#   <mesa>/<objeto>.png      cobertura antisserrilhada por objeto, da cryptomatte
+#   profundidade_mm.png      (com --profundidade) distância em mm, 16 bits
+#
+# A leitura usa o módulo OpenEXR se estiver instalado e, se não, o
+# OpenImageIO que vem com o Blender; o PNG é escrito com zlib, sem dependências.
+# O Blender 5.x grava o EXR multicamada com uma parte por passe, e todas as
+# partes são lidas.
+try:
+    import OpenEXR
+    import Imath
+except ImportError:
+    OpenEXR = None
+try:
+    import OpenImageIO
+except ImportError:
+    OpenImageIO = None
+
+PADRAO_EXR = re.compile(r"^(.*)_passes_\d+\.exr$")
+MODOS = ('ambos', 'indice', 'cryptomatte')
+
+
+def ler_argumentos():
+    parser = argparse.ArgumentParser(description="Máscaras PNG a partir dos EXR de passes de anotação")
+    parser.add_argument('entradas', nargs='+', help="arquivos *_passes_NNNN.exr ou pastas com eles")
+    parser.add_argument('--indices', required=True, help="indices.json gravado junto com os renders")
+    parser.add_argument('--modo', choices=MODOS, default='ambos')
+    parser.add_argument('--profundidade', action='store_true', help="grava também a profundidade em mm")
+    parser.add_argument('--cobertura-minima', type=float, default=0.0,
+                        help="descarta máscaras de cryptomatte com cobertura total menor que isso (pixels)")
+    return parser.parse_args()
+
+
+def listar_exr(entradas):
+    arquivos = []
+    for entrada in entradas:
+        if os.path.isdir(entrada):
+            arquivos += [os.path.join(entrada, n) for n in sorted(os.listdir(entrada)) if PADRAO_EXR.match(n)]
+        else:
+            arquivos.append(entrada)
+    return arquivos
+
+
+# --- Leitura do EXR ---
+
+def ler_canais_exr(caminho):
+    # {nome do canal: array float32 (altura, largura)}, linha 0 em cima, de todas as partes do arquivo
+    if OpenEXR is not None and hasattr(OpenEXR, 'File'):
+        canais = {}
+        for parte in OpenEXR.File(caminho, separate_channels=True).parts:
+            canais.update({nome: np.asarray(canal.pixels, dtype=np.float32) for nome, canal in parte.channels.items()})
+        return canais
+    if OpenEXR is not None:
+        arquivo = OpenEXR.InputFile(caminho)
+        cabecalho = arquivo.header()
+        janela = cabecalho['dataWindow']
+        largura = janela.max.x - janela.min.x + 1
+        altura = janela.max.y - janela.min.y + 1
+        tipo = Imath.PixelType(Imath.PixelType.FLOAT)
+        return {
+            nome: np.frombuffer(arquivo.channel(nome, tipo), dtype=np.float32).reshape(altura, largura)
+            for nome in cabecalho['channels']
+        }
+    if OpenImageIO is not None:
+        entrada = OpenImageIO.ImageInput.open(caminho)
+        if entrada is None:
+            raise OSError(f"Não foi possível abrir {caminho}: {OpenImageIO.geterror()}")
+        canais = {}
+        subimagem = 0
+        while entrada.seek_subimage(subimagem, 0):
+            spec = entrada.spec()
+            pixels = entrada.read_image(subimagem, 0, 0, spec.nchannels, OpenImageIO.FLOAT)
+            pixels = np.asarray(pixels, dtype=np.float32).reshape(spec.height, spec.width, spec.nchannels)
+            canais.update({nome: pixels[:, :, i] for i, nome in enumerate(spec.channelnames)})
+            subimagem += 1
+        entrada.close()
+        return canais
+    raise ImportError("Para ler EXR instale o módulo OpenEXR (pip install OpenEXR) "
+                      "ou rode com o Python do Blender, que traz o OpenImageIO")
+
+
+def canais_camada(canais, camada):
+    # Canais de uma camada em ordem (R, G, B, A / X, Y, Z / V); aceita prefixo de view layer
+    encontrados = {}
+    for nome, dados in canais.items():
+        partes = nome.split('.')
+        if len(partes) >= 2 and partes[-2] == camada:
+            encontrados[partes[-1]] = dados
+    if not encontrados:
+        raise KeyError(f"Camada '{camada}' não encontrada no EXR (canais: {sorted(canais)})")
+    # O Blender 5.x grava os canais da cryptomatte em minúsculas (r, g, b, a)
+    ordem = 'RGBAXYZV'
+    return [encontrados[c] for c in sorted(encontrados, key=lambda c: ordem.find(c.upper()))]
+
+
+# --- Cryptomatte ---
+
+def _rotl32(valor, bits):
+    return ((valor << bits) | (valor >> (32 - bits))) & 0xffffffff
+
+
+def murmur3_32(dados, semente=0):
+    # MurmurHash3 x86 de 32 bits, o mesmo hash que o Blender usa para os nomes na cryptomatte
+    c1, c2 = 0xcc9e2d51, 0x1b873593
+    h = semente
+    fim_blocos = len(dados) // 4 * 4
+    for i in range(0, fim_blocos, 4):
+        k = int.from_bytes(dados[i:i + 4], 'little')
+        k = _rotl32((k * c1) & 0xffffffff, 15)
+        h ^= (k * c2) & 0xffffffff
+        h = (_rotl32(h, 13) * 5 + 0xe6546b64) & 0xffffffff
+    resto = dados[fim_blocos:]
+    if resto:
+        k = int.from_bytes(resto, 'little')
+        k = _rotl32((k * c1) & 0xffffffff, 15)
+        h ^= (k * c2) & 0xffffffff
+    h ^= len(dados)
+    h ^= h >> 16
+    h = (h * 0x85ebca6b) & 0xffffffff
+    h ^= h >> 13
+    h = (h * 0xc2b2ae35) & 0xffffffff
+    h ^= h >> 16
+    return h
+
+
+def id_cryptomatte(nome):
+    # Bits do float gravado no EXR: expoentes 0 e 255 (denormais, inf, NaN) são evitados trocando um bit
+    h = murmur3_32(nome.encode('utf-8'))
+    expoente = (h >> 23) & 0xff
+    if expoente in (0, 255):
+        h ^= 1 << 23
+    return h
+
+
+def coberturas_cryptomatte(canais, nomes):
+    # {nome: cobertura float32 (altura, largura)} de cada objeto pedido, somando todos os níveis
+    camadas = sorted({nome.split('.')[-2] for nome in canais
+                      if len(nome.split('.')) >= 2 and nome.split('.')[-2].startswith('CryptoObject')})
+    pares = []
+    for camada in camadas:
+        r, g, b, a = canais_camada(canais, camada)
+        pares += [(r.view(np.uint32), g), (b.view(np.uint32), a)]
+    coberturas = {}
+    for nome in nomes:
+        alvo = np.uint32(id_cryptomatte(nome))
+        cobertura = np.zeros(pares[0][1].shape, dtype=np.float32) if pares else None
+        for ids, peso in pares:
+            cobertura += np.where(ids == alvo, peso, 0)
+        if cobertura is not None:
+            coberturas[nome] = cobertura
+    return coberturas
+
+
+# --- PNG ---
+
+def _bloco_png(tipo, dados):
+    return struct.pack('>I', len(dados)) + tipo + dados + struct.pack('>I', zlib.crc32(tipo + dados) & 0xffffffff)
+
+
+def salvar_png(caminho, imagem):
+    # PNG em tons de cinza de 8 (uint8) ou 16 bits (uint16), filtro 0 em todas as linhas
+    altura, largura = imagem.shape
+    bits = 16 if imagem.dtype == np.uint16 else 8
+    linhas = np.ascontiguousarray(imagem, dtype='>u2' if bits == 16 else np.uint8).view(np.uint8)
+    linhas = np.hstack([np.zeros((altura, 1), dtype=np.uint8), linhas.reshape(altura, -1)])
+    with open(caminho, 'wb') as arquivo:
+        arquivo.write(b'\x89PNG\r\n\x1a\n')
+        arquivo.write(_bloco_png(b'IHDR', struct.pack('>IIBBBBB', largura, altura, bits, 0, 0, 0, 0)))
+        arquivo.write(_bloco_png(b'IDAT', zlib.compress(linhas.tobytes(), 6)))
+        arquivo.write(_bloco_png(b'IEND', b''))
+
+
+# --- Extração ---
+
+def extrair(caminho_exr, indices, modo='ambos', profundidade=False, cobertura_minima=0.0):
+    # Grava as máscaras de um EXR e retorna quantos PNG foram escritos
+    canais = ler_canais_exr(caminho_exr)
+    encontrado = PADRAO_EXR.match(os.path.basename(caminho_exr))
+    nome_imagem = encontrado.group(1) if encontrado else os.path.splitext(os.path.basename(caminho_exr))[0]
+    pasta = os.path.join(os.path.dirname(caminho_exr), f"{nome_imagem}_mascaras")
+    os.makedirs(pasta, exist_ok=True)
+    escritos = 0
+
+    if modo in ('ambos', 'indice'):
+        indice_ob = np.rint(canais_camada(canais, 'IndexOB')[0]).astype(np.int32)
+        for indice in np.unique(indice_ob):
+            if indice == 0:
+                continue
+            rotulo = indices['rotulos'].get(str(indice), f"indice_{indice}")
+            mascara = np.where(indice_ob == indice, 255, 0).astype(np.uint8)
+            salvar_png(os.path.join(pasta, f"indice_{indice:02d}_{rotulo}.png"), mascara)
+            escritos += 1
+
+    if modo in ('ambos', 'cryptomatte'):
+        objetos = {objeto['nome']: objeto for objeto in indices['objetos']}
+        for nome, cobertura in coberturas_cryptomatte(canais, objetos).items():
+            total = float(cobertura.sum())
+            if total == 0 or total < cobertura_minima:
+                continue
+            pasta_mesa = os.path.join(pasta, objetos[nome]['mesa'])
+            os.makedirs(pasta_mesa, exist_ok=True)
+            mascara = np.rint(np.clip(cobertura, 0, 1) * 255).astype(np.uint8)
+            salvar_png(os.path.join(pasta_mesa, f"{nome}.png"), mascara)
+            escritos += 1
+
+    if profundidade:
+        # Fundo (sem superfície) fica 0; o resto em mm, limitado a 65.535 m
+        z = canais_camada(canais, 'Depth')[0]
+        milimetros = np.where(z < 1e9, np.clip(np.rint(z * 1000), 0, 65535), 0).astype(np.uint16)
+        salvar_png(os.path.join(pasta, "profundidade_mm.png"), milimetros)
+        escritos += 1
+    return escritos
+
+
+def main():
+    args = ler_argumentos()
+    with open(args.indices, encoding='utf-8') as arquivo:
+        indices = json.load(arquivo)
+    arquivos = listar_exr(args.entradas)
+    total = 0
+    for caminho in arquivos:
+        escritos = extrair(caminho, indices, args.modo, args.profundidade, args.cobertura_minima)
+        print(f"{os.path.basename(caminho)}: {escritos} máscaras")
+        total += escritos
+    print(f"{total} máscaras de {len(arquivos)} arquivos EXR")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,209 @@
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import time
+
+# Fila de render local com vários processos Blender em background.
+# Roda fora do Blender: o pedido (câmeras x quadros x variantes) vira uma lista
+# de trabalhos, cada trabalho é um processo "blender -b -t N -P main.py" e as
+# imagens são reunidas em renders/<variante>/. Trabalhos que falham voltam
+# para a fila até o limite de tentativas.
+#
+# Uso:
+#   python scripts/fila_render.py --variantes branca escura --cameras Camera_Top Camera_Canto
+#   python scripts/fila_render.py --animacao orbita --quadros 96 --quadros-por-trabalho 8
+#   python scripts/fila_render.py --calibrar   (mede as divisões processos x threads)
+PASTA_SCRIPT = os.path.dirname(os.path.abspath(__file__))
+PASTA_RENDERS = os.path.join(PASTA_SCRIPT, '..', 'renders')
+CAMERAS = ("Camera_Top", "Camera_Top2", "Camera_Canto")
+VARIANTES = ('cena', 'branca', 'classica', 'escura')
+
+
+def ler_argumentos():
+    parser = argparse.ArgumentParser(description="Fila de render com vários processos Blender")
+    parser.add_argument('--blender', default=os.environ.get('BLENDER', 'blender'))
+    parser.add_argument('--variantes', nargs='+', choices=VARIANTES, default=['cena'],
+                        help="'cena' é a cena das três mesas; as outras montam uma mesa só da variante")
+    parser.add_argument('--cameras', nargs='+', choices=CAMERAS, default=list(CAMERAS))
+    parser.add_argument('--animacao', choices=('orbita', 'dolly'), help="renderiza quadros em vez das câmeras fixas")
+    parser.add_argument('--quadros', type=int, default=48)
+    parser.add_argument('--quadros-por-trabalho', type=int, default=8)
+    parser.add_argument('--qualidade-render', default='previa')
+    parser.add_argument('--resolucao')
+    parser.add_argument('--porcentagem-resolucao', type=int)
+    parser.add_argument('--saida', default=PASTA_RENDERS)
+    parser.add_argument('--processos', type=int, help="processos simultâneos (padrão: melhor divisão calibrada)")
+    parser.add_argument('--threads', type=int, help="threads por processo (padrão: núcleos / processos)")
+    parser.add_argument('--tentativas', type=int, default=3)
+    parser.add_argument('--passes', action='store_true',
+                        help="grava também os EXR de passes de anotação e o indices.json de cada variante")
+    parser.add_argument('--calibrar', action='store_true',
+                        help="mede imagens/hora para cada divisão processos x threads e guarda a melhor")
+    return parser.parse_args()
+
+
+def criar_trabalhos(args):
+    # Um trabalho por (variante, câmera) nas fotos, ou por (variante, bloco de quadros) na animação
+    trabalhos = []
+    for variante in args.variantes:
+        if args.animacao:
+            for inicio in range(1, args.quadros + 1, args.quadros_por_trabalho):
+                fim = min(inicio + args.quadros_por_trabalho - 1, args.quadros)
+                trabalhos.append({
+                    'id': f"{variante}_{args.animacao}_{inicio:04d}-{fim:04d}",
+                    'variante': variante,
+                    'argumentos': ['--animacao', args.animacao, '--quadros', str(args.quadros),
+                                   '--intervalo-quadros', str(inicio), str(fim)],
+                    'saidas': [os.path.join(f"animacao_{args.animacao}", f"quadro_{q:04d}.png")
+                               for q in range(inicio, fim + 1)],
+                    'quadros': list(range(inicio, fim + 1)),
+                })
+        else:
+            for camera in args.cameras:
+                trabalhos.append({
+                    'id': f"{variante}_{camera}",
+                    'variante': variante,
+                    'argumentos': ['--cameras', camera],
+                    'saidas': [f"{camera}.png"],
+                    'quadros': [1],
+                })
+    if args.passes:
+        # O EXR de passes sai ao lado de cada PNG, com o número do quadro no nome
+        for trabalho in trabalhos:
+            trabalho['argumentos'] = trabalho['argumentos'] + ['--passes']
+            trabalho['saidas'] = trabalho['saidas'] + [
+                f"{os.path.splitext(saida)[0]}_passes_{quadro:04d}.exr"
+                for saida, quadro in zip(trabalho['saidas'], trabalho['quadros'])
+            ] + ['indices.json']
+    return trabalhos
+
+
+def comando_trabalho(args, trabalho, threads, pasta_temp):
+    comando = [args.blender, '-b', '-t', str(threads), '-P', os.path.join(PASTA_SCRIPT, 'main.py'), '--']
+    if trabalho['variante'] != 'cena':
+        comando += ['--mesas', '1', '--variantes', f"{trabalho['variante']}=1"]
+    comando += ['--saida', pasta_temp, '--qualidade-render', args.qualidade_render]
+    if args.resolucao:
+        comando += ['--resolucao', args.resolucao]
+    if args.porcentagem_resolucao:
+        comando += ['--porcentagem-resolucao', str(args.porcentagem_resolucao)]
+    return comando + trabalho['argumentos']
+
+
+def executar_fila(args, trabalhos, processos, threads, pasta_saida):
+    # Mantém até `processos` workers ativos; devolve (concluídos, falhas definitivas)
+    pasta_trabalhos = os.path.join(pasta_saida, '.trabalhos')
+    pendentes = [dict(trabalho, tentativa=0) for trabalho in trabalhos]
+    ativos = []
+    concluidos, falhas = [], []
+
+    while pendentes or ativos:
+        while pendentes and len(ativos) < processos:
+            trabalho = pendentes.pop(0)
+            trabalho['tentativa'] += 1
+            pasta_temp = os.path.join(pasta_trabalhos, f"{trabalho['id']}_{trabalho['tentativa']}")
+            os.makedirs(pasta_temp, exist_ok=True)
+            log = open(os.path.join(pasta_temp, 'blender.log'), 'w', encoding='utf-8')
+            processo = subprocess.Popen(comando_trabalho(args, trabalho, threads, pasta_temp),
+                                        stdout=log, stderr=subprocess.STDOUT)
+            ativos.append((processo, trabalho, pasta_temp, log, time.perf_counter()))
+
+        time.sleep(0.2)
+        for item in list(ativos):
+            processo, trabalho, pasta_temp, log, inicio = item
+            if processo.poll() is None:
+                continue
+            ativos.remove(item)
+            log.close()
+            completo = processo.returncode == 0 and all(
+                os.path.exists(os.path.join(pasta_temp, saida)) for saida in trabalho['saidas'])
+            if completo:
+                destino = os.path.join(pasta_saida, trabalho['variante'])
+                for saida in trabalho['saidas']:
+                    os.makedirs(os.path.dirname(os.path.join(destino, saida)), exist_ok=True)
+                    os.replace(os.path.join(pasta_temp, saida), os.path.join(destino, saida))
+                shutil.rmtree(pasta_temp, ignore_errors=True)
+                concluidos.append((trabalho['id'], time.perf_counter() - inicio))
+            elif trabalho['tentativa'] < args.tentativas:
+                print(f"  {trabalho['id']}: falhou (código {processo.returncode}), tentando de novo")
+                pendentes.append(trabalho)
+            else:
+                print(f"  {trabalho['id']}: falhou {trabalho['tentativa']} vezes, log em {pasta_temp}")
+                falhas.append(trabalho['id'])
+    return concluidos, falhas
+
+
+def divisoes_candidatas(nucleos):
+    # Processos x threads que usam todos os núcleos: 1x64, 2x32, 4x16, ...
+    # Com 1 núcleo (ou nenhuma divisão com 2+ threads) sobra só um processo com todos os núcleos
+    divisoes = [(p, nucleos // p) for p in range(1, nucleos + 1) if nucleos % p == 0 and nucleos // p >= 2]
+    return divisoes or [(1, nucleos)]
+
+
+def calibrar(args, trabalhos, pasta_saida):
+    # Cada divisão roda um trabalho por processo ao mesmo tempo; mede imagens por hora
+    nucleos = os.cpu_count() or 1
+    amostra = trabalhos[0]
+    pasta_calibracao = os.path.join(pasta_saida, '.calibracao')
+    resultados = []
+    for processos, threads in divisoes_candidatas(nucleos):
+        lote = [dict(amostra, id=f"calibracao_{processos}x{threads}_{i}") for i in range(processos)]
+        inicio = time.perf_counter()
+        concluidos, _ = executar_fila(args, lote, processos, threads, pasta_calibracao)
+        segundos = time.perf_counter() - inicio
+        # Só os quadros renderizados; EXR de passes e indices.json não contam como imagens
+        imagens = len(concluidos) * len(amostra['quadros'])
+        resultados.append({'processos': processos, 'threads': threads,
+                           'imagens_por_hora': imagens / segundos * 3600})
+        print(f"  {processos:3d} processos x {threads:3d} threads: {resultados[-1]['imagens_por_hora']:8.1f} imagens/h")
+    shutil.rmtree(pasta_calibracao, ignore_errors=True)
+
+    melhor = max(resultados, key=lambda r: r['imagens_por_hora'])
+    with open(os.path.join(pasta_saida, 'divisao_processos.json'), 'w', encoding='utf-8') as arquivo:
+        json.dump({'nucleos': nucleos, 'melhor': melhor, 'medicoes': resultados}, arquivo, indent=2)
+    return melhor['processos'], melhor['threads']
+
+
+def divisao_salva(pasta_saida):
+    caminho = os.path.join(pasta_saida, 'divisao_processos.json')
+    if not os.path.exists(caminho):
+        return None
+    with open(caminho, encoding='utf-8') as arquivo:
+        dados = json.load(arquivo)
+    if dados['nucleos'] != os.cpu_count():
+        return None
+    return dados['melhor']['processos'], dados['melhor']['threads']
+
+
+def main():
+    args = ler_argumentos()
+    pasta_saida = os.path.abspath(args.saida)
+    os.makedirs(pasta_saida, exist_ok=True)
+    trabalhos = criar_trabalhos(args)
+    nucleos = os.cpu_count() or 1
+
+    if args.calibrar:
+        print("Calibrando a divisão processos x threads")
+        processos, threads = calibrar(args, trabalhos, pasta_saida)
+    else:
+        processos, threads = divisao_salva(pasta_saida) or (1, nucleos)
+    processos = args.processos or processos
+    threads = args.threads or max(1, nucleos // processos)
+
+    total_imagens = sum(len(t['quadros']) for t in trabalhos)
+    print(f"{len(trabalhos)} trabalhos ({total_imagens} imagens) em {processos} processos x {threads} threads")
+    inicio = time.perf_counter()
+    concluidos, falhas = executar_fila(args, trabalhos, processos, threads, pasta_saida)
+    segundos = time.perf_counter() - inicio
+
+    imagens = total_imagens - sum(len(t['quadros']) for t in trabalhos if t['id'] in falhas)
+    print(f"\n{len(concluidos)} trabalhos concluídos, {len(falhas)} falharam")
+    print(f"{imagens} imagens em {segundos:.1f} s ({imagens / segundos * 3600:.1f} imagens/h)")
+    return 1 if falhas else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
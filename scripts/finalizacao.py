@@ -0,0 +1,119 @@
+import bpy
+import time
+from perfilador import medir_etapa
+
+# Finalização das mesas: os modificadores que sobraram na pilha (ex.: o Bevel
+# de 5 segmentos da Borda) são "assados" na malha ao fim da construção, para
+# o depsgraph não recalcular a cada avaliação, redraw ou sincronização do render.
+# A subdivisão adaptativa da política de deslocamento 'real' fica na pilha,
+# porque só existe dentro do Cycles, assim como os Geometry Nodes do rack de
+# bolas, que precisam continuar gerando instâncias.
+NOME_COLECAO_ORIGINAIS = "Originais_Finalizacao"
+
+
+def _manter_na_pilha(modificador):
+    if modificador.type == 'NODES':
+        return True
+    if modificador.type != 'SUBSURF':
+        return False
+    if getattr(modificador, 'use_adaptive_subdivision', False):
+        return True
+    objeto = modificador.id_data
+    return getattr(getattr(objeto, 'cycles', None), 'use_adaptive_subdivision', False)
+
+
+def objetos_com_modificadores(raizes):
+    # Peças de malha das mesas com algum modificador a assar (dados ligados ficam de fora)
+    objetos = []
+    for raiz in raizes:
+        for objeto in [raiz] + list(raiz.children_recursive):
+            if objeto.type != 'MESH' or objeto.data.library is not None or objeto in objetos:
+                continue
+            if any(not _manter_na_pilha(m) for m in objeto.modifiers):
+                objetos.append(objeto)
+    return objetos
+
+
+def _colecao_originais():
+    colecao = bpy.data.collections.get(NOME_COLECAO_ORIGINAIS)
+    if colecao is None:
+        colecao = bpy.data.collections.new(NOME_COLECAO_ORIGINAIS)
+        bpy.context.scene.collection.children.link(colecao)
+        colecao.hide_viewport = True
+        colecao.hide_render = True
+    return colecao
+
+
+def medir_avaliacao(objetos, repeticoes=5):
+    # Tempo médio (ms) para reavaliar os objetos marcados como alterados
+    view_layer = bpy.context.view_layer
+    view_layer.update()
+    inicio = time.perf_counter()
+    for _ in range(repeticoes):
+        for objeto in objetos:
+            objeto.update_tag(refresh={'DATA'})
+        view_layer.update()
+    return (time.perf_counter() - inicio) / repeticoes * 1000
+
+
+def contar_triangulos_avaliados(objetos):
+    depsgraph = bpy.context.evaluated_depsgraph_get()
+    total = 0
+    for objeto in objetos:
+        avaliado = objeto.evaluated_get(depsgraph)
+        malha = avaliado.to_mesh()
+        malha.calc_loop_triangles()
+        total += len(malha.loop_triangles)
+        avaliado.to_mesh_clear()
+    return total
+
+
+@medir_etapa()
+def finalizar_mesas(raizes, manter_originais=False):
+    # Assa os modificadores das peças das mesas e retorna um resumo antes/depois
+    objetos = objetos_com_modificadores(raizes)
+    resumo = {
+        'objetos': len(objetos),
+        'avaliacao_antes_ms': medir_avaliacao(objetos),
+        'triangulos_antes': contar_triangulos_avaliados(objetos),
+    }
+
+    colecao_originais = _colecao_originais() if manter_originais and objetos else None
+    depsgraph = bpy.context.evaluated_depsgraph_get()
+    for objeto in objetos:
+        if colecao_originais is not None:
+            original = objeto.copy()
+            original.data = objeto.data.copy()
+            original.parent = None
+            original.matrix_world = objeto.matrix_world
+            colecao_originais.objects.link(original)
+
+        mantidos = [m for m in objeto.modifiers if _manter_na_pilha(m)]
+        for m in mantidos:
+            m.show_viewport = False
+        if mantidos:
+            depsgraph.update()
+        malha_nova = bpy.data.meshes.new_from_object(objeto.evaluated_get(depsgraph))
+
+        malha_antiga = objeto.data
+        nome_malha = malha_antiga.name
+        for modificador in [m for m in objeto.modifiers if m not in mantidos]:
+            objeto.modifiers.remove(modificador)
+        for m in mantidos:
+            m.show_viewport = True
+        objeto.data = malha_nova
+        if malha_antiga.users == 0:
+            bpy.data.meshes.remove(malha_antiga)
+        malha_nova.name = nome_malha
+
+    resumo['avaliacao_depois_ms'] = medir_avaliacao(objetos)
+    resumo['triangulos_depois'] = contar_triangulos_avaliados(objetos)
+    return resumo
+
+
+def imprimir_resumo_finalizacao(resumo):
+    print(
+        f"Finalização: {resumo['objetos']} objetos assados, avaliação "
+        f"{resumo['avaliacao_antes_ms']:.2f} ms -> {resumo['avaliacao_depois_ms']:.2f} ms, "
+        f"triângulos {resumo['triangulos_antes']} -> {resumo['triangulos_depois']}"
+    )
@@ -0,0 +1,177 @@
+import bpy
+import bmesh
+from perfilador import medir_etapa
+
+# Criação de geometria para os construtores das mesas.
+# Backend 'dados': malhas montadas com bmesh e objetos criados direto em
+# bpy.data, sem operadores (não dependem de contexto de UI, não geram undo).
+# Backend 'operadores': o caminho original com bpy.ops.mesh.primitive_*.
+BACKENDS_GEOMETRIA = ('dados', 'operadores')
+_config = {'backend': 'dados'}
+
+
+def definir_backend_geometria(backend):
+    if backend not in BACKENDS_GEOMETRIA:
+        raise ValueError(f"Backend de geometria '{backend}' inválido, use um de {BACKENDS_GEOMETRIA}")
+    _config['backend'] = backend
+
+
+def backend_geometria():
+    return _config['backend']
+
+
+def _usar_operadores():
+    return _config['backend'] == 'operadores'
+
+
+def _vincular_objeto(nome, dados, location, scale=None):
+    objeto = bpy.data.objects.new(nome, dados)
+    bpy.context.collection.objects.link(objeto)
+    objeto.location = location
+    if scale is not None:
+        objeto.scale = scale
+    return objeto
+
+
+def _bmesh_com_uv():
+    bm = bmesh.new()
+    bm.loops.layers.uv.new("UVMap")
+    return bm
+
+
+def _finalizar_malha(bm, nome):
+    malha = bpy.data.meshes.new(nome)
+    bm.to_mesh(malha)
+    bm.free()
+    return malha
+
+
+def suavizar_malha(malha):
+    # Equivalente ao shade_smooth, de uma vez para todos os polígonos
+    malha.polygons.foreach_set('use_smooth', [True] * len(malha.polygons))
+    malha.update()
+
+
+def malha_cubo(nome="Cube", tamanho=1.0):
+    bm = _bmesh_com_uv()
+    bmesh.ops.create_cube(bm, size=tamanho, calc_uvs=True)
+    return _finalizar_malha(bm, nome)
+
+
+def malha_esfera_uv(nome="Sphere", raio=1.0, segmentos=32, aneis=16):
+    bm = _bmesh_com_uv()
+    bmesh.ops.create_uvsphere(bm, u_segments=segmentos, v_segments=aneis, radius=raio, calc_uvs=True)
+    return _finalizar_malha(bm, nome)
+
+
+def malha_cilindro(nome="Cylinder", raio=1.0, profundidade=2.0, vertices=32):
+    bm = _bmesh_com_uv()
+    bmesh.ops.create_cone(
+        bm,
+        cap_ends=True,
+        cap_tris=False,
+        segments=vertices,
+        radius1=raio,
+        radius2=raio,
+        depth=profundidade,
+        calc_uvs=True
+    )
+    return _finalizar_malha(bm, nome)
+
+
+def malha_plano(nome="Plane", tamanho=2.0):
+    bm = _bmesh_com_uv()
+    # create_grid usa metade do tamanho, como o primitive_plane_add
+    bmesh.ops.create_grid(bm, x_segments=1, y_segments=1, size=tamanho / 2, calc_uvs=True)
+    return _finalizar_malha(bm, nome)
+
+
+def criar_cubo(nome, location, scale=None):
+    if _usar_operadores():
+        bpy.ops.mesh.primitive_cube_add(size=1, location=location, calc_uvs=True)
+        objeto = bpy.context.object
+        objeto.name = nome
+        if scale is not None:
+            objeto.scale = scale
+        return objeto
+    return _vincular_objeto(nome, malha_cubo(nome), location, scale)
+
+
+def criar_esfera(nome, raio, location, segmentos=32, aneis=16, suave=True):
+    if _usar_operadores():
+        bpy.ops.mesh.primitive_uv_sphere_add(
+            segments=segmentos,
+            ring_count=aneis,
+            radius=raio,
+            location=location,
+            calc_uvs=True
+        )
+        if suave:
+            bpy.ops.object.shade_smooth()
+        objeto = bpy.context.object
+        objeto.name = nome
+        return objeto
+    malha = malha_esfera_uv(nome, raio, segmentos, aneis)
+    if suave:
+        suavizar_malha(malha)
+    return _vincular_objeto(nome, malha, location)
+
+
+def criar_cilindro(nome, raio, profundidade, location, vertices=32):
+    if _usar_operadores():
+        bpy.ops.mesh.primitive_cylinder_add(
+            vertices=vertices,
+            radius=raio,
+            depth=profundidade,
+            location=location
+        )
+        objeto = bpy.context.object
+        objeto.name = nome
+        return objeto
+    return _vincular_objeto(nome, malha_cilindro(nome, raio, profundidade, vertices), location)
+
+
+def criar_plano(nome, tamanho, location):
+    if _usar_operadores():
+        bpy.ops.mesh.primitive_plane_add(size=tamanho, location=location)
+        objeto = bpy.context.object
+        objeto.name = nome
+        return objeto
+    return _vincular_objeto(nome, malha_plano(nome, tamanho), location)
+
+
+def criar_vazio(nome, location):
+    if _usar_operadores():
+        bpy.ops.object.empty_add(type='PLAIN_AXES', location=location)
+        objeto = bpy.context.object
+        objeto.name = nome
+        return objeto
+    objeto = _vincular_objeto(nome, None, location)
+    objeto.empty_display_type = 'PLAIN_AXES'
+    return objeto
+
+
+@medir_etapa('aplicar_modificador')
+def aplicar_modificador(objeto, nome_modificador):
+    # Aplica um modificador sobre a malha original (mesma semântica do
+    # modifier_apply: os outros modificadores da pilha não entram no resultado)
+    if _usar_operadores():
+        bpy.context.view_layer.objects.active = objeto
+        bpy.ops.object.modifier_apply(modifier=nome_modificador)
+        return
+
+    outros = [m for m in objeto.modifiers if m.name != nome_modificador and m.show_viewport]
+    for m in outros:
+        m.show_viewport = False
+    depsgraph = bpy.context.evaluated_depsgraph_get()
+    malha_nova = bpy.data.meshes.new_from_object(objeto.evaluated_get(depsgraph))
+    for m in outros:
+        m.show_viewport = True
+
+    malha_antiga = objeto.data
+    nome_malha = malha_antiga.name
+    objeto.modifiers.remove(objeto.modifiers[nome_modificador])
+    objeto.data = malha_nova
+    if malha_antiga.users == 0:
+        bpy.data.meshes.remove(malha_antiga)
+    malha_nova.name = nome_malha
@@ -0,0 +1,73 @@
+import bpy
+from reconstrucao_incremental import assinatura_variante
+
+# Variantes de mesa construídas uma única vez, cada uma em sua própria coleção,
+# e mesas adicionais colocadas como instâncias de coleção (vazios leves).
+# O Cycles trata essas instâncias como instâncias na BVH, sem duplicar geometria.
+
+
+def _procurar_layer_collection(layer_collection, nome):
+    if layer_collection.name == nome:
+        return layer_collection
+    for filho in layer_collection.children:
+        encontrado = _procurar_layer_collection(filho, nome)
+        if encontrado:
+            return encontrado
+    return None
+
+
+def colecao_variante(nome_variante):
+    return bpy.data.collections.get(f"Variante_{nome_variante}")
+
+
+def remover_colecao_variante(colecao):
+    # Remove o modelo da variante; as instâncias que apontavam para ela ficam vazias
+    objetos = list(colecao.all_objects)
+    malhas = {obj.data for obj in objetos if obj.type == 'MESH'}
+    for obj in objetos:
+        bpy.data.objects.remove(obj)
+    for malha in malhas:
+        if malha.users == 0:
+            bpy.data.meshes.remove(malha)
+    bpy.data.collections.remove(colecao)
+
+
+def construir_variante_em_colecao(nome_variante, construtor, **parametros):
+    # Constrói a mesa na origem dentro da coleção "Variante_<nome>". A coleção é
+    # reaproveitada só se foi construída com os mesmos parâmetros e políticas globais
+    # (qualidade de texturas, deslocamento, rack); senão é removida e reconstruída.
+    assinatura = assinatura_variante(nome_variante, parametros)
+    colecao = colecao_variante(nome_variante)
+    if colecao is not None:
+        if colecao.get('assinatura') == assinatura:
+            return colecao
+        remover_colecao_variante(colecao)
+
+    cena = bpy.context.scene
+    view_layer = bpy.context.view_layer
+    colecao = bpy.data.collections.new(f"Variante_{nome_variante}")
+    cena.collection.children.link(colecao)
+    layer_colecao = _procurar_layer_collection(view_layer.layer_collection, colecao.name)
+
+    # Os construtores criam os objetos na coleção ativa
+    anterior = view_layer.active_layer_collection
+    view_layer.active_layer_collection = layer_colecao
+    try:
+        construtor(nome_raiz=f"Modelo_{nome_variante}", location=(0, 0, 0), **parametros)
+    finally:
+        view_layer.active_layer_collection = anterior
+
+    # Fora da view layer: a coleção não aparece sozinha, só através das instâncias
+    layer_colecao.exclude = True
+    colecao['assinatura'] = assinatura
+    return colecao
+
+
+def instanciar_mesa(colecao, nome, location, rotacao=(0, 0, 0)):
+    vazio = bpy.data.objects.new(nome, None)
+    vazio.instance_type = 'COLLECTION'
+    vazio.instance_collection = colecao
+    bpy.context.collection.objects.link(vazio)
+    vazio.location = location
+    vazio.rotation_euler = rotacao
+    return vazio
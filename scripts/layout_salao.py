@@ -0,0 +1,60 @@
+import math
+import random
+
+# Layout de salão com N mesas: posições em grade (o mais quadrada possível),
+# com a folga pedida entre mesas vizinhas, e variantes sorteadas segundo um
+# mix de pesos. Cada mesa ocupa a sua célula da grade e o passo é a pegada
+# mais a folga (nunca negativa), então a sobreposição é impossível por
+# construção e não há teste de colisão.
+
+# Pegada de uma mesa no chão (x, y) em metros: moldura 4.5 x 2.5 mais a caixa coletora
+PEGADA_MESA = (4.5, 2.7)
+VARIANTES = ('branca', 'classica', 'escura')
+
+
+def _sortear_variantes(qtd_mesas, mix_variantes, seed):
+    mix = mix_variantes or {v: 1 for v in VARIANTES}
+    for variante in mix:
+        if variante not in VARIANTES:
+            raise ValueError(f"Variante '{variante}' inválida, use uma de {VARIANTES}")
+    nomes = list(mix)
+    return random.Random(seed).choices(nomes, weights=[mix[n] for n in nomes], k=qtd_mesas)
+
+
+def calcular_layout_salao(qtd_mesas, folga=1.5, mix_variantes=None, seed=0, pegada=PEGADA_MESA):
+    # Retorna uma lista de mesas: {'variante', 'nome_raiz', 'location'}
+    # folga: espaço livre entre mesas vizinhas; o passo da grade já impede sobreposição
+    if folga < 0:
+        raise ValueError(f"Folga {folga} inválida: as mesas se sobreporiam, use um valor >= 0")
+    if qtd_mesas <= 0:
+        return []
+    passo_x = pegada[0] + folga
+    passo_y = pegada[1] + folga
+    colunas = max(1, math.ceil(math.sqrt(qtd_mesas * passo_y / passo_x)))
+    linhas = math.ceil(qtd_mesas / colunas)
+
+    variantes = _sortear_variantes(qtd_mesas, mix_variantes, seed)
+    mesas = []
+    # Grade centralizada na origem, preenchida linha a linha
+    for i, variante in enumerate(variantes):
+        linha, coluna = divmod(i, colunas)
+        x = (coluna - (colunas - 1) / 2) * passo_x
+        y = (linha - (linhas - 1) / 2) * passo_y
+        mesas.append({
+            'variante': variante,
+            'nome_raiz': f"Mesa_{variante.capitalize()}_{i}",
+            'location': (x, y, 0),
+        })
+    return mesas
+
+
+def dimensoes_salao(mesas, margem=3.0, pegada=PEGADA_MESA):
+    # Tamanho (x, y) e centro do chão que cobre todas as mesas com uma margem em volta
+    if not mesas:
+        return (15.0, 15.0), (0, 0, 0)
+    xs = [m['location'][0] for m in mesas]
+    ys = [m['location'][1] for m in mesas]
+    tamanho_x = max(xs) - min(xs) + pegada[0] + 2 * margem
+    tamanho_y = max(ys) - min(ys) + pegada[1] + 2 * margem
+    centro = ((max(xs) + min(xs)) / 2, (max(ys) + min(ys)) / 2, 0)
+    return (tamanho_x, tamanho_y), centro
@@ -0,0 +1,191 @@
+import numpy as np
+
+# Layouts de bolas vetorizados com NumPy para vários jogos, em lotes de N racks.
+# Coordenadas no plano da mesa (centro na origem, comprimento em x): o rack
+# cresce no sentido +x a partir da ponta e a bola branca fica em -x.
+# Cada gerador retorna (posicoes, numeros): posicoes (N, B, 2) em metros e
+# numeros (N, B) inteiros, com 0 para a bola branca.
+#
+#   bola8      15 bolas em triângulo, 8 no centro, um canto liso e um listrado
+#   bola9      9 bolas em losango, 1 na ponta e 9 no centro
+#   bola10     10 bolas em triângulo, 1 na ponta e 10 no centro
+#   snooker    15 vermelhas + 6 cores nas marcas + branca (22 bolas);
+#              números = pontos (1 vermelha, 2 amarela ... 7 preta)
+#   carambola  branca (0), amarela (1) e vermelha (2)
+TIPOS_JOGO = ('bola8', 'bola9', 'bola10', 'snooker', 'carambola')
+
+# Mesmos fatores do calcular_posicoes_rack original: espaçamento 2.2 raios e
+# linhas a 0.866 (~sqrt(3)/2) espaçamentos umas das outras
+FATOR_ESPACAMENTO = 2.2
+FATOR_LINHA = 0.866
+
+# Marcas do snooker como fração do comprimento (mesa de 3569 mm)
+SNOOKER_LINHA_BAULK = 0.2065
+SNOOKER_RAIO_D = 0.0818
+SNOOKER_PRETA = 0.0908
+CARAMBOLA_LATERAL = 0.0643
+
+
+def _linhas(contagens, ponta_x, espacamento):
+    # Posições (B, 2) de linhas com as contagens dadas, centradas em y
+    linha = np.repeat(np.arange(len(contagens)), contagens).astype(float)
+    quantidade = np.repeat(np.asarray(contagens), contagens).astype(float)
+    coluna = np.concatenate([np.arange(n) for n in contagens]).astype(float)
+    x = ponta_x + (linha * espacamento) * FATOR_LINHA
+    y = -(quantidade - 1) * (espacamento / 2) + coluna * espacamento
+    return np.stack([x, y], axis=-1)
+
+
+def rack_triangular(linhas, bola_raio, ponta_x=0.0):
+    # Triângulo com `linhas` fileiras, na mesma ordem do calcular_posicoes_rack
+    return _linhas(list(range(1, linhas + 1)), ponta_x, bola_raio * FATOR_ESPACAMENTO)
+
+
+def _permutacoes(rng, quantidade, valores):
+    # Uma permutação independente de `valores` por linha, sem laço em Python
+    valores = np.asarray(valores)
+    ordem = np.argsort(rng.random((quantidade, len(valores))), axis=1)
+    return valores[ordem]
+
+
+def _numeros_fixos(quantidade, numeros):
+    return np.broadcast_to(np.asarray(numeros, dtype=np.int32), (quantidade, len(numeros))).copy()
+
+
+def _numeros_bola8(rng, quantidade):
+    # 8 no centro (índice 4); cantos de trás (10 e 14) um liso e um listrado
+    numeros = np.empty((quantidade, 15), dtype=np.int32)
+    lisas = _permutacoes(rng, quantidade, range(1, 8))
+    listradas = _permutacoes(rng, quantidade, range(9, 16))
+    troca = rng.random(quantidade) < 0.5
+    numeros[:, 10] = np.where(troca, listradas[:, 0], lisas[:, 0])
+    numeros[:, 14] = np.where(troca, lisas[:, 0], listradas[:, 0])
+    numeros[:, 4] = 8
+    restantes = np.concatenate([lisas[:, 1:], listradas[:, 1:]], axis=1)
+    ordem = np.argsort(rng.random(restantes.shape), axis=1)
+    livres = [i for i in range(15) if i not in (4, 10, 14)]
+    numeros[:, livres] = np.take_along_axis(restantes, ordem, axis=1)
+    return numeros
+
+
+def _numeros_ponta_centro(rng, quantidade, total, centro, ultimo):
+    # 1 na ponta, `ultimo` no índice `centro`, os outros embaralhados
+    numeros = np.empty((quantidade, total), dtype=np.int32)
+    numeros[:, 0] = 1
+    numeros[:, centro] = ultimo
+    livres = [i for i in range(1, total) if i != centro]
+    numeros[:, livres] = _permutacoes(rng, quantidade, range(2, ultimo))
+    return numeros
+
+
+def _layout_pool(tipo, bola_raio, comprimento, ponta_x, branca_x):
+    espacamento = bola_raio * FATOR_ESPACAMENTO
+    contagens = {'bola8': [1, 2, 3, 4, 5], 'bola9': [1, 2, 3, 2, 1], 'bola10': [1, 2, 3, 4]}[tipo]
+    ponta_x = comprimento / 4 if ponta_x is None else ponta_x
+    branca_x = -comprimento / 4 if branca_x is None else branca_x
+    return np.concatenate([_linhas(contagens, ponta_x, espacamento), [[branca_x, 0.0]]])
+
+
+def _layout_snooker(bola_raio, comprimento):
+    baulk = -comprimento / 2 + comprimento * SNOOKER_LINHA_BAULK
+    raio_d = comprimento * SNOOKER_RAIO_D
+    rosa = comprimento / 4
+    preta = comprimento / 2 - comprimento * SNOOKER_PRETA
+    espacamento = bola_raio * FATOR_ESPACAMENTO
+    # Vermelhas logo atrás da rosa, sem encostar; se a última fileira chegaria na preta,
+    # o triângulo recua até ficar um espaçamento à frente dela (e a rosa recua junto)
+    ponta = min(rosa + espacamento, preta - espacamento - 4 * espacamento * FATOR_LINHA)
+    rosa = min(rosa, ponta - espacamento)
+    vermelhas = _linhas([1, 2, 3, 4, 5], ponta, espacamento)
+    # Branca dentro do D, na direção (-1/2, 1/3) do raio do D a partir da marrom,
+    # afastada pelo menos um espaçamento dela quando as bolas são grandes
+    direcao = np.array([-1 / 2, 1 / 3])
+    branca = np.array([baulk, 0.0]) + direcao * max(raio_d, espacamento / np.linalg.norm(direcao))
+    cores = [
+        [baulk, -raio_d],                                   # amarela
+        [baulk, raio_d],                                    # verde
+        [baulk, 0.0],                                       # marrom
+        [0.0, 0.0],                                         # azul
+        [rosa, 0.0],                                        # rosa
+        [preta, 0.0],                                       # preta
+        branca,                                             # branca, dentro do D
+    ]
+    return np.concatenate([vermelhas, cores])
+
+
+def _layout_carambola(comprimento):
+    return np.array([
+        [-comprimento / 4, comprimento * CARAMBOLA_LATERAL],  # branca
+        [-comprimento / 4, 0.0],                              # amarela
+        [comprimento / 4, 0.0],                               # vermelha
+    ])
+
+
+def verificar_sobreposicao(modelo, bola_raio, tipo):
+    # Nenhum par de bolas do layout pode ficar a menos de 2 raios (antes do ruído)
+    distancias = np.linalg.norm(modelo[:, None, :] - modelo[None, :, :], axis=-1)
+    np.fill_diagonal(distancias, np.inf)
+    i, j = np.unravel_index(np.argmin(distancias), distancias.shape)
+    if distancias[i, j] < 2 * bola_raio - 1e-9:
+        raise ValueError(
+            f"Layout '{tipo}' com bolas sobrepostas: posições {i} e {j} a "
+            f"{distancias[i, j] / bola_raio:.2f} raios (mínimo 2)"
+        )
+
+
+def gerar_racks(tipo, quantidade, bola_raio, comprimento=4.0, aleatorio=True, seed=None,
+                ruido=0.0, ponta_x=None, branca_x=None):
+    # Gera `quantidade` layouts do jogo de uma vez; ruido é o desvio (em raios) somado a cada posição
+    if tipo not in TIPOS_JOGO:
+        raise ValueError(f"Tipo de jogo '{tipo}' inválido, use um de {TIPOS_JOGO}")
+    rng = np.random.default_rng(seed)
+
+    if tipo == 'snooker':
+        modelo = _layout_snooker(bola_raio, comprimento)
+        numeros = _numeros_fixos(quantidade, [1] * 15 + [2, 3, 4, 5, 6, 7, 0])
+    elif tipo == 'carambola':
+        modelo = _layout_carambola(comprimento)
+        numeros = _numeros_fixos(quantidade, [0, 1, 2])
+    else:
+        modelo = _layout_pool(tipo, bola_raio, comprimento, ponta_x, branca_x)
+        if not aleatorio:
+            fixos = {
+                'bola8': [1, 2, 3, 4, 8, 5, 6, 7, 9, 10, 11, 12, 13, 14, 15],
+                'bola9': [1, 2, 3, 4, 9, 5, 6, 7, 8],
+                'bola10': [1, 2, 3, 4, 10, 5, 6, 7, 8, 9],
+            }[tipo]
+            numeros = _numeros_fixos(quantidade, fixos)
+        elif tipo == 'bola8':
+            numeros = _numeros_bola8(rng, quantidade)
+        elif tipo == 'bola9':
+            numeros = _numeros_ponta_centro(rng, quantidade, 9, 4, 9)
+        else:
+            numeros = _numeros_ponta_centro(rng, quantidade, 10, 4, 10)
+        numeros = np.concatenate([numeros, np.zeros((quantidade, 1), dtype=np.int32)], axis=1)
+
+    verificar_sobreposicao(modelo, bola_raio, tipo)
+    posicoes = np.broadcast_to(modelo, (quantidade,) + modelo.shape).copy()
+    if ruido:
+        posicoes += rng.normal(scale=ruido * bola_raio, size=posicoes.shape)
+    return posicoes, numeros
+
+
+def para_3d(posicoes, z, origens=None):
+    # (N, B, 2) -> (N, B, 3) na altura z, deslocando cada rack pela origem (N, 3) da sua mesa
+    pontos = np.concatenate([posicoes, np.full(posicoes.shape[:-1] + (1,), float(z))], axis=-1)
+    if origens is not None:
+        pontos += np.asarray(origens, dtype=float)[:, None, :]
+    return pontos
+
+
+def escrever_pontos_rack(malha, pontos, numeros):
+    # Escreve todos os pontos e números de bola na malha de uma vez (foreach_set)
+    pontos = np.asarray(pontos, dtype=np.float32).reshape(-1, 3)
+    numeros = np.asarray(numeros, dtype=np.int32).ravel()
+    if len(malha.vertices) != len(pontos):
+        malha.clear_geometry()
+        malha.vertices.add(len(pontos))
+    malha.vertices.foreach_set('co', pontos.ravel())
+    atributo = malha.attributes.get('numero_bola') or malha.attributes.new('numero_bola', 'INT', 'POINT')
+    atributo.data.foreach_set('value', numeros)
+    malha.update()
@@ -0,0 +1,139 @@
+import bpy
+from contextlib import contextmanager
+from geometria import malha_esfera_uv, malha_cilindro, suavizar_malha
+from malhas_compartilhadas import obter_malha_compartilhada
+
+# Nível de detalhe por distância da mesa à câmera de render.
+# Os construtores usam o nível atual (segmentos das esferas, vértices dos
+# cilindros das caçapas, segmentos do bevel) e marcam as peças trocáveis com
+# propriedades 'lod_*'. Antes de cada render, aplicar_lod_camera escolhe o nível
+# de cada mesa e troca as malhas (compartilhadas por chave com as contagens de
+# segmentos) e os segmentos do bevel; mesas instanciadas trocam de coleção.
+NIVEIS_LOD = {
+    'alto': {'distancia_max': 12.0, 'esfera': (32, 16), 'cilindro': 32, 'bevel': 5},
+    'medio': {'distancia_max': 30.0, 'esfera': (16, 8), 'cilindro': 16, 'bevel': 2},
+    'baixo': {'distancia_max': float('inf'), 'esfera': (8, 6), 'cilindro': 8, 'bevel': 1},
+}
+NIVEL_PADRAO = 'alto'
+_config = {'nivel': NIVEL_PADRAO}
+
+
+def nivel_lod():
+    return _config['nivel']
+
+
+@contextmanager
+def usar_nivel_lod(nivel):
+    # Constrói com outro nível dentro do bloco (ex.: variantes instanciadas de longe)
+    if nivel not in NIVEIS_LOD:
+        raise ValueError(f"Nível de LOD '{nivel}' inválido, use um de {tuple(NIVEIS_LOD)}")
+    anterior = _config['nivel']
+    _config['nivel'] = nivel
+    try:
+        yield
+    finally:
+        _config['nivel'] = anterior
+
+
+def parametros_lod(nivel=None):
+    return NIVEIS_LOD[nivel or _config['nivel']]
+
+
+def nivel_por_distancia(distancia):
+    for nome, parametros in NIVEIS_LOD.items():
+        if distancia <= parametros['distancia_max']:
+            return nome
+    return list(NIVEIS_LOD)[-1]
+
+
+def chave_esfera(raio, nivel=None):
+    segmentos, aneis = parametros_lod(nivel)['esfera']
+    return ('esfera_uv', round(raio, 6), segmentos, aneis)
+
+
+def chave_cilindro(raio, profundidade, nivel=None):
+    return ('cilindro', round(raio, 6), round(profundidade, 6), parametros_lod(nivel)['cilindro'])
+
+
+def marcar_lod(objeto, tipo, **dimensoes):
+    # Guarda no objeto o que é preciso para recriar a malha em outro nível
+    objeto['lod_tipo'] = tipo
+    for nome, valor in dimensoes.items():
+        objeto[f"lod_{nome}"] = valor
+    objeto['lod_nivel'] = _config['nivel']
+
+
+def malha_bola(raio, nivel=None):
+    # Malha de esfera suavizada do nível pedido, compartilhada com as bolas dos construtores
+    segmentos, aneis = parametros_lod(nivel)['esfera']
+
+    def construir():
+        malha = malha_esfera_uv("Ball", raio, segmentos, aneis)
+        suavizar_malha(malha)
+        return malha
+    return obter_malha_compartilhada(chave_esfera(raio, nivel), construir)
+
+
+def _malha_lod(objeto, nivel):
+    parametros = parametros_lod(nivel)
+    if objeto['lod_tipo'] == 'esfera':
+        return malha_bola(objeto['lod_raio'], nivel)
+
+    raio, profundidade = objeto['lod_raio'], objeto['lod_profundidade']
+    return obter_malha_compartilhada(
+        chave_cilindro(raio, profundidade, nivel),
+        lambda: malha_cilindro(objeto.data.name, raio, profundidade, parametros['cilindro'])
+    )
+
+
+def _trocar_malha(objeto, malha):
+    # Os materiais passam para os slots do objeto antes da troca, para
+    # não se perderem com a malha antiga nem alterarem a malha nova compartilhada
+    materiais = [slot.material for slot in objeto.material_slots]
+    for slot, material in zip(objeto.material_slots, materiais):
+        if slot.link != 'OBJECT':
+            slot.link = 'OBJECT'
+            slot.material = material
+    while len(malha.materials) < len(materiais):
+        malha.materials.append(None)
+    objeto.data = malha
+
+
+def trocar_lod_mesa(raiz, nivel):
+    # Troca as peças marcadas e os segmentos do bevel de uma mesa construída por completo
+    trocas = 0
+    for objeto in raiz.children_recursive:
+        if objeto.get('lod_tipo') and objeto.get('lod_nivel') != nivel:
+            _trocar_malha(objeto, _malha_lod(objeto, nivel))
+            objeto['lod_nivel'] = nivel
+            trocas += 1
+        for modificador in getattr(objeto, 'modifiers', ()):
+            if modificador.type == 'BEVEL':
+                modificador.segments = parametros_lod(nivel)['bevel']
+    return trocas
+
+
+def distancia_camera(camera, objeto):
+    return (objeto.matrix_world.translation - camera.matrix_world.translation).length
+
+
+def aplicar_lod_camera(camera, raizes, colecao_instancia=None):
+    # Escolhe o nível de cada mesa pela distância à câmera; retorna {nivel: mesas}
+    # colecao_instancia(variante, nivel) devolve a coleção da variante no nível pedido
+    bpy.context.view_layer.update()
+    contagem = {nome: 0 for nome in NIVEIS_LOD}
+    for raiz in raizes:
+        nivel = nivel_por_distancia(distancia_camera(camera, raiz))
+        if raiz.instance_type == 'COLLECTION' and raiz.instance_collection is not None:
+            if colecao_instancia is None or 'variante' not in raiz.keys():
+                continue
+            raiz.instance_collection = colecao_instancia(raiz['variante'], nivel)
+        else:
+            trocar_lod_mesa(raiz, nivel)
+        contagem[nivel] += 1
+    return contagem
+
+
+def imprimir_resumo_lod(nome_camera, contagem):
+    niveis = ', '.join(f"{quantidade} {nivel}" for nivel, quantidade in contagem.items())
+    print(f"LOD para {nome_camera}: {niveis}")
@@ -2,27 +2,60 @@ import bpy
 import sys
 import os
 import math
+import time
+import random
+import inspect
+import argparse
 # Importação dos scripts e funções
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'scripts'))
 from script import criar_mesa_branca, criar_camera, limpar_cena, aplicar_material,hex_to_rgba, obter_caminho_absoluto
 from script2 import criar_mesa_classica
 from script3 import criar_mesa_escura
+from cache_imagens import imprimir_estatisticas_cache_imagens
+from registro_materiais import imprimir_estatisticas_materiais
+from malhas_compartilhadas import imprimir_estatisticas_malhas
+from geometria import criar_plano
+from cache_bibliotecas import imprimir_estatisticas_bibliotecas, definir_link_bibliotecas
+from proxies_texturas import definir_qualidade_texturas, NIVEIS_QUALIDADE
+from perfis_render import aplicar_perfil_render, PERFIS_RENDER, PERFIL_PADRAO
+from politica_deslocamento import definir_politica_deslocamento, POLITICAS_DESLOCAMENTO
+from animacao_camera import criar_camera_animada, renderizar_animacao, imprimir_tempos_animacao, MODOS_ANIMACAO
+from renderizacao import ler_resolucao, configurar_render, renderizar_cameras, imprimir_resumo_tempos
+from layout_salao import calcular_layout_salao, dimensoes_salao, VARIANTES
+from instancias_mesa import construir_variante_em_colecao, instanciar_mesa
+from reconstrucao_incremental import (sincronizar_mesas, remover_objetos_nao_rastreados, imprimir_resumo_sincronizacao,
+                                      raizes_rastreadas)
+from finalizacao import finalizar_mesas, imprimir_resumo_finalizacao
+from lod import aplicar_lod_camera, usar_nivel_lod, imprimir_resumo_lod, NIVEL_PADRAO
+from rack_nos_geometria import definir_rack_nos_geometria
+from dispersao_bolas import amostrar_meio_jogo
+from passes_anotacao import definir_passes_anotacao, configurar_passes, atribuir_indices_passe, salvar_indices
+from animacao_bolas import simular_e_animar_mesas, imprimir_resumo_tacada
+from perfilador import medir_etapa, ativar_perfilador, salvar_relatorio_json, salvar_trace_chrome, imprimir_resumo_perfil
 
+CAMERAS = ["Camera_Top", "Camera_Top2", "Camera_Canto"]
+CONSTRUTORES_MESA = {
+    'branca': criar_mesa_branca,
+    'classica': criar_mesa_classica,
+    'escura': criar_mesa_escura,
+}
+# Mesas da cena padrão
+MESAS_CENA = [
+    {'variante': 'classica', 'nome_raiz': 'MesaClassica_Raiz', 'location': (0, 4, 0)},
+    {'variante': 'escura', 'nome_raiz': 'MesaEscura_Raiz', 'location': (0, 0, 0)},
+    {'variante': 'branca', 'nome_raiz': 'MesaBranca_Raiz', 'location': (0, -4, 0)},
+]
 
-def criar_chao():
-    bpy.ops.mesh.primitive_plane_add(
-        size=15.0,
-        enter_editmode=False,
-        align='WORLD',
-        location=(0, 0, 0),
-        scale=(1, 1, 1)
-    )
-    chao = bpy.context.object
-    chao.name = "Chao_Plano"
+
+@medir_etapa()
+def criar_chao(tamanho=(15.0, 15.0), centro=(0, 0, 0)):
+    chao = criar_plano("Chao_Plano", 1.0, centro)
+    chao.scale = (tamanho[0], tamanho[1], 1)
     
     # Adicionar material ao chao
     aplicar_material(chao, cor_base=hex_to_rgba("#929292"))
 
+@medir_etapa()
 def adicionar_luz():
     # Define as cores em HEX para cada luz
     cor_luz_grande = hex_to_rgba("#ECFEFFFF", include_alpha=False)
@@ -50,6 +83,20 @@ def adicionar_luz():
     area_light_grande.data.size = 9.33
     area_light_grande.data.color = cor_luz_grande
 
+@medir_etapa()
+def adicionar_luzes_salao(mesas, altura=2, energia=144, tamanho=9.33):
+    # Uma luz de área sobre cada mesa, todas usando o mesmo data-block de luz
+    luz = bpy.data.lights.new("Luz_Salao", type='AREA')
+    luz.energy = energia
+    luz.size = tamanho
+    luz.color = hex_to_rgba("#ECFEFFFF", include_alpha=False)
+    for i, mesa in enumerate(mesas):
+        x, y, _ = mesa['location']
+        objeto = bpy.data.objects.new(f"Luz_Mesa_{i}", luz)
+        bpy.context.collection.objects.link(objeto)
+        objeto.location = (x, y, altura)
+
+@medir_etapa()
 def criar_camera():
     # Adiciona a câmera de cima
     bpy.ops.object.camera_add(location=(0, 0, 10), rotation=(0, 0, 0))
@@ -72,13 +119,225 @@ def criar_camera():
     camera_canto.rotation_euler = (math.radians(71.323), -0, math.radians(150.339))
     bpy.context.view_layer.update()
 
-if __name__ == "__main__":
-    limpar_cena()
+def ler_argumentos():
+    # Argumentos depois de "--": blender -b -P scripts/main.py -- --cameras Camera_Top
+    argv = sys.argv[sys.argv.index('--') + 1:] if '--' in sys.argv else []
+    parser = argparse.ArgumentParser(description="Monta a cena das três mesas e renderiza as câmeras")
+    parser.add_argument('--cameras', nargs='+', choices=CAMERAS, help="câmeras a renderizar (padrão: todas)")
+    parser.add_argument('--resolucao', type=ler_resolucao, help="ex.: 1920x1080 (renderizada a 100%%)")
+    parser.add_argument('--porcentagem-resolucao', type=int, choices=range(1, 101), metavar='1-100',
+                        help="escala da resolução; por padrão 100%% com --resolucao ou a do perfil de render")
+    parser.add_argument('--amostras', type=int)
+    parser.add_argument('--saida', default=obter_caminho_absoluto(os.path.join('..', 'renders')))
+    parser.add_argument('--sem-render', action='store_true', help="só monta a cena")
+    parser.add_argument('--mesas', type=int, help="monta um salão com N mesas em vez das três mesas padrão")
+    parser.add_argument('--folga', type=ler_folga, default=1.5, help="espaço livre entre mesas (m)")
+    parser.add_argument('--variantes', nargs='+', default=[f"{v}=1" for v in VARIANTES],
+                        help="mix de variantes com pesos, ex.: branca=2 escura=1")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--sem-instancias', action='store_true',
+                        help="constrói cada mesa do salão por completo em vez de instanciar as variantes")
+    parser.add_argument('--incremental', action='store_true',
+                        help="reconstrói só as mesas cujos parâmetros mudaram desde a última execução")
+    parser.add_argument('--link-modelos', action='store_true',
+                        help="liga os modelos .blend (tacos) ao arquivo de origem em vez de anexá-los")
+    parser.add_argument('--perfil', metavar='PASTA',
+                        help="mede cada etapa e grava perfil.json e perfil_trace.json na pasta")
+    parser.add_argument('--qualidade-texturas', choices=list(NIVEIS_QUALIDADE), default='completa',
+                        help="usa os proxies de textura do nível escolhido (256, 512, 1k)")
+    parser.add_argument('--qualidade-render', choices=list(PERFIS_RENDER), default=PERFIL_PADRAO,
+                        help="perfil de render do Cycles na CPU")
+    parser.add_argument('--deslocamento', choices=POLITICAS_DESLOCAMENTO, default='bump',
+                        help="feltro com bump (padrão) ou deslocamento real com subdivisão adaptativa")
+    parser.add_argument('--finalizar', action='store_true',
+                        help="assa os modificadores restantes das mesas (ex.: Bevel da borda) na malha")
+    parser.add_argument('--manter-originais', action='store_true',
+                        help="com --finalizar, guarda cópias das peças originais numa coleção oculta")
+    parser.add_argument('--lod', action='store_true',
+                        help="escolhe o nível de detalhe de cada mesa pela distância à câmera antes de cada render")
+    parser.add_argument('--rack-nos', action='store_true',
+                        help="monta as bolas de cada mesa como um rack em Geometry Nodes com atlas de texturas")
+    parser.add_argument('--meio-jogo', action='store_true',
+                        help="espalha as bolas de cada mesa como no meio de uma partida (usa --seed; mesas sem instância)")
+    parser.add_argument('--animacao', choices=MODOS_ANIMACAO,
+                        help="renderiza uma animação de câmera (órbita ou dolly entre as câmeras) em vez das fotos")
+    parser.add_argument('--quadros', type=int, default=48, help="quantidade de quadros da animação")
+    parser.add_argument('--intervalo-quadros', type=int, nargs=2, metavar=('INICIO', 'FIM'),
+                        help="renderiza só esses quadros da animação (usado pela fila de render)")
+    parser.add_argument('--passes', action='store_true',
+                        help="grava junto de cada imagem um EXR com profundidade, IndexOB e cryptomatte (ver extrair_mascaras.py)")
+    parser.add_argument('--tacada', type=float, nargs=2, metavar=('VX', 'VY'),
+                        help="simula uma tacada com essa velocidade da branca (m/s, no plano da mesa) e anima as bolas por --quadros")
+    return parser.parse_args(argv)
+
+def ler_folga(texto):
+    # Folga entre mesas em metros; negativa faria as mesas vizinhas se sobreporem
+    folga = float(texto)
+    if folga < 0:
+        raise ValueError(f"Folga '{texto}' inválida, use um valor >= 0")
+    return folga
+
+def ler_mix_variantes(itens):
+    # ["branca=2", "escura=1"] -> {'branca': 2.0, 'escura': 1.0}
+    mix = {}
+    for item in itens:
+        nome, _, peso = item.partition('=')
+        mix[nome] = float(peso) if peso else 1.0
+    return mix
+
+def dimensoes_padrao(variante, *extras):
+    # Medidas da mesa e das bolas (e das `extras` pedidas) nos valores padrão do construtor da variante
+    padrao = inspect.signature(CONSTRUTORES_MESA[variante]).parameters
+    nomes = ('mesa_comprimento', 'mesa_largura', 'bola_raio', 'cacapa_raio') + extras
+    return {nome: padrao[nome].default for nome in nomes}
+
+def adicionar_posicoes_meio_jogo(mesas, seed):
+    # Cada mesa recebe uma dispersão própria, reproduzível pela seed e pelo nome da raiz
+    for mesa in mesas:
+        dimensoes = dimensoes_padrao(mesa['variante'], 'largura_berco')
+        dimensoes.update({k: v for k, v in mesa.get('parametros', {}).items() if k in dimensoes})
+        posicoes = amostrar_meio_jogo(**dimensoes, rng=random.Random(f"{seed}:{mesa['nome_raiz']}"))
+        mesa['parametros'] = dict(mesa.get('parametros', {}), posicoes_bolas=posicoes)
+        # As bolas mudam de mesa para mesa, então não dá para instanciar a variante
+        mesa['instancia'] = False
+
+def raizes_mesas():
+    # Raízes das mesas da cena e dos modelos das variantes instanciadas
+    raizes = list(raizes_rastreadas().values())
+    for colecao in bpy.data.collections:
+        if colecao.name.startswith("Variante_"):
+            raizes += [obj for obj in colecao.objects if obj.parent is None]
+    return raizes
+
+def variante_da_raiz(raiz):
+    if 'variante' in raiz:
+        return raiz['variante']
+    # Os modelos das coleções Variante_* se chamam Modelo_<variante>[_<nível de LOD>]
+    return next((v for v in CONSTRUTORES_MESA if raiz.name.startswith(f"Modelo_{v}")), None)
+
+def animar_tacada(velocidade_branca, quadros):
+    # Mesas com as mesmas medidas são simuladas juntas; nas instanciadas, anima o modelo da variante
+    grupos = {}
+    for raiz in raizes_mesas():
+        variante = variante_da_raiz(raiz)
+        if variante is not None:
+            grupos.setdefault(tuple(sorted(dimensoes_padrao(variante, 'largura_berco').items())), []).append(raiz)
+    resumo = {}
+    for dimensoes, raizes in grupos.items():
+        resumo.update(simular_e_animar_mesas(raizes, velocidade_branca, quadros=quadros, **dict(dimensoes)))
+    return resumo
+
+def criar_mesa(mesa):
+    # Constrói uma mesa descrita por {'variante', 'nome_raiz', 'location'} e retorna a raiz
+    construtor = CONSTRUTORES_MESA[mesa['variante']]
+    if mesa.get('instancia'):
+        colecao = construir_variante_em_colecao(mesa['variante'], construtor)
+        raiz = instanciar_mesa(colecao, mesa['nome_raiz'], mesa['location'])
+    else:
+        raiz = construtor(nome_raiz=mesa['nome_raiz'], location=mesa['location'], **mesa.get('parametros', {}))
+    raiz['variante'] = mesa['variante']
+    return raiz
+
+def colecao_variante_lod(variante, nivel):
+    # Coleção da variante construída no nível de LOD pedido (só na primeira vez)
+    nome = variante if nivel == NIVEL_PADRAO else f"{variante}_{nivel}"
+    with usar_nivel_lod(nivel):
+        return construir_variante_em_colecao(nome, CONSTRUTORES_MESA[variante])
+
+def aplicar_lod(camera):
+    contagem = aplicar_lod_camera(camera, raizes_rastreadas().values(), colecao_variante_lod)
+    imprimir_resumo_lod(camera.name, contagem)
+
+@medir_etapa()
+def preparar_cena(incremental):
+    # No modo incremental as mesas existentes ficam; o resto da cena é recriado
+    if incremental:
+        remover_objetos_nao_rastreados()
+    else:
+        limpar_cena()
+
+@medir_etapa()
+def construir_salao(qtd_mesas, folga=1.5, mix_variantes=None, seed=0, instanciar=True, incremental=False,
+                    perfil_render=PERFIL_PADRAO, meio_jogo=False):
+    # Salão com N mesas posicionadas pelo layout, chão e luzes dimensionados para caber
+    # Com instanciar=True cada variante é construída uma vez e as mesas viram instâncias de coleção
+    mesas = calcular_layout_salao(qtd_mesas, folga=folga, mix_variantes=mix_variantes, seed=seed)
+    for mesa in mesas:
+        mesa['instancia'] = instanciar
+    if meio_jogo:
+        adicionar_posicoes_meio_jogo(mesas, seed)
+    preparar_cena(incremental)
+    tamanho, centro = dimensoes_salao(mesas)
+    criar_chao(tamanho, centro)
+    resumo = sincronizar_mesas(mesas, criar_mesa)
+    criar_camera()
+    adicionar_luzes_salao(mesas)
+    aplicar_perfil_render(perfil_render)
+    return resumo
+
+@medir_etapa()
+def construir_cena(incremental=False, perfil_render=PERFIL_PADRAO, meio_jogo=False, seed=0):
+    mesas = [dict(mesa) for mesa in MESAS_CENA]
+    if meio_jogo:
+        adicionar_posicoes_meio_jogo(mesas, seed)
+    preparar_cena(incremental)
     criar_chao()
-    criar_mesa_classica(location=(0, 4, 0))
-    criar_mesa_escura(location=(0, 0, 0))
-    criar_mesa_branca(location=(0, -4, 0))
+    resumo = sincronizar_mesas(mesas, criar_mesa)
     criar_camera()
     adicionar_luz()
+    aplicar_perfil_render(perfil_render)
+    return resumo
+
+if __name__ == "__main__":
+    args = ler_argumentos()
+    if args.perfil:
+        ativar_perfilador()
+    definir_link_bibliotecas(args.link_modelos)
+    definir_qualidade_texturas(args.qualidade_texturas)
+    definir_politica_deslocamento(args.deslocamento)
+    definir_rack_nos_geometria(args.rack_nos)
+
+    inicio = time.perf_counter()
+    if args.mesas:
+        resumo = construir_salao(args.mesas, args.folga, ler_mix_variantes(args.variantes), args.seed,
+                                 instanciar=not args.sem_instancias, incremental=args.incremental,
+                                 perfil_render=args.qualidade_render, meio_jogo=args.meio_jogo)
+    else:
+        resumo = construir_cena(incremental=args.incremental, perfil_render=args.qualidade_render,
+                                meio_jogo=args.meio_jogo, seed=args.seed)
+    print(f"Cena montada em {time.perf_counter() - inicio:.2f} s")
+    imprimir_resumo_sincronizacao(resumo)
+    if args.finalizar:
+        imprimir_resumo_finalizacao(finalizar_mesas(raizes_mesas(), manter_originais=args.manter_originais))
+    if args.tacada:
+        imprimir_resumo_tacada(animar_tacada(args.tacada, args.quadros), args.quadros)
+    if args.passes:
+        # Depois da finalização, que pode trocar os objetos das mesas
+        definir_passes_anotacao(True)
+        configurar_passes()
+        salvar_indices(os.path.join(args.saida, 'indices.json'), atribuir_indices_passe())
+    imprimir_estatisticas_cache_imagens()
+    imprimir_estatisticas_materiais()
+    imprimir_estatisticas_malhas()
+    imprimir_estatisticas_bibliotecas()
+
+    # Em modo background (ou com --cameras) renderiza a partir da mesma cena
+    if not args.sem_render and (bpy.app.background or args.cameras):
+        configurar_render(resolucao=args.resolucao, amostras=args.amostras, porcentagem=args.porcentagem_resolucao)
+        if args.animacao:
+            camera = criar_camera_animada(args.animacao, quadro_final=args.quadros)
+            quadro_inicial, quadro_final = args.intervalo_quadros or (1, args.quadros)
+            tempos = renderizar_animacao(camera, os.path.join(args.saida, f"animacao_{args.animacao}"),
+                                         quadro_inicial, quadro_final)
+            imprimir_tempos_animacao(tempos)
+        else:
+            tempos = renderizar_cameras(args.cameras or CAMERAS, args.saida,
+                                        antes_de_renderizar=aplicar_lod if args.lod else None)
+            imprimir_resumo_tempos(tempos)
+
+    if args.perfil:
+        imprimir_resumo_perfil()
+        salvar_relatorio_json(os.path.join(args.perfil, 'perfil.json'))
+        salvar_trace_chrome(os.path.join(args.perfil, 'perfil_trace.json'))
 
     
\ No newline at end of file
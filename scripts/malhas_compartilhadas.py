@@ -0,0 +1,91 @@
+import bpy
+
+# Modo de malha compartilhada: peças repetidas (bolas, pernas, interiores das
+# caçapas, tacos) são construídas uma única vez e cada repetição vira um novo
+# objeto apontando para a mesma malha. Só a transformação muda entre eles.
+_config = {'ativo': True}
+_malhas = {}
+_estatisticas = {'criadas': 0, 'reutilizadas': 0}
+
+
+def definir_malha_compartilhada(ativo):
+    _config['ativo'] = bool(ativo)
+
+
+def malha_compartilhada_ativa():
+    return _config['ativo']
+
+
+def _malha_valida(malha):
+    # A malha pode ter sido removida (ex.: orphans_purge no limpar_cena)
+    try:
+        malha.name
+        return True
+    except ReferenceError:
+        return False
+
+
+def criar_objeto_compartilhado(chave, nome, location, construtor):
+    # chave: identifica a forma (tipo + dimensões que ficam na malha)
+    # construtor(location): cria o objeto na primeira vez e o retorna
+    malha = _malhas.get(chave) if _config['ativo'] else None
+    if malha is not None and _malha_valida(malha):
+        objeto = bpy.data.objects.new(nome, malha)
+        bpy.context.collection.objects.link(objeto)
+        objeto.location = location
+        _estatisticas['reutilizadas'] += 1
+        return objeto
+
+    objeto = construtor(location)
+    objeto.name = nome
+    if _config['ativo']:
+        _malhas[chave] = objeto.data
+    _estatisticas['criadas'] += 1
+    return objeto
+
+
+def obter_malha_compartilhada(chave, construtor_malha):
+    # Malha da chave, criada com construtor_malha() só na primeira vez (usada na troca de LOD)
+    malha = _malhas.get(chave)
+    if malha is not None and _malha_valida(malha):
+        _estatisticas['reutilizadas'] += 1
+        return malha
+    malha = construtor_malha()
+    _malhas[chave] = malha
+    _estatisticas['criadas'] += 1
+    return malha
+
+
+def duplicar_objeto_ligado(objeto, posicao, rotacao=None, escala=None, nome=None):
+    # Cópia do objeto que compartilha a mesma malha/materiais (Alt+D)
+    copia = objeto.copy()
+    if nome:
+        copia.name = nome
+    bpy.context.collection.objects.link(copia)
+    copia.location = posicao
+    copia.rotation_euler = rotacao if rotacao is not None else (0, 0, 0)
+    copia.scale = escala if escala is not None else (1, 1, 1)
+    _estatisticas['reutilizadas'] += 1
+    return copia
+
+
+def estatisticas_malhas():
+    return {
+        'criadas': _estatisticas['criadas'],
+        'reutilizadas': _estatisticas['reutilizadas'],
+        'malhas_em_cache': len(_malhas),
+    }
+
+
+def imprimir_estatisticas_malhas():
+    estatisticas = estatisticas_malhas()
+    print(
+        f"Malhas compartilhadas: {estatisticas['criadas']} criadas, "
+        f"{estatisticas['reutilizadas']} objetos reaproveitando malhas"
+    )
+
+
+def limpar_malhas_compartilhadas():
+    _malhas.clear()
+    _estatisticas['criadas'] = 0
+    _estatisticas['reutilizadas'] = 0
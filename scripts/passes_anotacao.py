@@ -0,0 +1,207 @@
+import bpy
+import os
+import re
+import json
+from perfilador import medir_etapa
+
+# Passes de anotação saindo do mesmo render da imagem final.
+# Cada objeto construído recebe um pass_index estável, derivado só do nome
+# (Ball7 -> 7, Interior_Cacapa_2 -> 32, ...), então o mesmo objeto tem o
+# mesmo índice em qualquer cena, mesa ou reconstrução. Com os passes ativos,
+# o compositor grava ao lado de cada PNG um EXR multicamada com a imagem,
+# a profundidade (Depth), o índice de objeto (IndexOB) e a cryptomatte de
+# objetos; scripts/extrair_mascaras.py transforma esse EXR em máscaras PNG.
+#
+# No Blender 5.x a árvore do compositor é um grupo de nós ligado à cena
+# (scene.compositing_node_group); até o 4.x ela fica em scene.node_tree.
+_config = {'ativo': False}
+
+NOME_NO_SAIDA = "Saida_Passes"
+PROFUNDIDADE_CRYPTOMATTE = 6
+# Cada camada CryptoObjectNN guarda dois pares (id, cobertura)
+PASSES_EXR = ['Image', 'Depth', 'IndexOB'] + [
+    f"CryptoObject{i:02d}" for i in range((PROFUNDIDADE_CRYPTOMATTE + 1) // 2)
+]
+# Saídas do nó Render Layers que mudaram de nome no Blender 5.x
+SAIDAS_RENOMEADAS = {'IndexOB': 'Object Index'}
+PASSES_ESCALARES = {'Depth', 'IndexOB'}
+
+# Índices fixos por nome de objeto; 0 fica para o fundo e objetos sem classe.
+# Bolas: 1..15 e 16 para a branca. Peças numeradas somam o número à base.
+INDICES_FIXOS = {
+    'Ballcue': 16,
+    'Feltro': 20,
+    'Berco': 21,
+    'Borda': 22,
+    'Base_Mesa': 23,
+    'Caixa_Coletora': 24,
+    'Pool Cue': 25,
+    # No rack em Geometry Nodes as 16 bolas são um objeto só e dividem o índice
+    'Rack_Bolas': 26,
+    'Chao_Plano': 27,
+}
+BASES_NUMERADAS = {
+    'Interior_Cacapa': 30,
+    'Perna': 40,
+}
+PADRAO_SUFIXO = re.compile(r"^(.*?)(\.\d{3,})?$")
+PADRAO_BOLA = re.compile(r"^Ball(\d+)$")
+PADRAO_NUMERADO = re.compile(r"^(.*)_(\d+)$")
+
+
+def definir_passes_anotacao(ativo):
+    _config['ativo'] = bool(ativo)
+
+
+def passes_anotacao_ativos():
+    return _config['ativo']
+
+
+def nome_base(nome):
+    # "Ball7.003" -> "Ball7": o sufixo que o Blender põe em nomes repetidos não muda o índice
+    return PADRAO_SUFIXO.match(nome).group(1)
+
+
+def indice_passe(nome):
+    # Índice estável do objeto pelo nome, ou 0 quando não é uma peça conhecida
+    base = nome_base(nome)
+    if base in INDICES_FIXOS:
+        return INDICES_FIXOS[base]
+    bola = PADRAO_BOLA.match(base)
+    if bola and 1 <= int(bola.group(1)) <= 15:
+        return int(bola.group(1))
+    numerado = PADRAO_NUMERADO.match(base)
+    if numerado and numerado.group(1) in BASES_NUMERADAS:
+        return BASES_NUMERADAS[numerado.group(1)] + int(numerado.group(2))
+    return 0
+
+
+def rotulo_indice(indice):
+    # Nome legível de um índice (o inverso de indice_passe, sem o sufixo)
+    if 1 <= indice <= 15:
+        return f"Ball{indice}"
+    for nome, fixo in INDICES_FIXOS.items():
+        if fixo == indice:
+            return nome
+    for base, inicio in sorted(BASES_NUMERADAS.items(), key=lambda item: -item[1]):
+        if indice >= inicio:
+            return f"{base}_{indice - inicio}"
+    return "fundo"
+
+
+def _raiz(objeto):
+    while objeto.parent is not None:
+        objeto = objeto.parent
+    return objeto
+
+
+@medir_etapa()
+def atribuir_indices_passe(scene=None):
+    # Define o pass_index dos objetos da cena e retorna [{nome, indice, mesa}] dos que têm classe
+    scene = scene or bpy.context.scene
+    objetos = []
+    for objeto in scene.objects:
+        if objeto.type in {'EMPTY', 'CAMERA', 'LIGHT'}:
+            continue
+        indice = indice_passe(objeto.name)
+        if objeto.pass_index != indice:
+            objeto.pass_index = indice
+        if indice:
+            objetos.append({'nome': objeto.name, 'indice': indice, 'mesa': _raiz(objeto).name})
+    return objetos
+
+
+def salvar_indices(caminho, objetos):
+    # Arquivo lateral lido pelo extrair_mascaras.py: rótulo de cada índice e objetos por mesa
+    os.makedirs(os.path.dirname(os.path.abspath(caminho)), exist_ok=True)
+    indices = sorted({objeto['indice'] for objeto in objetos})
+    dados = {
+        'rotulos': {str(indice): rotulo_indice(indice) for indice in indices},
+        'objetos': objetos,
+        'passes': PASSES_EXR,
+    }
+    with open(caminho, 'w', encoding='utf-8') as arquivo:
+        json.dump(dados, arquivo, indent=2, ensure_ascii=False)
+
+
+def _arvore_compositor(scene):
+    # Blender 5.x: cria o grupo do compositor se a cena ainda não tiver um
+    if hasattr(scene, 'compositing_node_group'):
+        if scene.compositing_node_group is None:
+            scene.compositing_node_group = bpy.data.node_groups.new("Compositor", 'CompositorNodeTree')
+        return scene.compositing_node_group
+    scene.use_nodes = True
+    return scene.node_tree
+
+
+def _entrada_imagem_final(scene, arvore):
+    # Onde a imagem do render entra para virar o PNG: saída do grupo no 5.x, nó Composite até o 4.x
+    nodes = arvore.nodes
+    if hasattr(scene, 'compositing_node_group'):
+        if not any(getattr(item, 'in_out', None) == 'OUTPUT' for item in arvore.interface.items_tree):
+            arvore.interface.new_socket('Image', in_out='OUTPUT', socket_type='NodeSocketColor')
+        saida_grupo = next((n for n in nodes if n.bl_idname == 'NodeGroupOutput'), None) \
+            or nodes.new('NodeGroupOutput')
+        return saida_grupo.inputs[0]
+    composto = next((n for n in nodes if n.bl_idname == 'CompositorNodeComposite'), None) \
+        or nodes.new('CompositorNodeComposite')
+    return composto.inputs['Image']
+
+
+def _criar_entrada_passe(saida, passe):
+    if hasattr(saida, 'file_output_items'):
+        saida.file_output_items.new('FLOAT' if passe in PASSES_ESCALARES else 'RGBA', passe)
+    else:
+        saida.layer_slots.new(passe)
+
+
+def configurar_passes(scene=None, view_layer=None):
+    # Liga Z, IndexOB e cryptomatte de objetos e monta Render Layers -> imagem final + saída EXR multicamada
+    scene = scene or bpy.context.scene
+    view_layer = view_layer or bpy.context.view_layer
+    view_layer.use_pass_z = True
+    view_layer.use_pass_object_index = True
+    view_layer.use_pass_cryptomatte_object = True
+    view_layer.pass_cryptomatte_depth = PROFUNDIDADE_CRYPTOMATTE
+
+    arvore = _arvore_compositor(scene)
+    nodes = arvore.nodes
+    links = arvore.links
+    camadas = next((n for n in nodes if n.bl_idname == 'CompositorNodeRLayers'), None) \
+        or nodes.new('CompositorNodeRLayers')
+    camadas.layer = view_layer.name
+    imagem_final = _entrada_imagem_final(scene, arvore)
+    if not imagem_final.is_linked:
+        links.new(camadas.outputs['Image'], imagem_final)
+
+    saida = nodes.get(NOME_NO_SAIDA)
+    if saida is None:
+        saida = nodes.new('CompositorNodeOutputFile')
+        saida.name = NOME_NO_SAIDA
+    saida.format.file_format = 'OPEN_EXR_MULTILAYER'
+    # 32 bits: IndexOB e os ids da cryptomatte precisam ser exatos
+    saida.format.color_depth = '32'
+    saida.format.exr_codec = 'ZIP'
+    if hasattr(saida, 'file_output_items'):
+        saida.file_output_items.clear()
+    else:
+        saida.layer_slots.clear()
+    for passe in PASSES_EXR:
+        _criar_entrada_passe(saida, passe)
+        origem = camadas.outputs.get(passe) or camadas.outputs[SAIDAS_RENOMEADAS[passe]]
+        links.new(origem, saida.inputs[passe])
+    return saida
+
+
+def apontar_passes(caminho_imagem, scene=None):
+    # O EXR do próximo render fica ao lado da imagem: <imagem>_passes_<quadro>.exr; retorna o caminho
+    scene = scene or bpy.context.scene
+    saida = _arvore_compositor(scene).nodes[NOME_NO_SAIDA]
+    base = os.path.splitext(os.path.abspath(caminho_imagem))[0] + "_passes_"
+    if hasattr(saida, 'directory'):
+        # Blender 5.x: pasta e nome separados, e o número do quadro só entra no lugar dos '#'
+        saida.directory = os.path.dirname(base)
+        saida.file_name = os.path.basename(base) + "####"
+    else:
+        saida.base_path = base
+    return f"{base}{scene.frame_current:04d}.exr"
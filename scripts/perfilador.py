@@ -0,0 +1,124 @@
+import bpy
+import json
+import os
+import time
+import functools
+from contextlib import contextmanager
+
+# Perfilador opcional das etapas de construção (desligado por padrão).
+# Cada etapa registra tempo de parede, número de chamadas e a variação na
+# quantidade de data-blocks do bpy.data. Os tempos são inclusivos: uma etapa
+# conta também o tempo das etapas chamadas dentro dela.
+_config = {'ativo': False}
+_eventos = []
+_resumo = {}
+_pilha = []
+_sessao = {'inicio': 0.0}
+
+COLECOES_CONTADAS = ('objects', 'meshes', 'materials', 'images', 'node_groups', 'libraries', 'collections')
+
+
+def ativar_perfilador(ativo=True):
+    _config['ativo'] = bool(ativo)
+    _eventos.clear()
+    _resumo.clear()
+    _pilha.clear()
+    _sessao['inicio'] = time.perf_counter()
+
+
+def perfilador_ativo():
+    return _config['ativo']
+
+
+def _contar_dados():
+    return {nome: len(getattr(bpy.data, nome)) for nome in COLECOES_CONTADAS}
+
+
+@contextmanager
+def etapa(nome):
+    if not _config['ativo']:
+        yield
+        return
+
+    antes = _contar_dados()
+    inicio = time.perf_counter()
+    _pilha.append(nome)
+    try:
+        yield
+    finally:
+        fim = time.perf_counter()
+        _pilha.pop()
+        depois = _contar_dados()
+        deltas = {chave: depois[chave] - antes[chave] for chave in COLECOES_CONTADAS if depois[chave] != antes[chave]}
+        _eventos.append({
+            'nome': nome,
+            'inicio': inicio - _sessao['inicio'],
+            'duracao': fim - inicio,
+            'profundidade': len(_pilha),
+            'deltas': deltas,
+        })
+        item = _resumo.setdefault(nome, {'chamadas': 0, 'tempo_total': 0.0, 'deltas': {}})
+        item['chamadas'] += 1
+        item['tempo_total'] += fim - inicio
+        for chave, valor in deltas.items():
+            item['deltas'][chave] = item['deltas'].get(chave, 0) + valor
+
+
+def medir_etapa(nome=None):
+    # Decorador: @medir_etapa('material') ou @medir_etapa() para usar o nome da função
+    def decorador(funcao):
+        nome_etapa = nome or funcao.__name__
+
+        @functools.wraps(funcao)
+        def envoltorio(*args, **kwargs):
+            if not _config['ativo']:
+                return funcao(*args, **kwargs)
+            with etapa(nome_etapa):
+                return funcao(*args, **kwargs)
+        return envoltorio
+    return decorador
+
+
+def resumo_perfil():
+    return {
+        nome: {
+            'chamadas': item['chamadas'],
+            'tempo_total_s': item['tempo_total'],
+            'tempo_medio_ms': item['tempo_total'] / item['chamadas'] * 1000,
+            'deltas_dados': item['deltas'],
+        }
+        for nome, item in sorted(_resumo.items(), key=lambda par: -par[1]['tempo_total'])
+    }
+
+
+def salvar_relatorio_json(caminho):
+    os.makedirs(os.path.dirname(os.path.abspath(caminho)), exist_ok=True)
+    with open(caminho, 'w', encoding='utf-8') as arquivo:
+        json.dump({'etapas': resumo_perfil()}, arquivo, indent=2, ensure_ascii=False)
+
+
+def salvar_trace_chrome(caminho):
+    # Formato "Trace Event" (chrome://tracing, Perfetto): eventos completos 'X' em microssegundos
+    eventos = [
+        {
+            'name': evento['nome'],
+            'cat': 'construcao',
+            'ph': 'X',
+            'ts': evento['inicio'] * 1e6,
+            'dur': evento['duracao'] * 1e6,
+            'pid': os.getpid(),
+            'tid': 1,
+            'args': evento['deltas'],
+        }
+        for evento in _eventos
+    ]
+    os.makedirs(os.path.dirname(os.path.abspath(caminho)), exist_ok=True)
+    with open(caminho, 'w', encoding='utf-8') as arquivo:
+        json.dump({'traceEvents': eventos, 'displayTimeUnit': 'ms'}, arquivo)
+
+
+def imprimir_resumo_perfil():
+    print("\nPerfil de construção (tempos inclusivos)")
+    for nome, item in resumo_perfil().items():
+        deltas = ', '.join(f"{chave} {valor:+d}" for chave, valor in item['deltas_dados'].items())
+        print(f"  {nome:<28} {item['chamadas']:6d}x {item['tempo_total_s']:8.3f} s  {deltas}")
@@ -0,0 +1,70 @@
+import bpy
+
+# Perfis de qualidade do Cycles na CPU. Cada perfil define amostras, limiar do
+# adaptive sampling, denoiser (OpenImageDenoise), limites de bounces, dados
+# persistentes e porcentagem da resolução. Tempos e ruído medidos de cada
+# perfil: benchmarks/benchmark_perfis_render.py.
+PERFIS_RENDER = {
+    'rascunho': {
+        'amostras': 32,
+        'limiar_adaptativo': 0.1,
+        'amostras_minimas': 8,
+        'prefiltro_denoise': 'FAST',
+        'bounces': {'max': 4, 'diffuse': 2, 'glossy': 2, 'transmission': 4, 'volume': 0, 'transparent': 4},
+        'dados_persistentes': True,
+        'porcentagem_resolucao': 50,
+    },
+    'previa': {
+        'amostras': 128,
+        'limiar_adaptativo': 0.03,
+        'amostras_minimas': 16,
+        'prefiltro_denoise': 'ACCURATE',
+        'bounces': {'max': 8, 'diffuse': 3, 'glossy': 4, 'transmission': 8, 'volume': 0, 'transparent': 8},
+        'dados_persistentes': True,
+        'porcentagem_resolucao': 75,
+    },
+    'final': {
+        'amostras': 512,
+        'limiar_adaptativo': 0.01,
+        'amostras_minimas': 64,
+        'prefiltro_denoise': 'ACCURATE',
+        'bounces': {'max': 12, 'diffuse': 4, 'glossy': 6, 'transmission': 12, 'volume': 0, 'transparent': 8},
+        'dados_persistentes': True,
+        'porcentagem_resolucao': 100,
+    },
+}
+PERFIL_PADRAO = 'previa'
+
+
+def aplicar_perfil_render(nome=PERFIL_PADRAO, scene=None):
+    if nome not in PERFIS_RENDER:
+        raise ValueError(f"Perfil de render '{nome}' inválido, use um de {tuple(PERFIS_RENDER)}")
+    perfil = PERFIS_RENDER[nome]
+    scene = scene or bpy.context.scene
+
+    scene.render.engine = 'CYCLES'
+    cycles = scene.cycles
+    cycles.device = 'CPU'
+    cycles.samples = perfil['amostras']
+    cycles.use_adaptive_sampling = True
+    cycles.adaptive_threshold = perfil['limiar_adaptativo']
+    cycles.adaptive_min_samples = perfil['amostras_minimas']
+
+    cycles.use_denoising = True
+    cycles.denoiser = 'OPENIMAGEDENOISE'
+    cycles.denoising_input_passes = 'RGB_ALBEDO_NORMAL'
+    cycles.denoising_prefilter = perfil['prefiltro_denoise']
+
+    bounces = perfil['bounces']
+    cycles.max_bounces = bounces['max']
+    cycles.diffuse_bounces = bounces['diffuse']
+    cycles.glossy_bounces = bounces['glossy']
+    cycles.transmission_bounces = bounces['transmission']
+    cycles.volume_bounces = bounces['volume']
+    cycles.transparent_max_bounces = bounces['transparent']
+
+    # Mantém BVH, shaders e texturas entre renders da mesma cena (várias câmeras/frames)
+    scene.render.use_persistent_data = perfil['dados_persistentes']
+    scene.render.resolution_percentage = perfil['porcentagem_resolucao']
+    scene['perfil_render'] = nome
+    return perfil
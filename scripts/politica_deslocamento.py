@@ -0,0 +1,79 @@
+import bpy
+
+# Política de deslocamento dos feltros, definida por construção:
+#   'bump' (padrão): o mapa de Displacement vira um nó Bump na normal do BSDF,
+#                    sem subdivisão e sem custo de geometria no render.
+#   'real':          deslocamento verdadeiro no Material Output, com subdivisão
+#                    adaptativa do Cycles no objeto (closes de destaque).
+# A política entra na chave do registro de materiais, então as duas versões
+# do material nunca se misturam.
+POLITICAS_DESLOCAMENTO = ('bump', 'real')
+_config = {'politica': 'bump', 'taxa_dicing': 1.0}
+
+
+def definir_politica_deslocamento(politica, taxa_dicing=None):
+    if politica not in POLITICAS_DESLOCAMENTO:
+        raise ValueError(f"Política de deslocamento '{politica}' inválida, use uma de {POLITICAS_DESLOCAMENTO}")
+    _config['politica'] = politica
+    if taxa_dicing is not None:
+        _config['taxa_dicing'] = taxa_dicing
+
+
+def politica_deslocamento():
+    return _config['politica']
+
+
+def _definir_metodo_deslocamento(material, metodo):
+    # Blender 4.1+ guarda o método no material; versões anteriores em material.cycles
+    if hasattr(material, 'displacement_method'):
+        material.displacement_method = metodo
+    else:
+        material.cycles.displacement_method = metodo
+
+
+def ligar_deslocamento(material, tex_node, bsdf, escala):
+    # Liga o mapa de altura segundo a política atual
+    nodes = material.node_tree.nodes
+    links = material.node_tree.links
+
+    if _config['politica'] == 'real':
+        displacement_node = nodes.new('ShaderNodeDisplacement')
+        displacement_node.inputs['Scale'].default_value = escala
+        links.new(tex_node.outputs['Color'], displacement_node.inputs['Height'])
+        output = nodes.get('Material Output')
+        if output:
+            links.new(displacement_node.outputs['Displacement'], output.inputs['Displacement'])
+        _definir_metodo_deslocamento(material, 'DISPLACEMENT')
+        return displacement_node
+
+    # Bump encadeado depois do normal map, se o BSDF já tiver um ligado
+    bump_node = nodes.new('ShaderNodeBump')
+    bump_node.inputs['Strength'].default_value = 1.0
+    bump_node.inputs['Distance'].default_value = escala
+    links.new(tex_node.outputs['Color'], bump_node.inputs['Height'])
+    normal_atual = bsdf.inputs['Normal'].links
+    if normal_atual:
+        links.new(normal_atual[0].from_socket, bump_node.inputs['Normal'])
+    links.new(bump_node.outputs['Normal'], bsdf.inputs['Normal'])
+    _definir_metodo_deslocamento(material, 'BUMP')
+    return bump_node
+
+
+def preparar_objeto_deslocamento(objeto, scene=None):
+    # Na política 'real' o objeto recebe subdivisão adaptativa (só afeta o Cycles)
+    if _config['politica'] != 'real':
+        return
+    scene = scene or bpy.context.scene
+    scene.cycles.dicing_rate = _config['taxa_dicing']
+
+    modificador = objeto.modifiers.get('Subdivisao_Adaptativa')
+    if modificador is None:
+        modificador = objeto.modifiers.new('Subdivisao_Adaptativa', 'SUBSURF')
+        modificador.subdivision_type = 'SIMPLE'
+    # Até o 4.x a subdivisão adaptativa é experimental e fica em objeto.cycles;
+    # nas versões novas a opção fica no próprio modificador
+    if hasattr(modificador, 'use_adaptive_subdivision'):
+        modificador.use_adaptive_subdivision = True
+    else:
+        scene.cycles.feature_set = 'EXPERIMENTAL'
+        objeto.cycles.use_adaptive_subdivision = True
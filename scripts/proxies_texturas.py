@@ -0,0 +1,144 @@
+import bpy
+import os
+import sys
+import hashlib
+import argparse
+
+# Proxies de textura em disco: versões reduzidas (256, 512, 1k) de cada
+# imagem de assets/, gravadas numa pasta de cache com o hash do arquivo de
+# origem no nome. Os carregadores de textura escolhem o nível a partir da
+# qualidade global; 'completa' usa sempre o arquivo original. Uma imagem que
+# já cabe no nível ganha um marcador vazio <hash>_<nível>.original no lugar do
+# proxy, para não ser carregada de novo só para medir o tamanho.
+#
+# Gerar todos os proxies de uma vez:
+#   blender -b -P scripts/proxies_texturas.py -- --niveis 256 512 1k
+NIVEIS_QUALIDADE = {'256': 256, '512': 512, '1k': 1024, 'completa': None}
+EXTENSOES_IMAGEM = ('.jpg', '.jpeg', '.png', '.tif', '.tiff')
+FORMATOS_SAIDA = {'.png': ('PNG', '.png')}
+
+PASTA_SCRIPT = os.path.dirname(os.path.abspath(__file__))
+PASTA_ASSETS = os.path.join(PASTA_SCRIPT, '..', 'assets')
+_config = {
+    'qualidade': 'completa',
+    'pasta_cache': os.path.join(PASTA_SCRIPT, '..', 'cache', 'texturas'),
+    'gerar_sob_demanda': True,
+}
+_hashes = {}
+
+
+def definir_qualidade_texturas(nivel, pasta_cache=None, gerar_sob_demanda=None):
+    if nivel not in NIVEIS_QUALIDADE:
+        raise ValueError(f"Qualidade de textura '{nivel}' inválida, use uma de {tuple(NIVEIS_QUALIDADE)}")
+    _config['qualidade'] = nivel
+    if pasta_cache is not None:
+        _config['pasta_cache'] = pasta_cache
+    if gerar_sob_demanda is not None:
+        _config['gerar_sob_demanda'] = gerar_sob_demanda
+
+
+def qualidade_texturas():
+    return _config['qualidade']
+
+
+def hash_arquivo(caminho):
+    # SHA-1 do conteúdo, memorizado enquanto mtime/tamanho não mudarem
+    info = os.stat(caminho)
+    chave = (os.path.realpath(caminho), info.st_mtime_ns, info.st_size)
+    if chave not in _hashes:
+        sha1 = hashlib.sha1()
+        with open(caminho, 'rb') as arquivo:
+            for bloco in iter(lambda: arquivo.read(1 << 20), b''):
+                sha1.update(bloco)
+        _hashes[chave] = sha1.hexdigest()
+    return _hashes[chave]
+
+
+def caminho_proxy(caminho_origem, nivel, pasta_cache=None):
+    pasta_cache = pasta_cache or _config['pasta_cache']
+    extensao = os.path.splitext(caminho_origem)[1].lower()
+    _, extensao_saida = FORMATOS_SAIDA.get(extensao, ('JPEG', '.jpg'))
+    return os.path.join(pasta_cache, f"{hash_arquivo(caminho_origem)}_{nivel}{extensao_saida}")
+
+
+def caminho_marcador_original(destino):
+    # Marcador de "não precisa de proxy" ao lado do caminho do proxy
+    return os.path.splitext(destino)[0] + '.original'
+
+
+def gerar_proxy(caminho_origem, nivel, pasta_cache=None):
+    # Grava o proxy do nível pedido; retorna o caminho ou None se a imagem já é menor
+    destino = caminho_proxy(caminho_origem, nivel, pasta_cache)
+    if os.path.exists(destino):
+        return destino
+    marcador = caminho_marcador_original(destino)
+    if os.path.exists(marcador):
+        return None
+
+    lado_maximo = NIVEIS_QUALIDADE[nivel]
+    imagem = bpy.data.images.load(caminho_origem, check_existing=False)
+    try:
+        largura, altura = imagem.size
+        if max(largura, altura) <= lado_maximo:
+            os.makedirs(os.path.dirname(marcador), exist_ok=True)
+            open(marcador, 'w').close()
+            return None
+        fator = lado_maximo / max(largura, altura)
+        imagem.scale(max(1, round(largura * fator)), max(1, round(altura * fator)))
+
+        extensao = os.path.splitext(caminho_origem)[1].lower()
+        formato, _ = FORMATOS_SAIDA.get(extensao, ('JPEG', '.jpg'))
+        os.makedirs(os.path.dirname(destino), exist_ok=True)
+        # Grava num arquivo temporário e renomeia, para outro processo nunca ler um proxy pela metade
+        temporario = f"{destino}.{os.getpid()}.tmp"
+        imagem.filepath_raw = temporario
+        imagem.file_format = formato
+        imagem.save()
+        os.replace(temporario, destino)
+        return destino
+    finally:
+        bpy.data.images.remove(imagem)
+
+
+def resolver_caminho_textura(caminho):
+    # Caminho a carregar de acordo com a qualidade global (proxy ou original)
+    nivel = _config['qualidade']
+    if NIVEIS_QUALIDADE[nivel] is None:
+        return caminho
+    destino = caminho_proxy(caminho, nivel)
+    if os.path.exists(destino):
+        return destino
+    if os.path.exists(caminho_marcador_original(destino)):
+        return caminho
+    if _config['gerar_sob_demanda']:
+        return gerar_proxy(caminho, nivel) or caminho
+    return caminho
+
+
+def listar_texturas(pasta_assets=PASTA_ASSETS):
+    for raiz, _, arquivos in os.walk(pasta_assets):
+        for nome in sorted(arquivos):
+            if os.path.splitext(nome)[1].lower() in EXTENSOES_IMAGEM:
+                yield os.path.join(raiz, nome)
+
+
+def gerar_proxies(niveis=('256', '512', '1k'), pasta_assets=PASTA_ASSETS, pasta_cache=None):
+    gerados = 0
+    for caminho in listar_texturas(pasta_assets):
+        for nivel in niveis:
+            destino = caminho_proxy(caminho, nivel, pasta_cache)
+            if not os.path.exists(destino) and gerar_proxy(caminho, nivel, pasta_cache):
+                gerados += 1
+    return gerados
+
+
+if __name__ == "__main__":
+    argv = sys.argv[sys.argv.index('--') + 1:] if '--' in sys.argv else []
+    parser = argparse.ArgumentParser(description="Gera os proxies de textura de assets/")
+    parser.add_argument('--niveis', nargs='+', default=['256', '512', '1k'],
+                        choices=[n for n, lado in NIVEIS_QUALIDADE.items() if lado])
+    parser.add_argument('--assets', default=PASTA_ASSETS)
+    parser.add_argument('--cache', default=_config['pasta_cache'])
+    args = parser.parse_args(argv)
+    total = gerar_proxies(args.niveis, args.assets, args.cache)
+    print(f"{total} proxies gerados em {os.path.abspath(args.cache)}")
@@ -0,0 +1,191 @@
+import bpy
+import os
+import numpy as np
+from cache_imagens import carregar_imagem_em_cache
+from registro_materiais import chave_material, obter_material, registrar_material
+from proxies_texturas import qualidade_texturas
+from lod import malha_bola, chave_esfera
+from layouts_bolas import gerar_racks, para_3d, escrever_pontos_rack
+
+# Rack de bolas em Geometry Nodes: as 16 bolas de uma mesa viram pontos de um
+# único objeto, com o atributo inteiro 'numero_bola' (0 = branca, 1..15).
+# Um grupo de nós instancia a mesma esfera em todos os pontos; o atributo
+# chega ao shader como atributo INSTANCER e escolhe a casa de um atlas 4x4
+# com as 16 texturas das bolas. Um material e uma avaliação de nós por rack,
+# em vez de 16 objetos e 16 materiais.
+_config = {'ativo': False}
+_atlas = {}
+_modelos = {}
+
+COLUNAS_ATLAS = 4
+TAMANHO_CASA = (1024, 512)
+
+
+def definir_rack_nos_geometria(ativo):
+    _config['ativo'] = bool(ativo)
+
+
+def rack_nos_geometria_ativo():
+    return _config['ativo']
+
+
+def _valido(bloco):
+    # O data-block pode ter sido removido (ex.: orphans_purge no limpar_cena)
+    try:
+        bloco.name
+        return True
+    except ReferenceError:
+        return False
+
+
+def _arquivo_textura_bola(pasta, numero):
+    # Os nomes dos arquivos não têm caixa uniforme (Ballcue/BallCue)
+    procurado = ('ballcue' if numero == 0 else f"ball{numero}") + '.jpg'
+    for nome in os.listdir(pasta):
+        if nome.lower() == procurado:
+            return os.path.join(pasta, nome)
+    raise FileNotFoundError(f"Textura da bola {numero} não encontrada em {pasta}")
+
+
+def atlas_bolas(pasta_texturas):
+    # Imagem 4x4 com as texturas das bolas 0..15 (linha 0 embaixo, como os pixels do Blender)
+    chave = (os.path.realpath(pasta_texturas), qualidade_texturas())
+    atlas = _atlas.get(chave)
+    if atlas is not None and _valido(atlas):
+        return atlas
+
+    largura, altura = TAMANHO_CASA
+    linhas = -(-16 // COLUNAS_ATLAS)
+    pixels = np.ones((linhas * altura, COLUNAS_ATLAS * largura, 4), dtype=np.float32)
+    for numero in range(16):
+        imagem = carregar_imagem_em_cache(_arquivo_textura_bola(pasta_texturas, numero), 'sRGB')
+        # Reduz uma cópia, para não alterar o data-block do cache
+        copia = imagem.copy()
+        copia.scale(largura, altura)
+        casa = np.empty(largura * altura * 4, dtype=np.float32)
+        copia.pixels.foreach_get(casa)
+        bpy.data.images.remove(copia)
+        linha, coluna = divmod(numero, COLUNAS_ATLAS)
+        pixels[linha * altura:(linha + 1) * altura, coluna * largura:(coluna + 1) * largura] = \
+            casa.reshape(altura, largura, 4)
+
+    atlas = bpy.data.images.new("Atlas_Bolas", COLUNAS_ATLAS * largura, linhas * altura, alpha=False)
+    atlas.colorspace_settings.name = 'sRGB'
+    atlas.pixels.foreach_set(pixels.ravel())
+    atlas.pack()
+    _atlas[chave] = atlas
+    return atlas
+
+
+def material_atlas_bolas(pasta_texturas, rugosidade=0.0):
+    # Material das bolas: o atributo de instância 'numero_bola' desloca a UV para a casa do atlas
+    impressao = chave_material('rack_atlas', None, pasta=os.path.realpath(pasta_texturas),
+                               qualidade=qualidade_texturas(), rugosidade=rugosidade)
+    material = obter_material(impressao)
+    if material is not None:
+        return material
+
+    material = bpy.data.materials.new("Material_Bolas_Atlas")
+    material.use_nodes = True
+    nodes = material.node_tree.nodes
+    links = material.node_tree.links
+    bsdf = nodes.get('Principled BSDF')
+    bsdf.inputs['Roughness'].default_value = rugosidade
+
+    atributo = nodes.new('ShaderNodeAttribute')
+    atributo.attribute_type = 'INSTANCER'
+    atributo.attribute_name = 'numero_bola'
+
+    coluna = nodes.new('ShaderNodeMath')
+    coluna.operation = 'MODULO'
+    coluna.inputs[1].default_value = COLUNAS_ATLAS
+    links.new(atributo.outputs['Fac'], coluna.inputs[0])
+
+    linha = nodes.new('ShaderNodeMath')
+    linha.operation = 'DIVIDE'
+    linha.inputs[1].default_value = COLUNAS_ATLAS
+    links.new(atributo.outputs['Fac'], linha.inputs[0])
+    linha_inteira = nodes.new('ShaderNodeMath')
+    linha_inteira.operation = 'FLOOR'
+    links.new(linha.outputs['Value'], linha_inteira.inputs[0])
+
+    deslocamento = nodes.new('ShaderNodeCombineXYZ')
+    links.new(coluna.outputs['Value'], deslocamento.inputs['X'])
+    links.new(linha_inteira.outputs['Value'], deslocamento.inputs['Y'])
+
+    tex_coord = nodes.new('ShaderNodeTexCoord')
+    soma = nodes.new('ShaderNodeVectorMath')
+    soma.operation = 'ADD'
+    links.new(tex_coord.outputs['UV'], soma.inputs[0])
+    links.new(deslocamento.outputs['Vector'], soma.inputs[1])
+    escala = nodes.new('ShaderNodeVectorMath')
+    escala.operation = 'SCALE'
+    escala.inputs['Scale'].default_value = 1 / COLUNAS_ATLAS
+    links.new(soma.outputs['Vector'], escala.inputs[0])
+
+    tex_node = nodes.new('ShaderNodeTexImage')
+    tex_node.image = atlas_bolas(pasta_texturas)
+    links.new(escala.outputs['Vector'], tex_node.inputs['Vector'])
+    links.new(tex_node.outputs['Color'], bsdf.inputs['Base Color'])
+
+    registrar_material(impressao, material)
+    return material
+
+
+def _novo_socket_geometria(grupo, nome, entrada):
+    # Blender 4.0+ usa node_group.interface; versões anteriores, inputs/outputs
+    if hasattr(grupo, 'interface'):
+        grupo.interface.new_socket(nome, in_out='INPUT' if entrada else 'OUTPUT', socket_type='NodeSocketGeometry')
+    else:
+        (grupo.inputs if entrada else grupo.outputs).new('NodeSocketGeometry', nome)
+
+
+def grupo_rack(bola_raio, material):
+    # Grupo de nós que instancia a esfera (malha compartilhada do LOD atual) em cada ponto
+    chave = (chave_esfera(bola_raio), material.name)
+    grupo = _modelos.get(chave)
+    if grupo is not None and _valido(grupo):
+        return grupo
+
+    modelo = bpy.data.objects.new("Rack_Esfera_Modelo", malha_bola(bola_raio))
+    grupo = bpy.data.node_groups.new("Rack_Bolas", 'GeometryNodeTree')
+    _novo_socket_geometria(grupo, "Geometry", entrada=True)
+    _novo_socket_geometria(grupo, "Geometry", entrada=False)
+    nodes = grupo.nodes
+    links = grupo.links
+
+    entrada = nodes.new('NodeGroupInput')
+    saida = nodes.new('NodeGroupOutput')
+    info = nodes.new('GeometryNodeObjectInfo')
+    info.transform_space = 'ORIGINAL'
+    info.inputs['Object'].default_value = modelo
+    definir_material = nodes.new('GeometryNodeSetMaterial')
+    definir_material.inputs['Material'].default_value = material
+    instanciar = nodes.new('GeometryNodeInstanceOnPoints')
+
+    links.new(info.outputs['Geometry'], definir_material.inputs['Geometry'])
+    # Os atributos dos pontos (numero_bola) passam para o domínio das instâncias
+    links.new(entrada.outputs[0], instanciar.inputs['Points'])
+    links.new(definir_material.outputs['Geometry'], instanciar.inputs['Instance'])
+    links.new(instanciar.outputs['Instances'], saida.inputs[0])
+
+    _modelos[chave] = grupo
+    return grupo
+
+
+def criar_rack_nos_geometria(nome, pontos, numeros, bola_raio, pasta_texturas):
+    # pontos: [(x, y, z)] das bolas; numeros: número de cada bola (0 = branca)
+    malha = bpy.data.meshes.new(nome)
+    escrever_pontos_rack(malha, pontos, numeros)
+
+    objeto = bpy.data.objects.new(nome, malha)
+    bpy.context.collection.objects.link(objeto)
+    modificador = objeto.modifiers.new("Rack", 'NODES')
+    modificador.node_group = grupo_rack(bola_raio, material_atlas_bolas(pasta_texturas))
+    return objeto
+
+
+def criar_racks_em_lote(nome, tipo, origens, z, bola_raio, pasta_texturas, comprimento=4.0, seed=None):
+    # Um único objeto com os racks de todas as mesas (origens: [(x, y, z)] de cada mesa)
+    posicoes, numeros = gerar_racks(tipo, len(origens), bola_raio, comprimento, seed=seed)
+    return criar_rack_nos_geometria(nome, para_3d(posicoes, z, origens), numeros, bola_raio, pasta_texturas)
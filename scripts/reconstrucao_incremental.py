@@ -0,0 +1,108 @@
+import bpy
+import json
+from proxies_texturas import qualidade_texturas
+from politica_deslocamento import politica_deslocamento
+from rack_nos_geometria import rack_nos_geometria_ativo
+
+# Reconstrução incremental: cada raiz de mesa guarda o nome pedido e uma
+# assinatura dos parâmetros usados para construí-la. Numa nova execução só as
+# mesas com parâmetros diferentes são reconstruídas; se só a posição mudou a
+# raiz é movida; mesas que não foram pedidas são removidas.
+
+
+def _politicas_globais():
+    # Opções globais que mudam a geometria ou os materiais que os construtores geram
+    return {
+        'qualidade_texturas': qualidade_texturas(),
+        'deslocamento': politica_deslocamento(),
+        'rack_nos': rack_nos_geometria_ativo(),
+    }
+
+
+def _assinatura(mesa):
+    # Tudo que define a geometria e os materiais da mesa, menos a posição (que só move a raiz)
+    dados = {
+        'variante': mesa['variante'],
+        'parametros': mesa.get('parametros', {}),
+        'instancia': mesa.get('instancia', False),
+        **_politicas_globais(),
+    }
+    return json.dumps(dados, sort_keys=True, default=list)
+
+
+def assinatura_variante(nome_variante, parametros):
+    # Mesma ideia para o modelo de uma coleção Variante_<nome>
+    dados = {'variante': nome_variante, 'parametros': parametros, **_politicas_globais()}
+    return json.dumps(dados, sort_keys=True, default=list)
+
+
+def raizes_rastreadas():
+    return {obj['nome_raiz']: obj for obj in bpy.data.objects if 'nome_raiz' in obj.keys()}
+
+
+def objetos_rastreados():
+    objetos = set()
+    for raiz in raizes_rastreadas().values():
+        objetos.add(raiz)
+        objetos.update(raiz.children_recursive)
+    return objetos
+
+
+def remover_hierarquia(raiz):
+    # Remove a raiz e todos os descendentes; malhas que ficarem sem uso também
+    objetos = [raiz] + list(raiz.children_recursive)
+    malhas = {obj.data for obj in objetos if obj.type == 'MESH'}
+    for obj in objetos:
+        bpy.data.objects.remove(obj)
+    for malha in malhas:
+        if malha.users == 0:
+            bpy.data.meshes.remove(malha)
+
+
+def remover_objetos_nao_rastreados():
+    # Chão, câmeras, luzes etc. (baratos de recriar); modelos das variantes ficam
+    rastreados = objetos_rastreados()
+    visiveis = set(bpy.context.view_layer.objects)
+    for obj in list(bpy.context.scene.objects):
+        if obj in visiveis and obj not in rastreados:
+            bpy.data.objects.remove(obj)
+
+
+def sincronizar_mesas(mesas, criar_mesa):
+    # mesas: [{'variante', 'nome_raiz', 'location', 'parametros' (opcional)}]
+    # criar_mesa(mesa): constrói a mesa e retorna o objeto raiz
+    existentes = raizes_rastreadas()
+    pedidos = {mesa['nome_raiz'] for mesa in mesas}
+    resumo = {'mantidas': 0, 'movidas': 0, 'reconstruidas': 0, 'removidas': 0}
+
+    for nome, raiz in existentes.items():
+        if nome not in pedidos:
+            remover_hierarquia(raiz)
+            resumo['removidas'] += 1
+
+    for mesa in mesas:
+        assinatura = _assinatura(mesa)
+        raiz = existentes.get(mesa['nome_raiz'])
+        if raiz is not None and raiz.get('assinatura') == assinatura:
+            if any(abs(a - b) > 1e-6 for a, b in zip(raiz.location, mesa['location'])):
+                raiz.location = mesa['location']
+                resumo['movidas'] += 1
+            else:
+                resumo['mantidas'] += 1
+            continue
+
+        if raiz is not None:
+            remover_hierarquia(raiz)
+        raiz = criar_mesa(mesa)
+        raiz['nome_raiz'] = mesa['nome_raiz']
+        raiz['assinatura'] = assinatura
+        resumo['reconstruidas'] += 1
+    return resumo
+
+
+def imprimir_resumo_sincronizacao(resumo):
+    print(
+        f"Reconstrução incremental: {resumo['reconstruidas']} reconstruídas, "
+        f"{resumo['movidas']} movidas, {resumo['mantidas']} mantidas, "
+        f"{resumo['removidas']} removidas"
+    )
@@ -0,0 +1,69 @@
+import bpy
+import bmesh
+from mathutils import Matrix
+from geometria import criar_cilindro, aplicar_modificador
+from perfilador import medir_etapa
+
+# Recorte das caçapas nas peças da mesa (borda, feltro, berço).
+# No modo em lote todos os cilindros de recorte viram um único objeto e cada
+# peça recebe um só booleano, em vez de 6 booleanos aplicados um a um.
+SOLVERS_RECORTE = ('EXACT', 'FAST')
+
+
+def criar_cortador_combinado(posicoes, raio, profundidade, vertices=32, nome="Cacapas_Recorte"):
+    # Uma malha com um cilindro fechado em cada posição
+    bm = bmesh.new()
+    for pos in posicoes:
+        bmesh.ops.create_cone(
+            bm,
+            cap_ends=True,
+            cap_tris=False,
+            segments=vertices,
+            radius1=raio,
+            radius2=raio,
+            depth=profundidade,
+            matrix=Matrix.Translation(pos)
+        )
+    malha = bpy.data.meshes.new(nome)
+    bm.to_mesh(malha)
+    bm.free()
+
+    cortador = bpy.data.objects.new(nome, malha)
+    bpy.context.collection.objects.link(cortador)
+    return cortador
+
+
+def aplicar_booleano(alvo, cortador, nome, solver='EXACT'):
+    mod = alvo.modifiers.new(name=nome, type='BOOLEAN')
+    mod.operation = 'DIFFERENCE'
+    mod.object = cortador
+    mod.solver = solver
+    aplicar_modificador(alvo, mod.name)
+
+
+def _remover_cortador(cortador):
+    malha = cortador.data
+    bpy.data.objects.remove(cortador)
+    if malha.users == 0:
+        bpy.data.meshes.remove(malha)
+
+
+@medir_etapa('booleanos_cacapas')
+def recortar_cacapas(alvos, posicoes, raio, profundidade, solver='EXACT', em_lote=True):
+    # alvos: objetos a recortar; posicoes: centro de cada cilindro de recorte
+    if solver not in SOLVERS_RECORTE:
+        raise ValueError(f"Solver de recorte '{solver}' inválido, use um de {SOLVERS_RECORTE}")
+
+    if em_lote:
+        cortador = criar_cortador_combinado(posicoes, raio, profundidade)
+        for alvo in alvos:
+            aplicar_booleano(alvo, cortador, f"Boolean_Cacapas_{alvo.name}", solver)
+        _remover_cortador(cortador)
+        return
+
+    # Modo original: um cilindro e um booleano por caçapa e por peça
+    for i, pos in enumerate(posicoes):
+        cacapa_recorte = criar_cilindro(f"Cacapa_Recorte_{i}", raio, profundidade, pos)
+        for alvo in alvos:
+            aplicar_booleano(alvo, cacapa_recorte, f"Boolean_Cacapa_{alvo.name}_{i}", solver)
+        _remover_cortador(cacapa_recorte)
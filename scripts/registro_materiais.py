@@ -0,0 +1,92 @@
+import os
+from proxies_texturas import qualidade_texturas
+
+# Registro de materiais compartilhado por todos os scripts do processo.
+# Cada material é identificado por uma "impressão digital" das entradas usadas
+# para montá-lo (texturas, colorspaces e parâmetros), assim peças idênticas
+# (ex.: as 6 caçapas pretas ou as 4 pernas) usam o mesmo data-block.
+# Materiais com textura incluem a qualidade dos proxies na chave.
+_registro = {}
+_estatisticas = {'criados': 0, 'reutilizados': 0}
+
+
+def _normalizar(valor):
+    # Arredonda floats para que 0.1 e 0.10000001 gerem a mesma chave
+    if isinstance(valor, float):
+        return round(valor, 6)
+    if isinstance(valor, (list, tuple)):
+        return tuple(_normalizar(v) for v in valor)
+    return valor
+
+
+def chave_material(tipo, texturas=None, **parametros):
+    itens_texturas = []
+    for entrada, (caminho, colorspace) in (texturas or {}).items():
+        itens_texturas.append((entrada, os.path.realpath(os.path.abspath(caminho)), colorspace))
+    if itens_texturas:
+        itens_texturas.append(('qualidade', qualidade_texturas(), None))
+    itens_parametros = [(nome, _normalizar(valor)) for nome, valor in parametros.items()]
+    return (tipo, tuple(sorted(itens_texturas)), tuple(sorted(itens_parametros)))
+
+
+def _material_valido(material):
+    # O material pode ter sido removido (ex.: orphans_purge no limpar_cena)
+    try:
+        material.name
+        return True
+    except ReferenceError:
+        return False
+
+
+def obter_material(chave):
+    # Retorna o material registrado para a chave, ou None se ainda não existe
+    material = _registro.get(chave)
+    if material is None:
+        return None
+    if not _material_valido(material):
+        del _registro[chave]
+        return None
+    _estatisticas['reutilizados'] += 1
+    return material
+
+
+def registrar_material(chave, material):
+    _registro[chave] = material
+    _estatisticas['criados'] += 1
+
+
+def atribuir_material(objeto, material):
+    # Com a malha compartilhada entre vários objetos, o material vai para o
+    # slot do objeto (link='OBJECT') para não trocar o material dos outros
+    if objeto.data.users > 1:
+        if not objeto.data.materials:
+            objeto.data.materials.append(None)
+        slot = objeto.material_slots[0]
+        slot.link = 'OBJECT'
+        slot.material = material
+    else:
+        objeto.data.materials.clear()
+        objeto.data.materials.append(material)
+
+
+def estatisticas_materiais():
+    return {
+        'criados': _estatisticas['criados'],
+        'reutilizados': _estatisticas['reutilizados'],
+        'materiais_registrados': len(_registro),
+    }
+
+
+def imprimir_estatisticas_materiais():
+    estatisticas = estatisticas_materiais()
+    print(
+        f"Registro de materiais: {estatisticas['criados']} criados, "
+        f"{estatisticas['reutilizados']} reutilizados "
+        f"({estatisticas['materiais_registrados']} registrados)"
+    )
+
+
+def limpar_registro_materiais():
+    _registro.clear()
+    _estatisticas['criados'] = 0
+    _estatisticas['reutilizados'] = 0
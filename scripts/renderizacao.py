@@ -0,0 +1,73 @@
+import bpy
+import os
+import time
+from perfilador import etapa
+from passes_anotacao import passes_anotacao_ativos, apontar_passes
+
+# Renderização em lote das câmeras de uma cena já construída.
+# A cena é montada uma vez e todas as câmeras pedidas são renderizadas a partir dela.
+
+
+def ler_resolucao(texto):
+    # "1920x1080" -> (1920, 1080)
+    try:
+        largura, altura = texto.lower().split('x')
+        return int(largura), int(altura)
+    except ValueError:
+        raise ValueError(f"Resolução '{texto}' inválida, use o formato LARGURAxALTURA (ex.: 1920x1080)")
+
+
+def configurar_render(resolucao=None, amostras=None, motor=None, scene=None, porcentagem=None):
+    scene = scene or bpy.context.scene
+    if motor:
+        scene.render.engine = motor
+    if resolucao:
+        scene.render.resolution_x, scene.render.resolution_y = resolucao
+    # Sem resolução nem porcentagem explícitas vale a porcentagem do perfil de render
+    # (perfis_render.py); uma resolução pedida sai com esse tamanho, a 100%
+    if porcentagem:
+        scene.render.resolution_percentage = porcentagem
+    elif resolucao:
+        scene.render.resolution_percentage = 100
+    if amostras:
+        if scene.render.engine == 'CYCLES':
+            scene.cycles.samples = amostras
+        else:
+            scene.eevee.taa_render_samples = amostras
+
+
+def obter_camera(nome):
+    camera = bpy.data.objects.get(nome)
+    if camera is None or camera.type != 'CAMERA':
+        raise ValueError(f"Câmera '{nome}' não encontrada na cena")
+    return camera
+
+
+def renderizar_cameras(nomes_cameras, pasta_saida, scene=None, antes_de_renderizar=None):
+    # Renderiza cada câmera em <pasta_saida>/<nome>.png e retorna [(nome, segundos)]
+    # antes_de_renderizar(camera), se dado, prepara a cena para a câmera (ex.: LOD)
+    scene = scene or bpy.context.scene
+    os.makedirs(pasta_saida, exist_ok=True)
+    cameras = [obter_camera(nome) for nome in nomes_cameras]
+    scene.render.image_settings.file_format = 'PNG'
+
+    tempos = []
+    for camera in cameras:
+        scene.camera = camera
+        if antes_de_renderizar:
+            antes_de_renderizar(camera)
+        scene.render.filepath = os.path.join(os.path.abspath(pasta_saida), f"{camera.name}.png")
+        if passes_anotacao_ativos():
+            apontar_passes(scene.render.filepath, scene)
+        inicio = time.perf_counter()
+        with etapa(f"render_{camera.name}"):
+            bpy.ops.render.render(write_still=True)
+        tempos.append((camera.name, time.perf_counter() - inicio))
+    return tempos
+
+
+def imprimir_resumo_tempos(tempos, titulo="Tempo de render por câmera"):
+    print(f"\n{titulo}")
+    for nome, segundos in tempos:
+        print(f"  {nome:<20} {segundos:8.2f} s")
+    print(f"  {'total':<20} {sum(s for _, s in tempos):8.2f} s")
@@ -3,6 +3,21 @@ import math
 import os
 import sys
 
+# Permite importar os módulos auxiliares da pasta scripts
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from cache_imagens import carregar_imagem_em_cache
+from registro_materiais import chave_material, obter_material, registrar_material, atribuir_material
+from malhas_compartilhadas import criar_objeto_compartilhado, duplicar_objeto_ligado, malha_compartilhada_ativa
+from recorte_cacapas import recortar_cacapas
+from geometria import criar_cubo, criar_esfera, criar_cilindro, criar_vazio, aplicar_modificador
+from perfilador import medir_etapa, etapa
+from cache_bibliotecas import obter_modelo_biblioteca, instanciar_modelo
+from politica_deslocamento import politica_deslocamento, ligar_deslocamento, preparar_objeto_deslocamento
+from lod import parametros_lod, chave_esfera, chave_cilindro, marcar_lod
+from rack_nos_geometria import rack_nos_geometria_ativo, criar_rack_nos_geometria
+from layouts_bolas import rack_triangular
+from perfis_render import aplicar_perfil_render
+
 
 def limpar_cena():
     # Antes de deletar, verifica se está no modo de objeto
@@ -17,10 +32,7 @@ def limpar_cena():
 def criar_objeto_pai(nome, localizacao_global):
     localizacao_global = (0, 0, 0)
     # Cria um objeto vazio para servir como pai
-    bpy.ops.object.empty_add(type='PLAIN_AXES', location=localizacao_global)
-    pai = bpy.context.object
-    pai.name = nome
-    return pai
+    return criar_vazio(nome, localizacao_global)
 
 def definir_pai(objeto, pai):
     if objeto and pai:
@@ -36,7 +48,8 @@ def obter_caminho_absoluto(caminho_rel):
     script_dir = os.path.dirname(os.path.abspath(__file__))
     return os.path.join(script_dir, caminho_rel)
 
-def importar_modelo(caminho_arquivo, nome_objeto, posicao, rotacao=None, escala=None, pai=None):
+@medir_etapa('importar_modelo')
+def importar_modelo(caminho_arquivo, nome_objeto, posicao, rotacao=None, escala=None, pai=None, link=None):
     extensao = os.path.splitext(caminho_arquivo)[1].lower()
     
     objeto = None  # Inicializa objeto como None
@@ -49,20 +62,11 @@ def importar_modelo(caminho_arquivo, nome_objeto, posicao, rotacao=None, escala=
             objeto = None
 
     elif extensao == '.blend':
-        with bpy.data.libraries.load(caminho_arquivo, link=False) as (data_from, data_to):
-            objetos_compatíveis = []
-            # Filtra os objetos com o nome especificado 
-            for name in data_from.objects:
-                if name.startswith(nome_objeto):
-                    objetos_compatíveis.append(name)
-            data_to.objects = objetos_compatíveis
-
-        # Importa os objetos compatíveis
-        for obj in data_to.objects:
-            if obj is not None:
-                bpy.context.collection.objects.link(obj)
-                objeto = obj
-                break
+        # O arquivo é lido uma vez por sessão; cada importação é uma cópia leve do modelo
+        # link=True liga os dados ao arquivo de origem em vez de anexá-los
+        modelo = obter_modelo_biblioteca(caminho_arquivo, nome_objeto, link=link)
+        if modelo is not None:
+            objeto = instanciar_modelo(modelo)
     else:
         raise ValueError(f"Formato de arquivo {extensao} não suportado")
 
@@ -86,14 +90,14 @@ def importar_modelo(caminho_arquivo, nome_objeto, posicao, rotacao=None, escala=
     
     return objeto
 
+@medir_etapa('textura')
 def carregar_textura_imagem(caminho_textura, colorspace='sRGB'):
     # Carrega uma textura e configura o espaço de cores
     if not os.path.exists(caminho_textura):
         raise FileNotFoundError(f'Arquivo {caminho_textura} não encontrado!')
     try:
-        image = bpy.data.images.load(caminho_textura)
-        image.colorspace_settings.name = colorspace
-        return image
+        # Reaproveita o data-block se a mesma textura já foi carregada antes
+        return carregar_imagem_em_cache(caminho_textura, colorspace)
     except Exception as e:
         raise Exception(f'Erro ao carregar textura: {e}') 
 
@@ -109,105 +113,120 @@ def criar_material_base(nome):
     links.new(bsdf.outputs['BSDF'], output.inputs['Surface'])
     return material, bsdf
 
+@medir_etapa('material')
 def aplicar_material(objeto, texturas=None, cor_base=None, rugosidade=1):
     # Aplica um material ao objeto - configuração básica
-    material, bsdf = criar_material_base(f"Material_{objeto.name}")
-
-    if texturas:
-        # Percorre o dicionário de texturas
-        for chave, valor in texturas.items():
-            input_name = chave     
-            caminho = valor[0]     
-            colorspace = valor[1]  
+    # Reutiliza um material idêntico (mesmas texturas e parâmetros) se já existir
+    impressao = chave_material('basico', texturas, cor_base=cor_base, rugosidade=rugosidade)
+    material = obter_material(impressao)
+    if material is None:
+        material, bsdf = criar_material_base(f"Material_{objeto.name}")
+
+        if texturas:
+            # Percorre o dicionário de texturas
+            for chave, valor in texturas.items():
+                input_name = chave     
+                caminho = valor[0]     
+                colorspace = valor[1]  
    
-            tex_image = carregar_textura_imagem(caminho, colorspace)
-            if tex_image:
-                tex_node = material.node_tree.nodes.new('ShaderNodeTexImage')
-                tex_node.image = tex_image
-                if input_name == 'Normal':
-                    normal_map = material.node_tree.nodes.new('ShaderNodeNormalMap')
-                    material.node_tree.links.new(tex_node.outputs['Color'], normal_map.inputs['Color'])
-                    material.node_tree.links.new(normal_map.outputs['Normal'], bsdf.inputs['Normal'])
-                else:
-                    material.node_tree.links.new(tex_node.outputs['Color'], bsdf.inputs[input_name])
-
-    # Configurações padrão
-    if cor_base is not None:
-        bsdf.inputs['Base Color'].default_value = cor_base
-    if rugosidade is not None:
-        bsdf.inputs['Roughness'].default_value = rugosidade
+                tex_image = carregar_textura_imagem(caminho, colorspace)
+                if tex_image:
+                    tex_node = material.node_tree.nodes.new('ShaderNodeTexImage')
+                    tex_node.image = tex_image
+                    if input_name == 'Normal':
+                        normal_map = material.node_tree.nodes.new('ShaderNodeNormalMap')
+                        material.node_tree.links.new(tex_node.outputs['Color'], normal_map.inputs['Color'])
+                        material.node_tree.links.new(normal_map.outputs['Normal'], bsdf.inputs['Normal'])
+                    else:
+                        material.node_tree.links.new(tex_node.outputs['Color'], bsdf.inputs[input_name])
+
+        # Configurações padrão
+        if cor_base is not None:
+            bsdf.inputs['Base Color'].default_value = cor_base
+        if rugosidade is not None:
+            bsdf.inputs['Roughness'].default_value = rugosidade
+        registrar_material(impressao, material)
 
     # Aplicar material ao objeto
-    objeto.data.materials.clear()
-    objeto.data.materials.append(material)
+    atribuir_material(objeto, material)
 
+@medir_etapa('material')
 def aplicar_material_feltro(objeto, texturas, rugosidade=1, deslocamento_escala=0.050, mapping_scale=0.100):
     # Aplica material específico para o feltro com texturas completas
-    material, bsdf = criar_material_base(f"Material_Feltro_{objeto.name}")
+    impressao = chave_material(
+        'feltro', texturas,
+        rugosidade=rugosidade,
+        deslocamento_escala=deslocamento_escala,
+        mapping_scale=mapping_scale,
+        deslocamento=politica_deslocamento(),
+    )
+    material = obter_material(impressao)
+    if material is None:
+        material, bsdf = criar_material_base(f"Material_Feltro_{objeto.name}")
+        tex_deslocamento = None
     
-    # Cria as arvore de nodes e links
-    nodes = material.node_tree.nodes
-    links = material.node_tree.links
+        # Cria as arvore de nodes e links
+        nodes = material.node_tree.nodes
+        links = material.node_tree.links
 
-    tex_coord = nodes.new('ShaderNodeTexCoord')
-    mapping = nodes.new('ShaderNodeMapping')
-    mapping.vector_type = 'TEXTURE'
+        tex_coord = nodes.new('ShaderNodeTexCoord')
+        mapping = nodes.new('ShaderNodeMapping')
+        mapping.vector_type = 'TEXTURE'
     
-    value_node = nodes.new('ShaderNodeValue')
-    value_node.outputs[0].default_value = mapping_scale
+        value_node = nodes.new('ShaderNodeValue')
+        value_node.outputs[0].default_value = mapping_scale
     
-    links.new(value_node.outputs['Value'], mapping.inputs['Scale'])
-    links.new(tex_coord.outputs['UV'], mapping.inputs['Vector'])
-
-    # Percorre o dicionário de texturas
-    for chave, valor in texturas.items():
-        input_name = chave
-        caminho = valor[0]
-        colorspace = valor[1] 
-        tex_image = carregar_textura_imagem(caminho, colorspace)
+        links.new(value_node.outputs['Value'], mapping.inputs['Scale'])
+        links.new(tex_coord.outputs['UV'], mapping.inputs['Vector'])
+
+        # Percorre o dicionário de texturas
+        for chave, valor in texturas.items():
+            input_name = chave
+            caminho = valor[0]
+            colorspace = valor[1] 
+            tex_image = carregar_textura_imagem(caminho, colorspace)
         
-        if not tex_image:
-            continue
+            if not tex_image:
+                continue
         
-        tex_node = nodes.new('ShaderNodeTexImage')
-        tex_node.image = tex_image
-        links.new(mapping.outputs['Vector'], tex_node.inputs['Vector'])
+            tex_node = nodes.new('ShaderNodeTexImage')
+            tex_node.image = tex_image
+            links.new(mapping.outputs['Vector'], tex_node.inputs['Vector'])
 
-        if input_name == 'Base Color':
-            links.new(tex_node.outputs['Color'], bsdf.inputs['Base Color'])
+            if input_name == 'Base Color':
+                links.new(tex_node.outputs['Color'], bsdf.inputs['Base Color'])
         
-        elif input_name == 'Normal':
-            normal_map = nodes.new('ShaderNodeNormalMap')
-            normal_map.inputs['Strength'].default_value = 1.000
-            links.new(tex_node.outputs['Color'], normal_map.inputs['Color'])
-            links.new(normal_map.outputs['Normal'], bsdf.inputs['Normal'])
+            elif input_name == 'Normal':
+                normal_map = nodes.new('ShaderNodeNormalMap')
+                normal_map.inputs['Strength'].default_value = 1.000
+                links.new(tex_node.outputs['Color'], normal_map.inputs['Color'])
+                links.new(normal_map.outputs['Normal'], bsdf.inputs['Normal'])
         
-        elif input_name == 'Roughness':
-            links.new(tex_node.outputs['Color'], bsdf.inputs['Roughness'])
+            elif input_name == 'Roughness':
+                links.new(tex_node.outputs['Color'], bsdf.inputs['Roughness'])
         
-        elif input_name == 'Displacement':
-            displacement_node = nodes.new('ShaderNodeDisplacement')
-            displacement_node.inputs['Scale'].default_value = deslocamento_escala
-            links.new(tex_node.outputs['Color'], displacement_node.inputs['Height'])
-            output = nodes.get('Material Output')
+            elif input_name == 'Displacement':
+                # Ligado depois do laço, conforme a política (bump ou deslocamento real)
+                tex_deslocamento = tex_node
         
-            if output:
-                links.new(displacement_node.outputs['Displacement'], output.inputs['Displacement'])
-        
-        elif input_name == 'Height':
-            bump_node = nodes.new('ShaderNodeBump')
-            bump_node.inputs['Strength'].default_value = deslocamento_escala
-            links.new(tex_node.outputs['Color'], bump_node.inputs['Height'])
-            links.new(bump_node.outputs['Normal'], bsdf.inputs['Normal'])
+            elif input_name == 'Height':
+                bump_node = nodes.new('ShaderNodeBump')
+                bump_node.inputs['Strength'].default_value = deslocamento_escala
+                links.new(tex_node.outputs['Color'], bump_node.inputs['Height'])
+                links.new(bump_node.outputs['Normal'], bsdf.inputs['Normal'])
 
 
+        if tex_deslocamento:
+            ligar_deslocamento(material, tex_deslocamento, bsdf, deslocamento_escala)
 
-    # Configurações padrão
-    bsdf.inputs['Roughness'].default_value = rugosidade
+        # Configurações padrão
+        bsdf.inputs['Roughness'].default_value = rugosidade
+        registrar_material(impressao, material)
     
     # Aplicar material ao objeto
-    objeto.data.materials.clear()
-    objeto.data.materials.append(material)
+    atribuir_material(objeto, material)
+    if 'Displacement' in texturas:
+        preparar_objeto_deslocamento(objeto)
 
 def hex_to_rgba(hex_color, alpha=None, include_alpha=True):
     # Converte cor hexadecimal para RGBA ou RGB
@@ -225,22 +244,12 @@ def hex_to_rgba(hex_color, alpha=None, include_alpha=True):
         return (r, g, b)
 
 def calcular_posicoes_rack(rack_x, bola_raio):
-    # Calcula as posições com formação triangular rigorosa
-    espacamento = bola_raio * 2.2  # Aumentado para evitar conflitos
-    posicoes = []
-    
-    # Gera posições do triângulo 5 fileiras)
-    for linha in range(5):
-        qtd_bolas = linha + 1
-        offset_x = rack_x + (linha * espacamento * 0.866) 
-        start_y = -(qtd_bolas - 1) * (espacamento / 2)
-        for bola in range(qtd_bolas):
-            y_pos = start_y + (bola * espacamento)
-            posicoes.append((offset_x, y_pos))
-    
-    return posicoes
+    # Calcula as posições com formação triangular rigorosa (5 fileiras, espaçamento 2.2 raios)
+    # Outros jogos e lotes de racks: layouts_bolas.gerar_racks
+    return [tuple(posicao) for posicao in rack_triangular(5, bola_raio, rack_x).tolist()]
 
-def criar_bolas(bola_raio, mesa_comprimento, mesa_altura_total, borda_espessura):
+@medir_etapa('bolas')
+def criar_bolas(bola_raio, mesa_comprimento, mesa_altura_total, borda_espessura, posicoes_bolas=None):
     z = mesa_altura_total + bola_raio
     bolas = []
     pasta_texturas_bolas = obter_caminho_absoluto(os.path.join('..', 'assets', 'Pool Ball Skins'))
@@ -258,35 +267,44 @@ def criar_bolas(bola_raio, mesa_comprimento, mesa_altura_total, borda_espessura)
         6, 7, 9, 10,        # Linha 4
         11, 12, 13, 14, 15  # Linha 5: base do triângulo
     ]
+
+    # BOLA BRANCA: lado esquerdo da mesa 
+    bola_branca_x = -mesa_comprimento/2 + borda_espessura + bola_raio * 6
+    posicao_branca = (bola_branca_x, 0)
+
+    # Posições de meio de jogo (dispersao_bolas): as 15 numeradas na ordem de ordem_bolas e a branca por último
+    if posicoes_bolas is not None:
+        posicoes, posicao_branca = list(posicoes_bolas[:15]), posicoes_bolas[15]
+
+    # Rack em Geometry Nodes: as 16 bolas são pontos de um único objeto instanciando a mesma esfera
+    if rack_nos_geometria_ativo():
+        pontos = [(x, y, z) for x, y in posicoes] + [(posicao_branca[0], posicao_branca[1], z)]
+        return [criar_rack_nos_geometria("Rack_Bolas", pontos, ordem_bolas + [0], bola_raio, pasta_texturas_bolas)]
     
     # Cria as bolas numeradas (1-15) na formação triangular
+    # Todas as bolas usam a mesma malha de esfera (já suavizada), na resolução do LOD atual
+    segmentos_esfera, aneis_esfera = parametros_lod()['esfera']
+    chave_bola = chave_esfera(bola_raio)
     for i, (x, y) in enumerate(posicoes):
-        bpy.ops.mesh.primitive_uv_sphere_add(
-            radius=bola_raio,
-            location=(x, y, z),
-            calc_uvs=True
+        bola = criar_objeto_compartilhado(
+            chave_bola,
+            f"Ball{ordem_bolas[i]}",
+            (x, y, z),
+            lambda loc: criar_esfera("Ball", bola_raio, loc, segmentos=segmentos_esfera, aneis=aneis_esfera)
         )
-        bola = bpy.context.object
-        bola.name = f"Ball{ordem_bolas[i]}"
+        marcar_lod(bola, 'esfera', raio=bola_raio)
         # Aplica material com textura individual
         caminho_textura_bola = os.path.join(pasta_texturas_bolas, f"Ball{ordem_bolas[i]}.jpg")
         aplicar_material(bola, texturas={'Base Color': (caminho_textura_bola, 'sRGB')}, rugosidade=0)
-        
-        # Aplica suavidade em todas as bolas
-        bpy.ops.object.shade_smooth()
         bolas.append(bola)
 
-    # BOLA BRANCA: lado esquerdo da mesa 
-    bola_branca_x = -mesa_comprimento/2 + borda_espessura + bola_raio * 6
-    bpy.ops.mesh.primitive_uv_sphere_add(
-        radius=bola_raio,
-        location=(bola_branca_x, 0, z),
-        calc_uvs=True
+    bola_branca = criar_objeto_compartilhado(
+        chave_bola,
+        "Ballcue",
+        (posicao_branca[0], posicao_branca[1], z),
+        lambda loc: criar_esfera("Ball", bola_raio, loc, segmentos=segmentos_esfera, aneis=aneis_esfera)
     )
-    bola_branca = bpy.context.object
-    bola_branca.name = "Ballcue"
-    # aplicação de suavidade na bola branca
-    bpy.ops.object.shade_smooth()
+    marcar_lod(bola_branca, 'esfera', raio=bola_raio)
     
     # Aplica material com textura da bola branca
     caminho_textura_bola_branca = os.path.join(pasta_texturas_bolas, "Ballcue.jpg")
@@ -338,6 +356,7 @@ def adicionar_luz():
     area_light_pequena.data.size = 2
     area_light_pequena.data.color = cor_luz_pequena
 
+@medir_etapa()
 def criar_mesa_branca(
     nome_raiz="MesaBranca_Raiz",
     location=(0, 0, 0),
@@ -357,20 +376,20 @@ def criar_mesa_branca(
     caixa_largura=1.8,
     caixa_altura=0.33,
     caixa_profundidade=0.33,
-    largura_berco=0.13):
+    largura_berco=0.13,
+    recorte_solver='EXACT',
+    recorte_em_lote=True,
+    posicoes_bolas=None):
 
    
     
 
     # Feltro - área de jogo
-    bpy.ops.mesh.primitive_cube_add(
-        size=1, 
+    feltro = criar_cubo(
+        "Feltro",
         location=(0, 0, mesa_altura_total - mesa_espessura / 2),
-        calc_uvs=True,
         scale=(mesa_comprimento, mesa_largura, mesa_espessura)
     )
-    feltro = bpy.context.object
-    feltro.name = "Feltro"  
     
     # Aplica material com textura ao feltro
     aplicar_material_feltro(feltro, {
@@ -386,14 +405,11 @@ def criar_mesa_branca(
     berco_escala_z = 0.049
     berco_z = mesa_altura_total + 0.025
     
-    bpy.ops.mesh.primitive_cube_add(
-        size=1, 
+    berco = criar_cubo(
+        "Berco",
         location=(0, 0, berco_z),
-        scale=(berco_escala_x, berco_escala_y, berco_escala_z),
-        calc_uvs=True
+        scale=(berco_escala_x, berco_escala_y, berco_escala_z)
     )
-    berco = bpy.context.object
-    berco.name = "Berco"
         
     # Aplica material com textura azul ao berço
     aplicar_material_feltro(berco, {
@@ -405,40 +421,31 @@ def criar_mesa_branca(
 
 
     # Recorte central pra encaixar o feltro 
-    bpy.ops.mesh.primitive_cube_add(size=1, location=(0, 0, berco_z))
-    recorte_berco = bpy.context.object
-    recorte_berco.scale = (berco_escala_x - largura_berco, berco_escala_y - largura_berco, berco_escala_z + 0.001)
-    recorte_berco.name = "RecorteBerco"
+    recorte_berco = criar_cubo("RecorteBerco", location=(0, 0, berco_z), scale=(berco_escala_x - largura_berco, berco_escala_y - largura_berco, berco_escala_z + 0.001))
     bool_berco = berco.modifiers.new(name="RecorteBerco", type='BOOLEAN')
     bool_berco.operation = 'DIFFERENCE'
     bool_berco.object = recorte_berco
-    bpy.context.view_layer.objects.active = berco
-    bpy.ops.object.modifier_apply(modifier=bool_berco.name)
+    aplicar_modificador(berco, bool_berco.name)
     bpy.data.objects.remove(recorte_berco)
 
     # Moldura
-    bpy.ops.mesh.primitive_cube_add(
-        size=1,
-        location=(0, 0, mesa_altura_total)
+    borda = criar_cubo(
+        "Borda",
+        location=(0, 0, mesa_altura_total),
+        scale=(mesa_comprimento + 2 * borda_espessura, mesa_largura + 2 * borda_espessura, borda_altura)
     )
-    borda = bpy.context.object
-    borda.name = "Borda"
-    borda.scale = (mesa_comprimento + 2 * borda_espessura, mesa_largura + 2 * borda_espessura, borda_altura)
 
     # Aplica material com base cor branca
     aplicar_material(borda, cor_base=hex_to_rgba("#e7e7e7"), rugosidade=0.8)
 
 
     # Recorte do centro - para encaixar o feltro
-    bpy.ops.mesh.primitive_cube_add(size=1, location=(0, 0, mesa_altura_total))
-    corte = bpy.context.object
-    corte.scale = (mesa_comprimento, mesa_largura, borda_altura + 0.01)
+    corte = criar_cubo("Corte", location=(0, 0, mesa_altura_total), scale=(mesa_comprimento, mesa_largura, borda_altura + 0.01))
     
     mod = borda.modifiers.new(name="Boolean", type="BOOLEAN")
     mod.operation = 'DIFFERENCE'
     mod.object = corte
-    bpy.context.view_layer.objects.active = borda
-    bpy.ops.object.modifier_apply(modifier="Boolean")
+    aplicar_modificador(borda, mod.name)
     bpy.data.objects.remove(corte)
 
     # Tacos de sinuca
@@ -452,22 +459,32 @@ def criar_mesa_branca(
         escala=(1.966, 1.966, 1.966)
     )
 
-    taco2 = importar_modelo(
-        obter_caminho_absoluto(os.path.join('..', 'assets', 'modelos', 'pool-cue.blend')),
-        "Pool Cue",
-        posicao=(-0.647414, 0.-0.584524, 1.1),
-        rotacao=(0, 0, math.radians(358.71)),
-        escala=(1.966, 1.966, 1.966)
-    )
+    # O segundo taco reaproveita a malha do primeiro em vez de importar de novo
+    if malha_compartilhada_ativa():
+        taco2 = duplicar_objeto_ligado(
+            taco1,
+            posicao=(-0.647414, 0.-0.584524, 1.1),
+            rotacao=(0, 0, math.radians(358.71)),
+            escala=(1.966, 1.966, 1.966)
+        )
+    else:
+        taco2 = importar_modelo(
+            obter_caminho_absoluto(os.path.join('..', 'assets', 'modelos', 'pool-cue.blend')),
+            "Pool Cue",
+            posicao=(-0.647414, 0.-0.584524, 1.1),
+            rotacao=(0, 0, math.radians(358.71)),
+            escala=(1.966, 1.966, 1.966)
+        )
 
     tacos.append(taco1)
     tacos.append(taco2)
     
     # Base
-    bpy.ops.mesh.primitive_cube_add(size=1, location=(0, 0, mesa_altura_total - mesa_espessura - base_espessura / 2))
-    base = bpy.context.object
-    base.scale = (4.4, mesa_largura * base_scale_reduction, base_espessura)
-    base.name = "Base_Mesa"
+    base = criar_cubo(
+        "Base_Mesa",
+        location=(0, 0, mesa_altura_total - mesa_espessura - base_espessura / 2),
+        scale=(4.4, mesa_largura * base_scale_reduction, base_espessura)
+    )
     
     # Aplica material com cor à base
     aplicar_material(base, cor_base=hex_to_rgba("#e7e7e7"), rugosidade=0.8)
@@ -476,13 +493,11 @@ def criar_mesa_branca(
     caixa_x = 0
     caixa_y = -(mesa_largura/2 + caixa_profundidade/2 - 0.01)
     caixa_z = 0.82
-    bpy.ops.mesh.primitive_cube_add(
-        size=1,
-        location=(caixa_x, caixa_y, caixa_z)
+    caixa = criar_cubo(
+        "Caixa_Coletora",
+        location=(caixa_x, caixa_y, caixa_z),
+        scale=(caixa_largura/2, caixa_profundidade/2, caixa_altura/2)
     )
-    caixa = bpy.context.object
-    caixa.name = "Caixa_Coletora"
-    caixa.scale = (caixa_largura/2, caixa_profundidade/2, caixa_altura/2)
     aplicar_material(caixa, cor_base=hex_to_rgba("#0B0B0BFF"), rugosidade=0.8)
 
 
@@ -497,53 +512,33 @@ def criar_mesa_branca(
         (0, -mesa_largura/2, mesa_altura_total),
     ]
     cacapas = []
+    interior_raio = cacapa_raio - 0.001
+    interior_profundidade = borda_altura - mesa_espessura + 0.05
     for i, pos in enumerate(posicoes_cacapas):
-        # Cilindro interno da caçapa
-        bpy.ops.mesh.primitive_cylinder_add(
-            radius=cacapa_raio - 0.001,
-            depth=borda_altura - mesa_espessura + 0.05,
-            location=(pos[0], pos[1], pos[2] - mesa_espessura)
+        # Cilindro interno da caçapa (mesma malha para as 6 caçapas)
+        interior_cacapa = criar_objeto_compartilhado(
+            chave_cilindro(interior_raio, interior_profundidade),
+            f"Interior_Cacapa_{i}",
+            (pos[0], pos[1], pos[2] - mesa_espessura),
+            lambda loc: criar_cilindro("Interior_Cacapa", interior_raio, interior_profundidade, loc,
+                                       vertices=parametros_lod()['cilindro'])
         )
-        interior_cacapa = bpy.context.object
-        interior_cacapa.name = f"Interior_Cacapa_{i}"
+        marcar_lod(interior_cacapa, 'cilindro', raio=interior_raio, profundidade=interior_profundidade)
         aplicar_material(interior_cacapa, cor_base=hex_to_rgba('#000000'))
         cacapas.append(interior_cacapa)
-        
-        # Cilindro para recorte (boolean)
-        bpy.ops.mesh.primitive_cylinder_add(
-            radius=cacapa_raio,
-            depth=borda_altura + mesa_espessura + 0.01,
-            location=(pos[0], pos[1], pos[2] - mesa_espessura / 2)
-        )
-        cacapa_recorte = bpy.context.object
-        cacapa_recorte.name = f"Cacapa_Recorte_{i}"
-
-        # Boolean para a borda
-        mod_borda = borda.modifiers.new(name=f"Boolean_Cacapa_Borda_{i}", type="BOOLEAN")
-        mod_borda.operation = 'DIFFERENCE'
-        mod_borda.object = cacapa_recorte
-        bpy.context.view_layer.objects.active = borda
-        bpy.ops.object.modifier_apply(modifier=f"Boolean_Cacapa_Borda_{i}")
-
-        # Boolean para o feltro
-        mod_feltro = feltro.modifiers.new(name=f"Boolean_Cacapa_Feltro_{i}", type="BOOLEAN")
-        mod_feltro.operation = 'DIFFERENCE'
-        mod_feltro.object = cacapa_recorte
-        bpy.context.view_layer.objects.active = feltro
-        bpy.ops.object.modifier_apply(modifier=f"Boolean_Cacapa_Feltro_{i}")
-
-        # Boolean para o berço
-        mod_berco = berco.modifiers.new(name=f"Boolean_Cacapa_Berco_{i}", type="BOOLEAN")
-        mod_berco.operation = 'DIFFERENCE'
-        mod_berco.object = cacapa_recorte
-        bpy.context.view_layer.objects.active = berco
-        bpy.ops.object.modifier_apply(modifier=f"Boolean_Cacapa_Berco_{i}")
-
-        # Remove o cilindro de recorte
-        bpy.data.objects.remove(cacapa_recorte)
+
+    # Recorta as 6 caçapas na borda, no feltro e no berço
+    recortar_cacapas(
+        [borda, feltro, berco],
+        [(pos[0], pos[1], pos[2] - mesa_espessura / 2) for pos in posicoes_cacapas],
+        cacapa_raio,
+        borda_altura + mesa_espessura + 0.01,
+        solver=recorte_solver,
+        em_lote=recorte_em_lote
+    )
 
     # Bolas
-    bolas = criar_bolas(bola_raio, mesa_comprimento, mesa_altura_total, borda_espessura)
+    bolas = criar_bolas(bola_raio, mesa_comprimento, mesa_altura_total, borda_espessura, posicoes_bolas)
 
     # Suportes
     perna_altura = mesa_altura_total - mesa_espessura - base_espessura 
@@ -555,10 +550,9 @@ def criar_mesa_branca(
     ]
     pernas = []
     for i, pos in enumerate(posicoes_pernas):
-        bpy.ops.mesh.primitive_cube_add(size=1, location=pos, calc_uvs=True)
-        perna = bpy.context.object
+        # Cubo unitário compartilhado - o tamanho da perna fica na escala do objeto
+        perna = criar_objeto_compartilhado(('cubo_uv',), f"Perna_{i}", pos, lambda loc: criar_cubo("Perna", loc))
         perna.scale = (perna_tamanho, perna_tamanho, perna_altura)
-        perna.name = f"Perna_{i}"
         aplicar_material(perna,cor_base=hex_to_rgba("#e7e7e7"),rugosidade=0.8)
         pernas.append(perna)
 
@@ -581,20 +575,23 @@ def criar_mesa_branca(
     }
 
     # Parentear objetos aos subgrupos e subgrupos à raiz
-    for grupo_nome in objetos_principais:
-        if grupo_nome == "Mesa":
-            grupo_pai = raiz
-        else:
-            grupo_pai = grupos[grupo_nome]
-            definir_pai(grupo_pai, raiz)
-        for obj in objetos_principais[grupo_nome]:
-            definir_pai(obj, grupo_pai)
+    with etapa('parentesco'):
+        for grupo_nome in objetos_principais:
+            if grupo_nome == "Mesa":
+                grupo_pai = raiz
+            else:
+                grupo_pai = grupos[grupo_nome]
+                definir_pai(grupo_pai, raiz)
+            for obj in objetos_principais[grupo_nome]:
+                definir_pai(obj, grupo_pai)
 
     mover_raiz(raiz, location)
+    return raiz
 if __name__ == "__main__":
     limpar_cena()
     criar_mesa_branca()
     criar_camera()
     adicionar_luz()
+    aplicar_perfil_render()
 
     
\ No newline at end of file
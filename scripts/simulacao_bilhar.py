@@ -0,0 +1,150 @@
+import numpy as np
+from dispersao_bolas import posicoes_cacapas_mesa, limites_jogo
+
+# Simulador 2D simples de uma tacada, vetorizado com NumPy sobre as bolas e
+# sobre um lote de N mesas. Coordenadas no plano da mesa (centro na origem,
+# comprimento em x), como em layouts_bolas.py e dispersao_bolas.py.
+#
+# Cada subpasso aplica o atrito de rolamento, move as bolas, resolve todos os
+# contatos bola-bola de uma vez (impulso na normal, massas iguais, com
+# restituição), tira de jogo as bolas que entram numa caçapa, rebate nas
+# tabelas e separa as bolas que ficaram sobrepostas, repetindo até
+# ITERACOES_SEPARACAO vezes: separar um par pode empurrar uma bola contra a
+# vizinha (como no rack) ou contra a tabela. As bolas rolam sem deslizar: a velocidade angular é (-vy, vx, 0) / r
+# e a orientação é integrada como quaternion (w, x, y, z), que muda de forma
+# contínua de um quadro para o outro e pode ir direto para rotation_quaternion.
+GRAVIDADE = 9.81
+ATRITO_ROLAMENTO = 0.015
+RESTITUICAO_BOLAS = 0.95
+RESTITUICAO_TABELA = 0.75
+ITERACOES_SEPARACAO = 8
+# Sobreposição abaixo disso (m) é arredondamento e não pede outra iteração
+TOLERANCIA_SEPARACAO = 1e-6
+
+
+def _produto_quaternions(a, b):
+    # a * b para arrays (..., 4) no formato (w, x, y, z)
+    aw, ax, ay, az = np.moveaxis(a, -1, 0)
+    bw, bx, by, bz = np.moveaxis(b, -1, 0)
+    return np.stack([
+        aw * bw - ax * bx - ay * by - az * bz,
+        aw * bx + ax * bw + ay * bz - az * by,
+        aw * by - ax * bz + ay * bw + az * bx,
+        aw * bz + ax * by - ay * bx + az * bw,
+    ], axis=-1)
+
+
+def _girar_rolamento(rotacoes, velocidades, bola_raio, dt):
+    # Compõe o giro de rolamento do subpasso (no referencial do mundo, à esquerda) com a orientação atual
+    omega = np.stack([-velocidades[..., 1], velocidades[..., 0], np.zeros(velocidades.shape[:-1])], axis=-1) / bola_raio
+    modulo = np.linalg.norm(omega, axis=-1, keepdims=True)
+    meio_angulo = modulo * dt / 2
+    eixo = np.divide(omega, modulo, out=np.zeros_like(omega), where=modulo > 0)
+    giro = np.concatenate([np.cos(meio_angulo), eixo * np.sin(meio_angulo)], axis=-1)
+    rotacoes = _produto_quaternions(giro, rotacoes)
+    return rotacoes / np.linalg.norm(rotacoes, axis=-1, keepdims=True)
+
+
+def _contatos(posicoes, ativas, diametro, outras, tolerancia=0.0):
+    # Pares (i, j) de bolas em jogo que se tocam, com a normal unitária de j para i
+    d = posicoes[:, :, None, :] - posicoes[:, None, :, :]
+    distancia = np.sqrt(np.maximum((d ** 2).sum(-1), 1e-12))
+    contato = (distancia < diametro - tolerancia) & outras & ativas[:, :, None] & ativas[:, None, :]
+    return contato, d / distancia[..., None], distancia
+
+
+def simular_tacada(posicoes, velocidade_branca, bola_raio, mesa_comprimento=4.0, mesa_largura=2.0,
+                   cacapa_raio=0.1, quadros=120, fps=24, subpassos=10, indice_branca=-1,
+                   atrito=ATRITO_ROLAMENTO, restituicao_bolas=RESTITUICAO_BOLAS,
+                   restituicao_tabela=RESTITUICAO_TABELA, largura_berco=0.0,
+                   iteracoes_separacao=ITERACOES_SEPARACAO):
+    # posicoes: (B, 2) ou (N, B, 2); velocidade_branca: (2,) ou (N, 2), em m/s.
+    # Retorna (posicoes (F, [N,] B, 2), rotacoes (F, [N,] B, 4), encacapadas ([N,] B)),
+    # com F = quadros + 1 (o quadro 0 é o estado inicial) e encacapadas = quadro em que
+    # a bola caiu ou -1; a bola encaçapada fica parada no centro da caçapa.
+    # As bolas rebatem na face interna do berço (largura_berco dos construtores).
+    posicoes = np.asarray(posicoes, dtype=float)
+    lote = posicoes.ndim == 3
+    posicoes = np.array(posicoes if lote else posicoes[None])
+    quantidade, bolas, _ = posicoes.shape
+
+    velocidades = np.zeros_like(posicoes)
+    velocidades[:, indice_branca] = np.broadcast_to(np.asarray(velocidade_branca, dtype=float), (quantidade, 2))
+    rotacoes = np.zeros((quantidade, bolas, 4))
+    rotacoes[..., 0] = 1.0
+    ativas = np.ones((quantidade, bolas), dtype=bool)
+    encacapadas = np.full((quantidade, bolas), -1, dtype=np.int32)
+
+    cacapas = np.asarray(posicoes_cacapas_mesa(mesa_comprimento, mesa_largura))
+    limite = np.array(limites_jogo(mesa_comprimento, mesa_largura, bola_raio, largura_berco))
+    diametro = 2 * bola_raio
+    outras = ~np.eye(bolas, dtype=bool)
+    dt = 1.0 / (fps * subpassos)
+    desaceleracao = atrito * GRAVIDADE * dt
+
+    saida_posicoes = np.empty((quadros + 1, quantidade, bolas, 2))
+    saida_rotacoes = np.empty((quadros + 1, quantidade, bolas, 4))
+    saida_posicoes[0], saida_rotacoes[0] = posicoes, rotacoes
+
+    for quadro in range(1, quadros + 1):
+        for _ in range(subpassos):
+            # Atrito de rolamento: perde a mesma velocidade a cada subpasso até parar
+            rapidez = np.linalg.norm(velocidades, axis=-1, keepdims=True)
+            fator = np.divide(np.maximum(rapidez - desaceleracao, 0), rapidez,
+                              out=np.zeros_like(rapidez), where=rapidez > 0)
+            velocidades *= fator
+            posicoes += velocidades * dt
+            rotacoes = _girar_rolamento(rotacoes, velocidades, bola_raio, dt)
+
+            # Bola-bola: todos os pares (i, j) de uma vez
+            contato, normal, distancia = _contatos(posicoes, ativas, diametro, outras)
+            if contato.any():
+                aproximacao = ((velocidades[:, :, None, :] - velocidades[:, None, :, :]) * normal).sum(-1)
+                impulso = np.where(contato & (aproximacao < 0), -(1 + restituicao_bolas) / 2 * aproximacao, 0)
+                velocidades += (impulso[..., None] * normal).sum(2)
+
+            # Caçapas antes das tabelas: na boca da caçapa o berço é recortado, então a bola
+            # cai quando chega ao buraco ou quando passa da linha da tabela ali, em vez de rebater
+            ate_cacapa = np.linalg.norm(posicoes[:, :, None, :] - cacapas, axis=-1)
+            na_boca = ate_cacapa.min(-1) < cacapa_raio + bola_raio
+            passou = (np.abs(posicoes) > limite).any(-1)
+            caiu = ativas & ((ate_cacapa.min(-1) < cacapa_raio) | (na_boca & passou))
+            if caiu.any():
+                posicoes[caiu] = cacapas[ate_cacapa.argmin(-1)[caiu]]
+                velocidades[caiu] = 0
+                ativas &= ~caiu
+                encacapadas[caiu] = quadro
+
+            # Tabelas: espelha a componente que sai da mesa e perde energia
+            fora = (np.abs(posicoes) > limite) & (velocidades * np.sign(posicoes) > 0) & ativas[..., None]
+            velocidades = np.where(fora, -restituicao_tabela * velocidades, velocidades)
+            posicoes = np.where(ativas[..., None], np.clip(posicoes, -limite, limite), posicoes)
+
+            # Desfaz a sobreposição metade para cada lado até não sobrar contato; a bola
+            # encostada na tabela fica nela e a vizinha é empurrada nas iterações seguintes
+            for _ in range(iteracoes_separacao):
+                contato, normal, distancia = _contatos(posicoes, ativas, diametro, outras, TOLERANCIA_SEPARACAO)
+                if not contato.any():
+                    break
+                sobreposicao = np.where(contato, diametro - distancia, 0)
+                posicoes += 0.5 * (sobreposicao[..., None] * normal).sum(2)
+                posicoes = np.where(ativas[..., None], np.clip(posicoes, -limite, limite), posicoes)
+
+        saida_posicoes[quadro], saida_rotacoes[quadro] = posicoes, rotacoes
+
+    if not lote:
+        return saida_posicoes[:, 0], saida_rotacoes[:, 0], encacapadas[0]
+    return saida_posicoes, saida_rotacoes, encacapadas
+
+
+def alturas_trajetoria(encacapadas, quadros, z, profundidade):
+    # Altura (F, [N,] B) de cada bola: z na mesa e z - profundidade a partir do quadro em que caiu
+    indices = np.arange(quadros + 1).reshape((-1,) + (1,) * np.ndim(encacapadas))
+    caida = (encacapadas >= 0) & (indices >= encacapadas)
+    return np.where(caida, z - profundidade, z)
+
+
+def trajetorias_3d(posicoes, encacapadas, z, profundidade):
+    # (F, [N,] B, 2) -> (F, [N,] B, 3), com as bolas encaçapadas afundando na caçapa
+    alturas = alturas_trajetoria(encacapadas, len(posicoes) - 1, z, profundidade)
+    return np.concatenate([posicoes, alturas[..., None]], axis=-1)